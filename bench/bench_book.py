@@ -0,0 +1,156 @@
+"""
+Microbenchmark: cost per update of the kimp_book order books and depth walk.
+
+For each book feed, measures parse + book update + executable-premium walk
+per message, the walk alone, and checks a Binance diff-depth book kept by
+DiffDepthSync against a plain dict book fed the same events.
+
+    python3 bench/bench_book.py
+    python3 bench/bench_book.py --notional 1000000 --levels 1000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from kimp_book import (DepthBooks, DiffDepthSync, OrderBook, executable_rates, parse_binance_depth,
+                       parse_hyperliquid_l2, parse_upbit_orderbook)
+import samples
+
+USDT_KRW = 1390.0
+
+
+def per_call_us(fn, items, seconds):
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for item in items:
+            fn(item)
+        calls += len(items)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def diff_events(rng, mid, levels, count):
+    """A deep starting book plus `count` depthUpdate messages that modify, add and remove levels."""
+    tick = mid * 1e-5
+    bids = {round(mid - tick * n, 6): rng.uniform(0.1, 5) for n in range(1, levels + 1)}
+    asks = {round(mid + tick * n, 6): rng.uniform(0.1, 5) for n in range(1, levels + 1)}
+    snapshot = (1000, sorted(bids.items(), reverse=True), sorted(asks.items()))
+    messages = []
+    last = 997  # the first event spans the snapshot's lastUpdateId (1000)
+    for _ in range(count):
+        changes_b, changes_a = [], []
+        for changes, book, sign in ((changes_b, bids, -1), (changes_a, asks, 1)):
+            for _ in range(rng.randint(2, 12)):
+                price = round(mid + sign * tick * rng.randint(1, levels + 20), 6)
+                qty = 0.0 if rng.random() < 0.3 else rng.uniform(0.1, 5)
+                changes.append((price, qty))
+        first, last, prev = last + 1, last + rng.randint(4, 8), last
+        messages.append(samples.binance_depth_update("BTC", changes_b, changes_a, first, last, prev, 0))
+    return snapshot, messages
+
+
+def check_diff_sync(snapshot, messages):
+    """DiffDepthSync must end with exactly the levels a naive dict book has."""
+    book = OrderBook()
+    sync = DiffDepthSync(book)
+    # Two events arrive before the snapshot and are replayed over it.
+    for message in messages[:2]:
+        _, U, u, pu, b, a, _ = parse_binance_depth(message)
+        sync.on_event(U, u, pu, b, a, 0.0)
+    last_id, bids, asks = snapshot
+    sync.on_snapshot(last_id, bids, asks, 0.0)
+    naive_bids, naive_asks = dict(bids), dict(asks)
+    for n, message in enumerate(messages):
+        _, U, u, pu, b, a, _ = parse_binance_depth(message)
+        if n >= 2:
+            sync.on_event(U, u, pu, b, a, 0.0)
+        for naive, changes in ((naive_bids, b), (naive_asks, a)):
+            for price, qty in changes:
+                if qty:
+                    naive[price] = qty
+                else:
+                    naive.pop(price, None)
+    got_bids = [(-k, s) for k, s in zip(book.bids.keys, book.bids.sizes)]
+    got_asks = list(zip(book.asks.keys, book.asks.sizes))
+    assert got_bids == sorted(naive_bids.items(), reverse=True), "bids diverged"
+    assert got_asks == sorted(naive_asks.items()), "asks diverged"
+    assert sync.resyncs == 0
+    # A gap in the sequence must reset the book and ask for a new snapshot.
+    _, U, u, pu, b, a, _ = parse_binance_depth(messages[-1])
+    sync.on_event(U + 100, u + 100, pu + 100, b, a, 0.0)
+    assert sync.needs_snapshot() and not len(book.bids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--notional", type=float, default=3_000_000, help="hedge size in KRW (default 3M)")
+    parser.add_argument("--levels", type=int, default=500, help="levels per side of the Binance diff book")
+    parser.add_argument("--seconds", type=float, default=1.0, help="time per measurement")
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    usdt_price = 100.0
+    krw_price = usdt_price * (USDT_KRW + 2.0)
+    upbit = [samples.upbit_orderbook("KRW-BTC", krw_price, 0, rng=rng) for _ in range(50)]
+    l2 = [samples.hyperliquid_l2book("BTC", usdt_price, 0, rng=rng) for _ in range(50)]
+    snapshot, diffs = diff_events(rng, usdt_price, args.levels, 2000)
+    check_diff_sync(snapshot, diffs)
+
+    depth = DepthBooks(1, args.notional, max_age=float("inf"))
+    krw_book, usdt_book = depth.krw[0], depth.usdt[0]
+    _, bids, asks, _ = parse_upbit_orderbook(upbit[0])
+    krw_book.replace(bids, asks, 0.0)
+    _, bids, asks, _ = parse_hyperliquid_l2(l2[0])
+    usdt_book.replace(bids, asks, 0.0)
+
+    def on_upbit(message):
+        _, bids, asks, _ = parse_upbit_orderbook(message)
+        krw_book.replace(bids, asks, 0.0)
+        depth.evaluate(0, 0.0)
+
+    def on_l2(message):
+        _, bids, asks, _ = parse_hyperliquid_l2(message)
+        usdt_book.replace(bids, asks, 0.0)
+        depth.evaluate(0, 0.0)
+
+    binance_book = OrderBook()
+    sync = DiffDepthSync(binance_book)
+    sync.on_snapshot(*snapshot, 0.0)
+    parsed_diffs = [parse_binance_depth(message) for message in diffs]
+    pending = iter(())
+
+    def on_diff(message):
+        # Replays the event sequence, restarting from the snapshot at the end.
+        nonlocal pending
+        event = next(pending, None)
+        if event is None:
+            sync.on_snapshot(*snapshot, 0.0)
+            pending = iter(parsed_diffs)
+            event = next(pending)
+        parse_binance_depth(message)
+        _, U, u, pu, b, a, _ = event
+        sync.on_event(U, u, pu, b, a, 0.0)
+        executable_rates(krw_book, binance_book, args.notional)
+
+    over, reverse = executable_rates(krw_book, usdt_book, args.notional)
+    print(f"Notional {args.notional:,.0f} KRW: over {over - USDT_KRW:+.2f}, reverse {reverse - USDT_KRW:+.2f} "
+          f"(last-trade premium +2.00)")
+    print("Binance diff sync matches a naive dict book")
+    print(f"{'feed':<46} {'us/update':>10}")
+    cases = [
+        ("upbit orderbook (parse+replace+walk)", on_upbit, upbit),
+        ("hyperliquid l2Book (parse+replace+walk)", on_l2, l2),
+        (f"binance diff, {args.levels} levels (parse+apply+walk)", on_diff, diffs),
+        ("depth walk only", lambda _: executable_rates(krw_book, usdt_book, args.notional), range(100)),
+    ]
+    for name, fn, items in cases:
+        print(f"{name:<46} {per_call_us(fn, items, args.seconds):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Microbenchmark: messages/sec of the kimp_monitor decoders.
+
+Compares the original approach (full json.loads, str-decoding Upbit frames)
+with kimp_decode on the same payloads.
+
+    python3 bench/bench_decode.py
+    python3 bench/bench_decode.py --coins 6 --perps 200
+    python3 bench/bench_decode.py --payloads recorded/   # hyperliquid.jsonl, upbit.jsonl, binance.jsonl
+
+Recorded payload files hold one raw message per line.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import kimp_decode
+from kimp_decode import AllMidsDecoder, decode_binance, decode_upbit
+import samples
+
+
+def load_payloads(directory, name):
+    path = os.path.join(directory, f"{name}.jsonl")
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return [line.rstrip(b"\n") for line in f if line.strip()]
+
+
+def synthetic_payloads(perps, coins, count=200):
+    rng = random.Random(1)
+    names = samples.coin_names(perps)
+    hyperliquid = [samples.allmids_message(samples.random_prices(names, rng)).encode() for _ in range(20)]
+    now = 1735689600000
+    upbit = [samples.upbit_ticker(f"KRW-{rng.choice(coins)}", rng.uniform(1, 1e8), now + n) for n in range(count)]
+    binance = [samples.binance_ticker(rng.choice(coins), rng.uniform(0.1, 1e5), now + n).encode() for n in range(count)]
+    return {"hyperliquid": hyperliquid, "upbit": upbit, "binance": binance}
+
+
+# --- baseline: the original kimp_monitor decoding -------------------------
+
+def baseline_hyperliquid(coins):
+    def decode(message):
+        data = json.loads(message)
+        mids = data.get("data", {}).get("mids", {})
+        return [(coin, float(mids[coin])) for coin in coins if coin in mids]
+    return decode
+
+
+def baseline_upbit(message):
+    if isinstance(message, bytes):
+        message = message.decode("utf-8")
+    data = json.loads(message)
+    return data.get("code"), float(data.get("trade_price")), data.get("timestamp")
+
+
+def baseline_binance(message):
+    data = json.loads(message)
+    return data.get("stream"), float(data.get("data").get("c")), data.get("data").get("E")
+
+
+def rate(fn, messages, seconds):
+    """Messages/sec of fn over `messages`, looped for about `seconds`."""
+    n = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while True:
+        for message in messages:
+            fn(message)
+        n += len(messages)
+        now = time.perf_counter()
+        if now >= deadline:
+            return n / (now - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--payloads", help="directory with recorded <feed>.jsonl files")
+    parser.add_argument("--perps", type=int, default=200, help="perp coins in synthetic allMids pushes")
+    parser.add_argument("--coins", type=int, default=6, help="subscribed coins")
+    parser.add_argument("--seconds", type=float, default=1.0, help="time per measurement")
+    args = parser.parse_args()
+
+    coins = samples.coin_names(args.coins)
+    payloads = synthetic_payloads(args.perps, coins)
+    if args.payloads:
+        for name in payloads:
+            recorded = load_payloads(args.payloads, name)
+            if recorded:
+                payloads[name] = recorded
+
+    # Text frames arrive as str from websockets; Upbit's binary frames as bytes.
+    hyperliquid = [m.decode("utf-8") for m in payloads["hyperliquid"]]
+    binance = [m.decode("utf-8") for m in payloads["binance"]]
+    upbit = payloads["upbit"]
+    mids = AllMidsDecoder({coin: coin for coin in coins})
+
+    cases = [
+        ("hyperliquid allMids", baseline_hyperliquid(coins), mids.decode, hyperliquid),
+        ("upbit ticker", baseline_upbit, decode_upbit, upbit),
+        ("binance ticker", baseline_binance, decode_binance, binance),
+    ]
+    print(f"JSON backend: {kimp_decode.JSON_BACKEND}, subscribed coins: {len(coins)}")
+    print(f"{'feed':<22} {'before msg/s':>14} {'after msg/s':>14} {'speedup':>8}")
+    for name, before, after, messages in cases:
+        expected, got = before(messages[0]), after(messages[0])
+        if isinstance(expected, list):
+            expected, got = sorted(expected), sorted(got)
+        assert expected == got, f"{name}: decoders disagree: {expected} != {got}"
+        r_before = rate(before, messages, args.seconds)
+        r_after = rate(after, messages, args.seconds)
+        print(f"{name:<22} {r_before:>14,.0f} {r_after:>14,.0f} {r_after / r_before:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Throughput of bulk HD key derivation in mk_seed.
+
+    per key     the old way, seed_phrase_to_private_key() generalised to an
+                index: PBKDF2 and the whole m/44'/60'/0'/0/i path through
+                bip32utils for every key (sampled, needs bip32utils), versus
+                derive_private_keys(): one seed and parent, then --keys
+                address keys at one HMAC-SHA512 each
+    public      the same keys with compressed public keys, the EC
+                multiplication every address needs (sampled)
+    phrases     --phrases mnemonics, one key each (PBKDF2-bound), inline and
+                over a process pool of each --workers size
+
+    python3 bench/bench_derive.py
+    python3 bench/bench_derive.py --keys 100000 --phrases 256 --workers 1,4,8
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mk_seed
+
+
+def old_key(phrase, index):
+    """seed_phrase_to_private_key() as it was, for address `index`."""
+    import bip32utils
+    seed = mk_seed.mnemonic_to_seed(phrase)
+    hardened_offset = bip32utils.BIP32_HARDEN
+    key = bip32utils.BIP32Key.fromEntropy(seed)
+    for i in (44 + hardened_offset, 60 + hardened_offset, 0 + hardened_offset, 0, index):
+        key = key.ChildKey(i)
+    return int.from_bytes(key.PrivateKey(), "big")
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=100_000)
+    parser.add_argument("--sample", type=int, default=50, help="keys for the slow paths")
+    parser.add_argument("--phrases", type=int, default=64)
+    parser.add_argument("--workers", default="2,4")
+    args = parser.parse_args()
+
+    phrase = " ".join(mk_seed.generate_mnemonic())
+    elapsed, keys = timed(lambda: mk_seed.derive_private_keys(phrase, count=args.keys))
+    print(f"{'derive_private_keys':<32} {args.keys:>7} keys {elapsed:>8.2f} s {args.keys / elapsed:>10,.0f} keys/s")
+
+    try:
+        import bip32utils  # noqa: F401
+    except ImportError:
+        print("(pip install bip32utils for the old per-key path)")
+    else:
+        elapsed, old = timed(lambda: [old_key(phrase, i) for i in range(args.sample)])
+        assert old == [key for _, _, key in keys[:args.sample]]
+        print(f"{'old: full path per key':<32} {args.sample:>7} keys {elapsed:>8.2f} s {args.sample / elapsed:>10,.0f} keys/s"
+              f"  ({args.keys / args.sample * elapsed:,.0f} s for {args.keys:,})")
+
+    elapsed, _ = timed(lambda: [mk_seed.public_key(key) for _, _, key in keys[:args.sample * 10]])
+    sample = args.sample * 10
+    print(f"{'+ public keys (EC)':<32} {sample:>7} keys {elapsed:>8.2f} s {sample / elapsed:>10,.0f} keys/s")
+
+    phrases = [" ".join(mk_seed.generate_mnemonic()) for _ in range(args.phrases)]
+    elapsed, inline = timed(lambda: mk_seed.derive_many(phrases, workers=1))
+    print(f"\n{args.phrases} phrases x 1 key, inline   {elapsed:>8.2f} s {args.phrases / elapsed:>10,.0f} phrases/s")
+    for workers in (int(w) for w in args.workers.split(",")):
+        elapsed, pooled = timed(lambda: mk_seed.derive_many(phrases, workers=workers))
+        assert pooled == inline
+        print(f"{args.phrases} phrases x 1 key, {workers:>2} procs {elapsed:>8.2f} s {args.phrases / elapsed:>10,.0f} phrases/s")
+    print(f"(CPUs: {os.cpu_count()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Peak memory and speed of the streaming funding-history export.
+
+For growing history lengths, feeds out-of-order 499-row chunks (as the
+planner's workers return them) through ChunkSpool and exports the merged
+stream to CSV and .fund, measuring Python's peak allocation with tracemalloc
+and comparing it with the old collect / dedupe dict / sort / DictWriter path.
+Then reads the history back: csv.DictReader + float() versus mapping the
+.fund file (FundingFile) and computing a window over it.
+
+    python3 bench/bench_export.py
+    python3 bench/bench_export.py --years 1,4,8
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH))
+sys.path.insert(0, BENCH)
+
+from funding_export import ChunkSpool, FundingFile, export
+from funding_stats import FundingSeries
+import samples
+
+CHUNK = 499
+
+
+def chunks(years, rng):
+    """Shuffled chunks of fundingHistory rows covering `years` of hourly funding."""
+    end = int(time.time() * 1000)
+    start = end - int(years * 365 * 24 * samples.HOUR_MS)
+    bounds = list(range(start, end, CHUNK * samples.HOUR_MS))
+    rng.shuffle(bounds)
+    for first in bounds:
+        yield samples.funding_history("BTC", first, first + CHUNK * samples.HOUR_MS - 1, start, limit=CHUNK + 1)
+
+
+def old_save(years, rng, path):
+    all_funding_rates = []
+    for rows in chunks(years, rng):
+        all_funding_rates.extend(rows)
+    unique = {rate["time"]: rate for rate in all_funding_rates}.values()
+    rows = sorted(unique, key=lambda x: x.get("time", 0))
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+        writer.writeheader()
+        writer.writerows(rows)
+    return len(rows)
+
+
+def new_save(years, rng, csv_path, bin_path):
+    spool = ChunkSpool()
+    for rows in chunks(years, rng):
+        spool.add_rows(rows)
+    count = export(spool.merged(), "BTC", csv_path, bin_path)
+    spool.close()
+    return count
+
+
+def measured(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--years", default="1,2,4", help="history lengths to export")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path, bin_path = os.path.join(tmp, "BTC.csv"), os.path.join(tmp, "BTC.fund")
+        print(f"{'years':>5} {'records':>8} {'old peak MB':>12} {'old s':>6} {'stream peak MB':>15} {'stream s':>9}")
+        for years in (float(y) for y in args.years.split(",")):
+            count, old_s, old_peak = measured(old_save, years, random.Random(1), csv_path)
+            new_count, new_s, new_peak = measured(new_save, years, random.Random(1), csv_path, bin_path)
+            assert new_count == count, (new_count, count)
+            print(f"{years:>5g} {count:>8} {old_peak / 1e6:>12.1f} {old_s:>6.2f} {new_peak / 1e6:>15.1f} {new_s:>9.2f}")
+
+        # Read back the last (longest) export.
+        start = time.perf_counter()
+        with open(csv_path, newline="") as f:
+            rows = [(int(row["time"]), float(row["fundingRate"])) for row in csv.DictReader(f)]
+        series = FundingSeries([t for t, _ in rows], [r for _, r in rows])
+        csv_stats = series.last(30 * 86400, rows[-1][0])
+        csv_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        funding = FundingFile(bin_path)
+        series = FundingSeries(funding.times, funding.rates)
+        bin_stats = series.last(30 * 86400, funding.times[-1])
+        bin_s = time.perf_counter() - start
+        assert abs(csv_stats.apr - bin_stats.apr) < 1e-9
+        del series
+        funding.close()
+        print(f"\nRead {count} records and a 30d window: CSV {csv_s * 1000:.1f} ms, "
+              f"mapped .fund {bin_s * 1000:.2f} ms ({os.path.getsize(bin_path) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Funding-history fetch time for many coins against the local /info stand-in.
+
+Compares the old way (one requests.post per fixed 30-day window, one after
+the other, a new connection each) with funding_client's pooled session and
+worker threads under the shared token bucket, for two jobs:
+
+    recent      the last --hours of --coins coins
+    backfill    the whole history of --backfill-coins coins (the stand-in
+                lists coin n 400 - n days ago); fixed windows silently lose
+                every row past the 500-row cap, the planner loses none
+    scan        find the highest-funding perps of the market: fundingHistory
+                for every coin, or one metaAndAssetCtxs request plus history
+                for the top --drill only (get-funding.py --screen)
+
+The stand-in adds --latency to every response and enforces the same weight
+budget, so any 429 means the client overran it (the client retries those,
+so they cost time, not rows). "holes" counts gaps of more than 1.5 hours in
+the fetched history.
+
+    python3 bench/bench_funding.py
+    python3 bench/bench_funding.py --coins 150 --latency 0.2 --workers 8,32
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH))
+sys.path.insert(0, BENCH)
+
+import requests
+
+from funding_client import HISTORY_START_MS, InfoClient, TokenBucket, fetch_funding_histories, find_gaps
+from funding_stats import rank_contexts
+import info_standin
+import samples
+
+
+OLD_WINDOW_MS = 30 * 24 * 3_600_000
+
+
+def fixed_windows(start, end):
+    """The old get_time_range(): 30-day windows, whatever they hold."""
+    windows = []
+    while start < end:
+        windows.append((start, min(start + OLD_WINDOW_MS, end)))
+        start += OLD_WINDOW_MS + 1
+    return windows
+
+
+def serial(url, ranges):
+    """The old loop, minus its 0.5 s sleep per request; a failed window is just skipped, as it was."""
+    times = {}
+    errors = 0
+    for coin, start, end in ranges:
+        for window in fixed_windows(start, end):
+            response = requests.post(url, json={"type": "fundingHistory", "coin": coin, "startTime": window[0],
+                                                "endTime": window[1]}, timeout=10)
+            if response.status_code != 200:
+                errors += 1
+                continue
+            times.setdefault(coin, []).extend(row["time"] for row in response.json())
+    return times, errors, 0.0
+
+
+def pooled(url, ranges, workers, budget):
+    client = InfoClient(url, bucket=TokenBucket(budget, budget / 60), pool_size=workers)
+    times = {}
+    errors = 0
+    for coin, _, _, rows, error in fetch_funding_histories(client, ranges, workers):
+        if error is None:
+            times.setdefault(coin, []).extend(row["time"] for row in rows)
+        else:
+            errors += 1
+    client.close()
+    return times, errors, client.bucket.waited
+
+
+def scan(url, start, end, drill, workers, budget):
+    """get-funding.py --screen: one bulk request, then history for the candidates."""
+    client = InfoClient(url, bucket=TokenBucket(budget, budget / 60), pool_size=workers)
+    ranked = rank_contexts(client.asset_contexts())
+    times = {}
+    errors = 0
+    ranges = [(c.coin, start, end) for c in ranked[:drill]]
+    for coin, _, _, rows, error in fetch_funding_histories(client, ranges, workers):
+        if error is None:
+            times.setdefault(coin, []).extend(row["time"] for row in rows)
+        else:
+            errors += 1
+    client.close()
+    return times, errors, client.bucket.waited
+
+
+def run_all(standin, url, title, ranges, args, runs=None):
+    print(f"{title}: {len(ranges)} coin(s), {args.latency * 1000:.0f} ms latency, budget {args.budget:.0f} weight/min")
+    print(f"{'method':<28} {'requests':>8} {'seconds':>8} {'x latency':>10} {'rows':>7} {'holes':>6} {'errors':>7} "
+          f"{'429s':>5} {'rate wait':>10}")
+    if runs is None:
+        runs = [] if args.no_serial else [("serial, 30-day windows", lambda: serial(url, ranges))]
+        for workers in (int(w) for w in args.workers.split(",")):
+            runs.append((f"planner, {workers} workers", lambda w=workers: pooled(url, ranges, w, args.budget)))
+    for name, run in runs:
+        # Each run gets a fresh server-side budget, as after a minute's pause.
+        standin.budget = info_standin.Budget(args.budget) if args.budget else None
+        standin.rejected = 0
+        requests_before = standin.requests
+        start = time.perf_counter()
+        times, errors, waited = run()
+        elapsed = time.perf_counter() - start
+        rows = sum(len(t) for t in times.values())
+        holes = sum(len(find_gaps(sorted(t))) for t in times.values())
+        print(f"{name:<28} {standin.requests - requests_before:>8} {elapsed:>8.2f} {elapsed / args.latency:>10.1f} "
+              f"{rows:>7} {holes:>6} {errors:>7} {standin.rejected:>5} {waited:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--coins", type=int, default=50, help="coins to fetch (default 50, within one burst of the budget)")
+    parser.add_argument("--hours", type=float, default=52, help="recent history per coin (default 52)")
+    parser.add_argument("--backfill-coins", type=int, default=1, help="coins to backfill in full (default 1; 0 skips)")
+    parser.add_argument("--drill", type=int, default=10, help="coins whose history the scan fetches (default 10)")
+    parser.add_argument("--latency", type=float, default=0.1, help="stand-in response delay in seconds")
+    parser.add_argument("--workers", default="1,8,16", help="worker counts to try")
+    parser.add_argument("--budget", type=float, default=1200, help="weight per minute (default 1200, as Hyperliquid)")
+    parser.add_argument("--no-serial", action="store_true", help="skip the slow serial baseline")
+    args = parser.parse_args()
+
+    coins = samples.coin_names(max(args.coins, args.backfill_coins))
+    standin = info_standin.InfoStandIn(coins, args.latency, budget=0)
+    server = info_standin.serve(standin, 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/info"
+
+    end = int(time.time() * 1000)
+    run_all(standin, url, "recent", [(coin, end - int(args.hours * 3_600_000), end) for coin in coins[:args.coins]],
+            args)
+    if args.backfill_coins:
+        print()
+        run_all(standin, url, "backfill", [(coin, HISTORY_START_MS, end) for coin in coins[:args.backfill_coins]],
+                args)
+    print()
+    recent = [(coin, end - int(args.hours * 3_600_000), end) for coin in coins[:args.coins]]
+    workers = max(int(w) for w in args.workers.split(","))
+    run_all(standin, url, "scan", recent, args, [
+        ("history of every coin", lambda: pooled(url, recent, workers, args.budget)),
+        (f"bulk + history of top {args.drill}",
+         lambda: scan(url, recent[0][1], end, args.drill, workers, args.budget)),
+    ])
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
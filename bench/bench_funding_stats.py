@@ -0,0 +1,78 @@
+"""
+Microbenchmark: funding analytics for every perp over a year of hourly history.
+
+Compares the old print_funding_rates() summary (float() on every rate string,
+once per window, in a Python loop) with funding_stats: one parse into
+arrays, running sums as deep as the longest window, then any window in
+O(log n). Times the screener (every coin, every window, ranked) from the
+arrays the store returns, and a full-history window (sums over every record).
+
+    python3 bench/bench_funding_stats.py
+    python3 bench/bench_funding_stats.py --coins 300 --days 730
+"""
+import argparse
+import os
+import sys
+import time
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH))
+sys.path.insert(0, BENCH)
+
+from funding_stats import FundingSeries, screen
+from time_windows import parse_windows
+import samples
+
+WINDOWS = "8h,24h,7d,30d"
+
+
+def old_average(funding_rates, n):
+    """The loop print_funding_rates() had, once per window."""
+    valid_rates = []
+    for rate in funding_rates[-n:]:
+        funding_rate = rate.get("fundingRate")
+        try:
+            valid_rates.append(float(funding_rate))
+        except (TypeError, ValueError):
+            pass
+    return sum(valid_rates) / len(valid_rates) * 100 * 24 * 365
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--coins", type=int, default=200)
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+
+    end = int(time.time() * 1000)
+    start = end - args.days * 24 * samples.HOUR_MS
+    coins = samples.coin_names(args.coins)
+    rows = {coin: samples.funding_history(coin, start, end, start, limit=args.days * 24 + 1) for coin in coins}
+    windows = parse_windows(WINDOWS)
+    hours = [int(seconds // 3600) for seconds in windows.values()]
+    records = sum(len(r) for r in rows.values())
+    print(f"{args.coins} coins x {args.days} days: {records:,} records, windows {WINDOWS}")
+
+    old, _ = timed(lambda: {coin: [old_average(r, n) for n in hours] for coin, r in rows.items()})
+    parse, series = timed(lambda: {coin: FundingSeries.from_rows(r) for coin, r in rows.items()})
+    arrays = {coin: (s.times, s.rates) for coin, s in series.items()}
+    series = {coin: FundingSeries(*a) for coin, a in arrays.items()}
+    ranked_time, ranked = timed(lambda: screen(series, windows, end, "24h"))
+    full, _ = timed(lambda: [s.window(start, end) for s in series.values()])
+    again, _ = timed(lambda: screen(series, parse_windows("1h,3d,90d,180d"), end, "3d"))
+    print(f"{'old loops, 4 windows (averages only)':<44} {old * 1000:>9.1f} ms")
+    print(f"{'parse rows into arrays (not needed from db)':<44} {parse * 1000:>9.1f} ms")
+    print(f"{'screener: all coins x 4 windows, ranked':<44} {ranked_time * 1000:>9.1f} ms")
+    print(f"{'full-history window, all coins':<44} {full * 1000:>9.1f} ms")
+    print(f"{'then any other 4 windows, ranked':<44} {again * 1000:>9.1f} ms")
+    print(f"Top: {ranked[0][0]} at {ranked[0][1]['24h'].apr:.1f}% APR (24h)")
+
+
+if __name__ == "__main__":
+    main()
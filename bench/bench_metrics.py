@@ -0,0 +1,110 @@
+"""
+Overhead of the kimp_monitor latency instrumentation.
+
+Feeds the same synthetic Upbit / Hyperliquid messages through the real
+handlers with metrics disabled and enabled and reports the per-tick cost of
+each. Printing is switched off so the difference is the instrumentation.
+
+Every run starts from a fresh engine, rolling stats, alert pipeline and
+histograms, so one run's alert cooldowns cannot make the next one cheaper.
+After a warm-up of each kind, off and on runs alternate (off/on, then
+on/off, ...) for --repeats pairs; the medians are reported. The network
+stage (exchange timestamp to receipt) is left out of the summary: replayed
+messages have no real network delay.
+
+    python3 bench/bench_metrics.py
+    python3 bench/bench_metrics.py --repeats 15
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import kimp_monitor
+from kimp_alerts import AlertPipeline, MemorySink
+from kimp_metrics import NETWORK, Histogram, LatencyMetrics
+from kimp_stats import DEFAULT_WINDOWS
+from kimp_symbols import load_config
+import samples
+
+
+def build_messages(coins, count):
+    rng = random.Random(7)
+    ts = int(time.time() * 1000)
+    messages = []
+    for n in range(count):
+        r = rng.random()
+        if r < 0.05:
+            prices = {coin: rng.uniform(1, 1e5) for coin in coins}
+            messages.append((kimp_monitor.handle_hyperliquid, samples.allmids_message(prices, spot_pairs=50)))
+        elif r < 0.15:
+            messages.append((kimp_monitor.handle_upbit, samples.upbit_ticker("KRW-USDT", rng.uniform(1380, 1400), ts + n)))
+        else:
+            code = f"KRW-{rng.choice(coins)}"
+            messages.append((kimp_monitor.handle_upbit, samples.upbit_ticker(code, rng.uniform(1, 1e8), ts + n)))
+    return messages
+
+
+def per_tick_us(config, messages, metrics_on):
+    """One pass over the messages from fresh monitor state; returns (us per message, metrics)."""
+    kimp_monitor.setup(config)
+    kimp_monitor.init_stats(DEFAULT_WINDOWS)
+    kimp_monitor.alerts = AlertPipeline([MemorySink()])
+    kimp_monitor.metrics = LatencyMetrics(["Upbit", "Binance", "Hyperliquid"]) if metrics_on else None
+    start = time.perf_counter()
+    for handler, message in messages:
+        handler(message, time.monotonic())
+    return (time.perf_counter() - start) / len(messages) * 1e6, kimp_monitor.metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--coins", type=int, default=6)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--repeats", type=int, default=7, help="off/on pairs after the warm-up")
+    args = parser.parse_args()
+
+    config = load_config()
+    coins = samples.coin_names(args.coins)
+    config["symbols"] = coins
+    kimp_monitor.QUIET = True
+    messages = build_messages(coins, args.messages)
+
+    per_tick_us(config, messages, False)  # warm-up
+    per_tick_us(config, messages, True)
+    runs = {False: [], True: []}
+    differences = []
+    for repeat in range(args.repeats):
+        pair = {}
+        for metrics_on in ((False, True) if repeat % 2 == 0 else (True, False)):
+            pair[metrics_on], metrics = per_tick_us(config, messages, metrics_on)
+            runs[metrics_on].append(pair[metrics_on])
+            if metrics_on:
+                last_metrics = metrics
+        differences.append(pair[True] - pair[False])
+    off, on = statistics.median(runs[False]), statistics.median(runs[True])
+
+    hist = Histogram()
+    start = time.perf_counter()
+    for n in range(1_000_000):
+        hist.record(n)
+    record_ns = (time.perf_counter() - start) * 1e3
+
+    print(f"per message, metrics off: {off:.2f} us (median of {args.repeats})")
+    print(f"per message, metrics on:  {on:.2f} us")
+    print(f"instrumentation overhead: {statistics.median(differences):.2f} us per message "
+          f"(median of paired differences, range {min(differences):.2f} to {max(differences):.2f})")
+    print(f"Histogram.record:         {record_ns:.0f} ns")
+    print()
+    for histograms in last_metrics.histograms.values():
+        histograms[NETWORK] = Histogram()  # no real network delay in replayed messages
+    print(last_metrics.summary())
+
+
+if __name__ == "__main__":
+    main()
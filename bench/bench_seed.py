@@ -0,0 +1,81 @@
+"""
+Microbenchmark: BIP-39 mnemonic generation and validation in mk_seed.
+
+The old generate_mnemonic() fetched the wordlist from GitHub on every run
+(not timed here: it needs the network, typically 100+ ms) and built the
+phrase from bin() strings. Compares that string path, with the wordlist
+already in memory, against mk_seed's int shifts over the bundled list, and
+times checksum validation. With the mnemonic package installed, also
+checks every length against its encoder and compares speed.
+
+    python3 bench/bench_seed.py
+    python3 bench/bench_seed.py --rounds 20000
+"""
+import argparse
+import hashlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mk_seed
+
+
+def old_generate(wordlist):
+    """The old generate_mnemonic() after the download."""
+    entropy = os.urandom(32)
+    sha = hashlib.sha256(entropy).digest()
+    checksum_length = 256 // 32
+    sha_bits = bin(int.from_bytes(sha, byteorder="big"))[2:].zfill(256)
+    checksum = sha_bits[:checksum_length]
+    entropy_bits = bin(int.from_bytes(entropy, byteorder="big"))[2:].zfill(256)
+    total_bits = entropy_bits + checksum
+    mnemonic = []
+    for i in range(0, len(total_bits), 11):
+        idx = int(total_bits[i: i + 11], 2)
+        mnemonic.append(wordlist[idx])
+    return mnemonic
+
+
+def per_call(fn, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    words, _ = mk_seed.load_wordlist()
+    print(f"{'load + verify bundled wordlist (once)':<40} {(time.perf_counter() - start) * 1e6:>9.1f} us")
+    print(f"{'old generate, 24 words (no download)':<40} {per_call(lambda: old_generate(words), args.rounds):>9.1f} us")
+    for count in sorted(mk_seed.ENTROPY_BITS):
+        phrase = " ".join(mk_seed.generate_mnemonic(count))
+        gen = per_call(lambda: mk_seed.generate_mnemonic(count), args.rounds)
+        check = per_call(lambda: mk_seed.validate_mnemonic(phrase), args.rounds)
+        print(f"{f'mk_seed, {count} words: generate / validate':<40} {gen:>9.1f} us {check:>7.1f} us")
+
+    try:
+        from mnemonic import Mnemonic
+    except ImportError:
+        return
+    reference = Mnemonic("english")
+    for count, bits in mk_seed.ENTROPY_BITS.items():
+        for _ in range(200):
+            entropy = os.urandom(bits // 8)
+            phrase = reference.to_mnemonic(entropy)
+            assert " ".join(mk_seed.entropy_to_mnemonic(entropy)) == phrase
+            assert mk_seed.mnemonic_to_entropy(phrase) == entropy
+    phrase = " ".join(mk_seed.generate_mnemonic(24))
+    assert mk_seed.mnemonic_to_seed(phrase, "x") == reference.to_seed(phrase, "x")
+    print(f"\nMatches the mnemonic package for every length; its check() takes "
+          f"{per_call(lambda: reference.check(phrase), args.rounds):.1f} us per 24-word phrase")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Startup time of the crypto-tools commands.
+
+Runs quick commands in fresh interpreters, the median of --runs each: the
+scripts as they were at --before (extracted with git archive; default: the
+commit before crypto_tools/cli.py was added) and `python -m crypto_tools`
+in this tree. The funding check answers from a store of 30 days of
+synthetic history, so nothing touches the network. "python -c pass" is the
+floor.
+
+    python3 bench/bench_startup.py
+    python3 bench/bench_startup.py --runs 21 --before HEAD~3
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH)
+
+from funding_store import FundingStore
+import samples
+
+PHRASE = "abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about"
+
+
+def default_before():
+    added = subprocess.run(["git", "log", "--diff-filter=A", "--format=%H", "--", "crypto_tools/cli.py"],
+                           cwd=ROOT, capture_output=True, text=True).stdout.split()
+    return f"{added[-1]}~1" if added else "HEAD"
+
+
+def extract(rev, directory):
+    archive = subprocess.run(["git", "archive", rev], cwd=ROOT, capture_output=True, check=True).stdout
+    subprocess.run(["tar", "-x", "-C", directory], input=archive, check=True)
+
+
+def make_store(path):
+    store = FundingStore(path)
+    end = int(time.time() * 1000)
+    start = end - 30 * 24 * samples.HOUR_MS
+    store.add(samples.funding_history("BTC", start, end, start, limit=30 * 24 + 1))
+    store.covered("BTC", start, end)
+    store.close()
+
+
+def startup(command, cwd, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=9)
+    parser.add_argument("--before", help="revision to compare with")
+    args = parser.parse_args()
+    before = args.before or default_before()
+
+    python = sys.executable
+    with tempfile.TemporaryDirectory() as tmp:
+        old_tree = os.path.join(tmp, "before")
+        os.mkdir(old_tree)
+        extract(before, old_tree)
+        db = os.path.join(tmp, "funding.db")
+        make_store(db)
+        check = ["BTC", "--offline", "--db", db]
+        commands = [
+            ("funding check (--offline BTC)", ["get-funding.py", *check], ["funding", *check]),
+            ("funding --help", ["get-funding.py", "--help"], ["funding", "--help"]),
+            ("seed --check", ["mk_seed.py", "--check", PHRASE], ["seed", "--check", PHRASE]),
+            ("kimp --help", ["kimp_monitor.py", "--help"], ["kimp", "--help"]),
+        ]
+        floor = startup([python, "-c", "pass"], tmp, args.runs)
+        print(f"before: {before}, {args.runs} runs each; python -c pass: {floor * 1000:.0f} ms\n")
+        print(f"{'command':<32} {'before ms':>10} {'now ms':>8} {'now - pass':>11}")
+        for name, old, new in commands:
+            old_s = startup([python, *old], old_tree, args.runs)
+            new_s = startup([python, "-m", "crypto_tools", *new], ROOT, args.runs)
+            print(f"{name:<32} {old_s * 1000:>10.0f} {new_s * 1000:>8.0f} {(new_s - floor) * 1000:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
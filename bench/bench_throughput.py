@@ -0,0 +1,232 @@
+"""
+End-to-end throughput of kimp_monitor against the local exchange stand-in.
+
+For each offered rate, starts bench/exchange_standin.py in its own process,
+runs the real kimp_monitor.main() (feeds, engine, presenter, alerts and
+latency metrics) against it for a fixed time, and reports:
+
+    received    messages/sec the monitor actually processed
+    cpu/msg     monitor CPU time per message (all stages; with --processes
+                including the feed processes)
+    cpu%        monitor CPU use relative to wall time (over 100%: several cores)
+    src%        the stand-in's CPU use (near 100%: the source is the limit)
+    network     exchange timestamp -> receive; grows when the monitor falls behind
+    tick->alert receive -> alert queued (use --cooldown 0 to alert on every crossing)
+
+A rate is sustainable when nearly all offered messages were processed and the
+median network delay did not build up. The highest such rate is reported at the end.
+
+    python3 bench/bench_throughput.py
+    python3 bench/bench_throughput.py --coins 150 --rates 2000,5000,10000 --duration 10
+    python3 bench/bench_throughput.py --usdt-source binance
+    python3 bench/bench_throughput.py --coins 300 --processes   # one process per feed shard
+"""
+import argparse
+import asyncio
+import contextlib
+import math
+import os
+import socket
+import subprocess
+import sys
+import time
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH))
+sys.path.insert(0, BENCH)
+
+import kimp_monitor
+from kimp_alerts import AlertPipeline, MemorySink
+from kimp_metrics import NETWORK, TICK_TO_ALERT, LatencyMetrics
+from kimp_symbols import load_config
+import exchange_standin
+import samples
+
+FEEDS = ["Upbit", "Binance", "Hyperliquid"]
+# Sustainable: at least this share of the offered messages processed, and
+# median network delay below MAX_BACKLOG_MS (a backlog that keeps growing
+# moves the median; scheduling hiccups only move the tail).
+MIN_DELIVERED = 0.97
+MAX_BACKLOG_MS = 20
+# Stand-in CPU share above which a miss is blamed on the source, not the monitor.
+SOURCE_SATURATED = 0.9
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_standin(port, args, rate):
+    command = [sys.executable, os.path.join(BENCH, "exchange_standin.py"), "--port", str(port),
+               "--coins", str(args.coins), "--upbit-rate", str(rate), "--binance-rate", str(rate),
+               "--allmids-rate", str(args.allmids_rate), "--spot-pairs", str(args.spot_pairs)]
+    if args.payloads:
+        command += ["--payloads", args.payloads]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        with contextlib.suppress(OSError), socket.create_connection(("127.0.0.1", port), timeout=0.2):
+            return process
+        time.sleep(0.05)
+    process.kill()
+    raise SystemExit("exchange stand-in did not start")
+
+
+def feed_process_cpu():
+    """CPU seconds used so far by the --processes feed processes (Linux /proc; 0 elsewhere)."""
+    if kimp_monitor.feed_processes is None:
+        return 0.0
+    total = 0.0
+    for process in kimp_monitor.feed_processes.processes:
+        try:
+            with open(f"/proc/{process.pid}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+        except (OSError, AttributeError):
+            continue
+        total += (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")  # utime + stime
+    return total
+
+
+def messages_received():
+    if kimp_monitor.book is not None:
+        return sum(kimp_monitor.book.messages())
+    return sum(feed.messages for feed in feeds)
+
+
+def merged(stage):
+    """One histogram's quantiles over every feed, as (p50, p99) in ms."""
+    hists = [kimp_monitor.metrics.histograms[feed][stage] for feed in FEEDS]
+    counts = [sum(column) for column in zip(*(h.counts for h in hists))]
+    total = sum(counts)
+    if not total:
+        return math.nan, math.nan
+    result = []
+    for q in (0.5, 0.99):
+        seen = 0
+        for index, n in enumerate(counts):
+            seen += n
+            if n and seen >= q * total:
+                result.append(hists[0].bucket_mid(index) / 1e6)
+                break
+    return tuple(result)
+
+
+async def measure(config, args, port, rate):
+    """
+    Run the monitor against a fresh stand-in. Returns (received/s, cpu us/msg,
+    cpu share, stand-in cpu share, network, tick->alert, alerts submitted).
+    """
+    kimp_monitor.alerts = AlertPipeline([MemorySink()], cooldown=args.cooldown)
+    kimp_monitor.metrics = LatencyMetrics(FEEDS)
+    standin = start_standin(port, args, rate)
+    started = time.monotonic()
+    monitor = asyncio.create_task(kimp_monitor.main(config, output="lines", windows=args.windows,
+                                                    processes=args.processes))
+    try:
+        await asyncio.sleep(args.warmup)
+        # Count only the measured interval: fresh histograms, message and CPU baselines.
+        kimp_monitor.metrics = LatencyMetrics(FEEDS)
+        submitted = kimp_monitor.alerts.submitted
+        received = messages_received()
+        cpu, wall = time.process_time() + feed_process_cpu(), time.monotonic()
+        await asyncio.sleep(args.duration)
+        cpu, wall = time.process_time() + feed_process_cpu() - cpu, time.monotonic() - wall
+        received = messages_received() - received
+        submitted = kimp_monitor.alerts.submitted - submitted
+    finally:
+        # Stop the source first: a close handshake under a full-rate flood can stall.
+        # Feed processes go before it, so they don't report the lost connection.
+        if kimp_monitor.feed_processes is not None:
+            kimp_monitor.feed_processes.stop()
+        standin.terminate()
+        _, _, usage = os.wait4(standin.pid, 0)
+        standin.returncode = -15
+        source_share = (usage.ru_utime + usage.ru_stime) / (time.monotonic() - started)
+        monitor.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await monitor
+    return (received / wall, cpu / max(received, 1) * 1e6, cpu / wall, source_share,
+            merged(NETWORK), merged(TICK_TO_ALERT), submitted)
+
+
+# FeedSupervisors of the running monitor, captured by track_feeds().
+feeds = []
+
+
+def track_feeds():
+    """Wrap build_feeds() so the benchmark can read each supervisor's message count."""
+    build = kimp_monitor.build_feeds
+
+    def build_feeds(config):
+        feeds[:] = build(config)
+        return feeds
+
+    kimp_monitor.build_feeds = build_feeds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--coins", type=int, default=30, help="monitored coins (default 30)")
+    parser.add_argument("--usdt-source", choices=["hyperliquid", "binance"], default="hyperliquid")
+    parser.add_argument("--rates", default="500,1000,2000,5000,10000,20000,40000",
+                        help="offered messages/sec per Upbit (and Binance) connection, in ramp order")
+    parser.add_argument("--allmids-rate", type=float, default=2, help="Hyperliquid allMids pushes/sec")
+    parser.add_argument("--spot-pairs", type=int, default=300)
+    parser.add_argument("--processes", action="store_true",
+                        help="run the monitor with --processes (feeds in their own processes)")
+    parser.add_argument("--payloads", metavar="DIR", help="have the stand-in replay recorded <feed>.jsonl messages")
+    parser.add_argument("--windows", default="1m,15m", help="rolling stats windows (default 1m,15m)")
+    parser.add_argument("--cooldown", type=float, default=60.0,
+                        help="alert cooldown in seconds (default 60, as live; 0 alerts on every crossing)")
+    parser.add_argument("--duration", type=float, default=5.0, help="measured seconds per rate")
+    parser.add_argument("--warmup", type=float, default=1.5, help="seconds before measuring")
+    args = parser.parse_args()
+
+    port = free_port()
+    config = load_config()
+    config["symbols"] = [coin.lower() for coin in samples.coin_names(args.coins)]
+    config["usdt_source"] = args.usdt_source
+    config["uris"] = exchange_standin.uris(port)
+    track_feeds()
+
+    # Connections per feed, to turn the per-connection rate into a total.
+    kimp_monitor.setup(config)
+    upbit = len(kimp_monitor.registry.upbit_subscriptions())
+    binance = len(kimp_monitor.registry.binance_subscriptions()) if args.usdt_source == "binance" else 0
+
+    print(f"{args.coins} coins, USDT leg from {args.usdt_source}: {upbit} Upbit / {binance} Binance connection(s)")
+    if (os.cpu_count() or 1) < 2:
+        print("Only one CPU: the stand-in and the monitor compete for it, so the maximum is understated.")
+    print(f"{'offered/s':>10} {'received/s':>11} {'cpu/msg(us)':>12} {'cpu%':>6} {'src%':>6} {'net p50':>8} {'net p99':>8} "
+          f"{'alert p50':>10} {'alert p99':>10} {'alerts':>8}  verdict   (latencies in ms)")
+    best = None
+    behind = 0
+    for rate in (float(r) for r in args.rates.split(",")):
+        offered = rate * (upbit + binance) + (args.allmids_rate if args.usdt_source == "hyperliquid" else 0)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            received, cpu_us, cpu_share, source_share, (net50, net99), (alert50, alert99), alerts = asyncio.run(
+                measure(config, args, port, rate))
+
+        if received >= MIN_DELIVERED * offered and net50 <= MAX_BACKLOG_MS:
+            verdict = "ok"
+            best = offered
+        elif source_share >= SOURCE_SATURATED:
+            verdict = "source"  # the stand-in itself ran out of CPU; run it with fewer coins / on another core
+        else:
+            verdict = "behind"
+        print(f"{offered:>10,.0f} {received:>11,.0f} {cpu_us:>12.1f} {cpu_share:>6.0%} {source_share:>6.0%} {net50:>8.1f} {net99:>8.1f} "
+              f"{alert50:>10.3f} {alert99:>10.3f} {alerts:>8}  {verdict}")
+        behind = behind + 1 if verdict != "ok" else 0
+        if behind == 2:
+            break
+
+    if best is None:
+        print("No offered rate was sustained.")
+    else:
+        print(f"Max sustained: {best:,.0f} msgs/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Local stand-in for the Binance, Upbit and Hyperliquid websocket feeds.
+
+One websocket server answers on three paths with each exchange's message
+format, so kimp_monitor can be pointed at it through the "uris" config:
+
+    /stream         Binance futures combined stream (SUBSCRIBE or ?streams=),
+                    tickers only
+    /websocket/v1   Upbit ticker or orderbook (binary frames, codes from the
+                    subscription)
+    /ws             Hyperliquid allMids, or l2Book for the subscribed coins
+
+The KRW prices carry a premium that swings between -5 and +6 KRW, so alerts
+fire regularly. Exchange timestamps are the wall clock at send time, which
+lets the monitor measure queueing delay. With --payloads DIR, the recorded raw messages in
+DIR/<feed>.jsonl are replayed instead.
+
+    python3 bench/exchange_standin.py --port 8900 --upbit-rate 2000 --coins 100
+    python3 bench/exchange_standin.py --drop-every 5     # exercise reconnects
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+from urllib.parse import parse_qs, urlparse
+
+import websockets
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import samples
+
+
+# Placeholder exchange timestamp in pre-built frames; replaced at send time.
+STAMP = "9999999999999"
+# Pre-built KRW frames per coin: one per premium step from PREMIUM_LOW to PREMIUM_HIGH KRW.
+PREMIUM_LOW, PREMIUM_HIGH, PREMIUM_STEP = -5.0, 6.0, 0.25
+VARIANTS = 8
+
+
+class Market:
+    """
+    Shared price model for all feeds.
+
+    USDT prices wobble around a fixed level per coin and the KRW prices carry
+    a premium that swings slowly between PREMIUM_LOW and PREMIUM_HIGH, so
+    alerts fire regularly. Every message is built up front; sending one is a
+    lookup plus a timestamp substitution, which keeps the stand-in well ahead
+    of the monitor it drives.
+    """
+
+    def __init__(self, coins, seed=1):
+        self.rng = rng = random.Random(seed)
+        self.coins = list(coins)
+        self.usdt = {coin: rng.uniform(0.05, 50000) for coin in self.coins}
+        self.usdt_krw = 1390.0
+        self.phase = {coin: rng.uniform(0, 2 * math.pi) for coin in self.coins}
+        stamp = int(STAMP)
+        self.krw_frames = {
+            coin: [samples.upbit_ticker(f"KRW-{coin}", price * (self.usdt_krw + level), stamp) for level in self._levels()]
+            for coin, price in self.usdt.items()
+        }
+        self.usdt_krw_frames = [samples.upbit_ticker("KRW-USDT", self.usdt_krw + rng.gauss(0, 0.1), stamp)
+                                for _ in range(VARIANTS)]
+        # Books are only built for coins that a subscriber asks for.
+        self._books = {}
+        self.binance_frames = {
+            coin: [samples.binance_ticker(coin, price * (1 + rng.gauss(0, 2e-4)), stamp) for _ in range(VARIANTS)]
+            for coin, price in self.usdt.items()
+        }
+
+    def premium_level(self, coin):
+        """Index into krw_frames[coin] for the current premium."""
+        premium = 0.5 + 5.5 * math.sin(time.monotonic() / 20 + self.phase[coin])
+        return int((premium - PREMIUM_LOW) / PREMIUM_STEP)
+
+    def upbit_book(self, coin):
+        """Pre-built Upbit orderbook frames for coin, around its current premium."""
+        frames = self._books.get(("upbit", coin))
+        if frames is None:
+            price, stamp = self.usdt[coin], int(STAMP)
+            frames = self._books["upbit", coin] = [
+                samples.upbit_orderbook(f"KRW-{coin}", price * (self.usdt_krw + level), stamp, rng=self.rng)
+                for level in self._levels()]
+        return frames[self.premium_level(coin)]
+
+    def l2_book(self, coin):
+        frames = self._books.get(("l2", coin))
+        if frames is None:
+            stamp = int(STAMP)
+            frames = self._books["l2", coin] = [samples.hyperliquid_l2book(coin, self.usdt[coin] * (1 + self.rng.gauss(0, 2e-4)),
+                                                                           stamp, rng=self.rng) for _ in range(VARIANTS)]
+        return self.rng.choice(frames)
+
+    @staticmethod
+    def _levels():
+        return [PREMIUM_LOW + n * PREMIUM_STEP for n in range(int((PREMIUM_HIGH - PREMIUM_LOW) / PREMIUM_STEP) + 1)]
+
+    def mids(self):
+        rng = self.rng
+        return {coin: price * (1 + rng.gauss(0, 2e-4)) for coin, price in self.usdt.items()}
+
+
+def stamped(frame):
+    """frame with the placeholder replaced by the current time in ms."""
+    if isinstance(frame, bytes):
+        return frame.replace(STAMP.encode(), str(int(time.time() * 1000)).encode())
+    return frame.replace(STAMP, str(int(time.time() * 1000)))
+
+
+class StandIn:
+    def __init__(self, market, upbit_rate, binance_rate, allmids_rate, spot_pairs=300,
+                 drop_every=None, payloads=None, book_rate=50):
+        self.market = market
+        self.rates = {"upbit": upbit_rate, "binance": binance_rate, "hyperliquid": allmids_rate, "book": book_rate}
+        self.spot_pairs = spot_pairs
+        self.drop_every = drop_every
+        self.payloads = payloads or {}
+        self.sent = {"upbit": 0, "binance": 0, "hyperliquid": 0}
+        self.connections = set()
+
+    async def pace(self, feed, rate, make_message, ws):
+        """Send make_message() results at `rate` per second, catching up in bursts."""
+        recorded = self.payloads.get(feed)
+        start = time.monotonic()
+        sent = 0
+        while True:
+            due = int((time.monotonic() - start) * rate) - sent
+            for _ in range(min(due, 1000)):
+                if recorded:
+                    await ws.send(recorded[sent % len(recorded)])
+                else:
+                    await ws.send(make_message())
+                sent += 1
+                self.sent[feed] += 1
+            await asyncio.sleep(0.001 if due < 1000 else 0)
+
+    async def binance(self, ws, path):
+        query = parse_qs(urlparse(path).query)
+        streams = query["streams"][0].split("/") if "streams" in query else []
+        if not streams:
+            request = json.loads(await ws.recv())
+            streams = request.get("params", [])
+            await ws.send(json.dumps({"result": None, "id": request.get("id")}))
+        coins = [s.split("usdt@", 1)[0].upper() for s in streams if "usdt@" in s]
+        frames = [self.market.binance_frames[c] for c in coins if c in self.market.usdt]
+        frames = frames or list(self.market.binance_frames.values())
+        rng = self.market.rng
+
+        def message():
+            return stamped(rng.choice(rng.choice(frames)))
+
+        await self.pace("binance", self.rates["binance"], message, ws)
+
+    async def upbit(self, ws, path):
+        request = json.loads(await ws.recv())
+        part = next((part for part in request if "codes" in part), {"codes": [], "type": "ticker"})
+        codes = part["codes"]
+        coins = [c[4:] for c in codes if c.startswith("KRW-") and c[4:] in self.market.usdt]
+        with_usdt = "KRW-USDT" in codes
+        market = self.market
+        rng = market.rng
+
+        if part["type"] == "orderbook":
+            def message():
+                return stamped(market.upbit_book(rng.choice(coins)))
+
+            await self.pace("upbit", self.rates["book"], message, ws)
+            return
+
+        def message():
+            # Roughly one USDT/KRW tick for every ten coin ticks, like the real feed.
+            if with_usdt and (not coins or rng.random() < 0.1):
+                return stamped(rng.choice(market.usdt_krw_frames))
+            coin = rng.choice(coins)
+            return stamped(market.krw_frames[coin][market.premium_level(coin)])
+
+        await self.pace("upbit", self.rates["upbit"], message, ws)
+
+    async def hyperliquid(self, ws, path):
+        request = json.loads(await ws.recv())
+        await ws.send(json.dumps({"channel": "subscriptionResponse", "data": request}))
+        if request["subscription"]["type"] == "l2Book":
+            # One subscribe message per coin: collect those that follow.
+            coins = [request["subscription"]["coin"]]
+            while True:
+                try:
+                    request = json.loads(await asyncio.wait_for(ws.recv(), 0.2))
+                except asyncio.TimeoutError:
+                    break
+                coins.append(request["subscription"]["coin"])
+                await ws.send(json.dumps({"channel": "subscriptionResponse", "data": request}))
+            coins = [c for c in coins if c in self.market.usdt]
+            rng = self.market.rng
+
+            def message():
+                return stamped(self.market.l2_book(rng.choice(coins)))
+
+            await self.pace("hyperliquid", self.rates["book"], message, ws)
+            return
+
+        def message():
+            return samples.allmids_message(self.market.mids(), self.spot_pairs)
+
+        await self.pace("hyperliquid", self.rates["hyperliquid"], message, ws)
+
+    async def handler(self, ws, path=None):
+        if path is None:
+            path = ws.request.path
+        self.connections.add(ws)
+        try:
+            if path.startswith("/stream"):
+                await self.binance(ws, path)
+            elif path.startswith("/websocket/v1"):
+                await self.upbit(ws, path)
+            elif path.startswith("/ws"):
+                await self.hyperliquid(ws, path)
+            else:
+                await ws.close(code=1008, reason=f"unknown path {path}")
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.connections.discard(ws)
+
+    async def dropper(self):
+        """Close every connection every drop_every seconds."""
+        while True:
+            await asyncio.sleep(self.drop_every)
+            for ws in list(self.connections):
+                await ws.close(code=1001, reason="stand-in drop")
+
+    async def serve(self, host, port, ready=None):
+        async with websockets.serve(self.handler, host, port, max_size=None):
+            if ready is not None:
+                ready.set()
+            if self.drop_every:
+                await self.dropper()
+            else:
+                await asyncio.Future()
+
+
+def uris(port, host="127.0.0.1"):
+    """"uris" config section pointing kimp_monitor at a stand-in."""
+    return {
+        "binance": f"ws://{host}:{port}/stream",
+        "upbit": f"ws://{host}:{port}/websocket/v1",
+        "hyperliquid": f"ws://{host}:{port}/ws",
+    }
+
+
+def load_payloads(directory):
+    payloads = {}
+    for feed in ("upbit", "binance", "hyperliquid"):
+        path = os.path.join(directory, f"{feed}.jsonl")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                lines = [line.rstrip(b"\n") for line in f if line.strip()]
+            # Upbit sends binary frames; the others text.
+            payloads[feed] = lines if feed == "upbit" else [line.decode("utf-8") for line in lines]
+    return payloads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--coins", type=int, default=6, help="coins in the simulated universe")
+    parser.add_argument("--upbit-rate", type=float, default=200, help="Upbit messages/sec per connection")
+    parser.add_argument("--binance-rate", type=float, default=200, help="Binance messages/sec per connection")
+    parser.add_argument("--allmids-rate", type=float, default=2, help="Hyperliquid allMids pushes/sec")
+    parser.add_argument("--book-rate", type=float, default=50, help="orderbook / l2Book messages/sec per connection")
+    parser.add_argument("--spot-pairs", type=int, default=300, help="extra '@N' spot mids per allMids push")
+    parser.add_argument("--drop-every", type=float, metavar="SECONDS", help="close all connections periodically")
+    parser.add_argument("--payloads", metavar="DIR", help="replay recorded <feed>.jsonl messages instead")
+    args = parser.parse_args()
+
+    standin = StandIn(Market(samples.coin_names(args.coins)), args.upbit_rate, args.binance_rate,
+                      args.allmids_rate, args.spot_pairs, args.drop_every,
+                      load_payloads(args.payloads) if args.payloads else None, args.book_rate)
+    print(f"Stand-in feeds on {json.dumps(uris(args.port, args.host))}", flush=True)
+    try:
+        asyncio.run(standin.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Local stand-in for Hyperliquid's POST /info endpoint.
+
+Answers the requests the funding tools make, with data shaped like the real
+responses:
+
+    meta              the perp universe (--coins synthetic / major names)
+    metaAndAssetCtxs  the universe plus each perp's current funding, open
+                      interest, volume and prices
+    fundingHistory    hourly records since each coin's listing, oldest
+                      first, capped at 500 rows per response like the API
+
+Every response is delayed by --latency to stand in for the round trip to
+the exchange. The stand-in also keeps Hyperliquid's weight budget (1200 per
+minute; 20 per request plus 1 per 20 fundingHistory rows) and answers 429
+when a client overruns it, and can fail a share of requests with 429 / 502
+to exercise retries.
+
+    python3 bench/info_standin.py --port 8901 --coins 150 --latency 0.1
+    python3 get-funding.py all --api-url http://127.0.0.1:8901/info
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import samples
+
+DAY_MS = 24 * samples.HOUR_MS
+MAX_ROWS = 500
+
+
+class Budget:
+    """Server-side weight limit: a token bucket that refuses instead of waiting."""
+
+    def __init__(self, per_minute):
+        self.per_minute = per_minute
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self, weight):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.per_minute, self.tokens + (now - self.updated) * self.per_minute / 60)
+            self.updated = now
+            if self.tokens < weight:
+                return False
+            self.tokens -= weight
+            return True
+
+    def charge(self, weight):
+        with self.lock:
+            self.tokens -= weight
+
+
+class InfoStandIn:
+    """
+    :param coins: Perp names
+    :param latency: Seconds added to every response
+    :param budget: Weight per minute to enforce (0: unlimited)
+    :param fail_rate: Share of requests answered with a retryable error
+    :param history_days: Days of history of the oldest coin; coin n is listed n days later
+    """
+
+    def __init__(self, coins, latency=0.0, budget=1200, fail_rate=0.0, history_days=400, seed=1):
+        self.coins = coins
+        self.latency = latency
+        self.budget = Budget(budget) if budget else None
+        self.fail_rate = fail_rate
+        self.rng = random.Random(seed)
+        now = int(time.time() * 1000)
+        self.listed = {coin: now - (history_days - n % history_days) * DAY_MS for n, coin in enumerate(coins)}
+        self.requests = 0
+        self.rejected = 0
+        self.failed = 0
+
+    def answer(self, request):
+        """(status, body) for one /info request."""
+        self.requests += 1
+        if self.budget is not None and not self.budget.take(20):
+            self.rejected += 1
+            return 429, None
+        if self.fail_rate and self.rng.random() < self.fail_rate:
+            self.failed += 1
+            return self.rng.choice((429, 502)), None
+        kind = request.get("type")
+        if kind == "meta":
+            return 200, {"universe": [{"name": coin, "szDecimals": 2, "maxLeverage": 10} for coin in self.coins]}
+        if kind == "metaAndAssetCtxs":
+            now = int(time.time() * 1000)
+            universe = [{"name": coin, "szDecimals": 2, "maxLeverage": 10} for coin in self.coins]
+            return 200, [{"universe": universe}, [samples.asset_context(coin, now) for coin in self.coins]]
+        if kind == "fundingHistory":
+            coin = request.get("coin")
+            if coin not in self.listed:
+                return 500, None  # what the API answers for an unknown coin
+            end = request.get("endTime") or int(time.time() * 1000)
+            rows = samples.funding_history(coin, request["startTime"], end, self.listed[coin], MAX_ROWS)
+            if self.budget is not None:
+                self.budget.charge(len(rows) // 20)
+            return 200, rows
+        return 422, None
+
+    def handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real endpoint
+            disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                try:
+                    status, data = standin.answer(json.loads(body))
+                except (ValueError, KeyError, TypeError):
+                    status, data = 422, None
+                time.sleep(standin.latency)
+                payload = json.dumps(data, separators=(",", ":")).encode() if data is not None else b"null"
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def serve(standin, port, host="127.0.0.1"):
+    server = ThreadingHTTPServer((host, port), standin.handler())
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8901)
+    parser.add_argument("--coins", type=int, default=150, help="perps in the universe (default 150)")
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds added to every response (default 0.1)")
+    parser.add_argument("--budget", type=float, default=1200, help="weight per minute to enforce; 0 for none")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="share of requests failed with 429/502")
+    parser.add_argument("--history-days", type=int, default=400)
+    args = parser.parse_args()
+
+    standin = InfoStandIn(samples.coin_names(args.coins), args.latency, args.budget, args.fail_rate,
+                          args.history_days)
+    server = serve(standin, args.port)
+    print(f"Serving /info on http://127.0.0.1:{args.port}/info")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"{standin.requests} requests, {standin.rejected} over budget, {standin.failed} failed on purpose")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Synthetic exchange messages shaped like the real feeds.
+
+Used by the benchmarks when no recorded payloads are given. Field sets and
+ordering follow what the exchanges actually send, so message sizes and parse
+costs are representative.
+"""
+import json
+import math
+import random
+import zlib
+
+MAJORS = [
+    "BTC", "ETH", "XRP", "SOL", "DOGE", "TRUMP", "ADA", "AVAX", "LINK", "DOT",
+    "SUI", "APT", "ARB", "OP", "NEAR", "ATOM", "TRX", "BCH", "ETC", "HBAR",
+    "SEI", "STX", "AAVE", "UNI", "ONDO", "ENA", "PENGU", "W", "ZRO", "BERA",
+]
+
+
+def coin_names(count):
+    """`count` perp coin names: the majors first, then synthetic ones."""
+    names = MAJORS[:count]
+    names += [f"COIN{n:03d}" for n in range(count - len(names))]
+    return names
+
+
+def random_prices(coins, rng=random):
+    return {coin: round(rng.uniform(0.01, 100000), 5) for coin in coins}
+
+
+def allmids_message(mids, spot_pairs=300):
+    """Hyperliquid allMids push: every perp mid plus '@N' spot mids."""
+    all_mids = {coin: f"{price:.5f}".rstrip("0").rstrip(".") for coin, price in mids.items()}
+    for n in range(spot_pairs):
+        all_mids[f"@{n}"] = f"{1 + n * 0.137:.4f}"
+    return json.dumps({"channel": "allMids", "data": {"mids": all_mids}}, separators=(",", ":"))
+
+
+def upbit_ticker(code, price, timestamp_ms):
+    """Upbit ticker frame (DEFAULT format); Upbit sends these as binary."""
+    return json.dumps({
+        "type": "ticker", "code": code, "opening_price": price * 0.99, "high_price": price * 1.02,
+        "low_price": price * 0.98, "trade_price": price, "prev_closing_price": price * 0.99,
+        "acc_trade_price": 123456789012.3456, "change": "RISE", "change_price": price * 0.01,
+        "signed_change_price": price * 0.01, "change_rate": 0.0101, "signed_change_rate": 0.0101,
+        "ask_bid": "BID", "trade_volume": 0.0123, "acc_trade_volume": 1234.5678,
+        "trade_date": "20250101", "trade_time": "010203", "trade_timestamp": timestamp_ms - 3,
+        "acc_ask_volume": 600.1, "acc_bid_volume": 634.4, "highest_52_week_price": price * 1.5,
+        "highest_52_week_date": "2024-12-17", "lowest_52_week_price": price * 0.5,
+        "lowest_52_week_date": "2024-08-05", "market_state": "ACTIVE", "is_trading_suspended": False,
+        "delisting_date": None, "market_warning": "NONE", "timestamp": timestamp_ms,
+        "acc_trade_price_24h": 234567890123.4567, "acc_trade_volume_24h": 2345.6789,
+        "stream_type": "REALTIME",
+    }, separators=(",", ":")).encode("utf-8")
+
+
+def binance_ticker(symbol, price, event_time_ms):
+    """Binance futures combined-stream 24hrTicker message."""
+    s = symbol.upper() + "USDT"
+    return json.dumps({"stream": f"{symbol.lower()}usdt@ticker", "data": {
+        "e": "24hrTicker", "E": event_time_ms, "s": s, "p": f"{price * 0.01:.4f}", "P": "1.010",
+        "w": f"{price * 0.995:.4f}", "c": f"{price:.4f}", "Q": "0.010", "o": f"{price * 0.99:.4f}",
+        "h": f"{price * 1.02:.4f}", "l": f"{price * 0.98:.4f}", "v": "123456.789", "q": "98765432.10",
+        "O": event_time_ms - 86400000, "C": event_time_ms, "F": 5000000, "L": 5123456, "n": 123457,
+    }}, separators=(",", ":"))
+
+
+def upbit_orderbook(code, mid, timestamp_ms, levels=15, spread=0.0005, rng=random):
+    """Upbit orderbook frame: `levels` units around mid, best first; sent as binary."""
+    units = [{
+        "ask_price": mid * (1 + spread * (n + 1)), "bid_price": mid * (1 - spread * (n + 1)),
+        "ask_size": round(rng.uniform(0.01, 5), 8), "bid_size": round(rng.uniform(0.01, 5), 8),
+    } for n in range(levels)]
+    return json.dumps({
+        "type": "orderbook", "code": code, "timestamp": timestamp_ms,
+        "total_ask_size": sum(u["ask_size"] for u in units), "total_bid_size": sum(u["bid_size"] for u in units),
+        "orderbook_units": units, "stream_type": "REALTIME", "level": 0,
+    }, separators=(",", ":")).encode("utf-8")
+
+
+def hyperliquid_l2book(coin, mid, time_ms, levels=20, spread=0.0002, rng=random):
+    """Hyperliquid l2Book push: `levels` bids and asks around mid, best first."""
+    def side(sign):
+        return [{"px": f"{mid * (1 + sign * spread * (n + 1)):.6g}", "sz": f"{rng.uniform(0.01, 10):.4f}",
+                 "n": rng.randint(1, 9)} for n in range(levels)]
+    return json.dumps({"channel": "l2Book", "data": {"coin": coin, "time": time_ms, "levels": [side(-1), side(1)]}},
+                      separators=(",", ":"))
+
+
+def binance_depth_update(symbol, bids, asks, first_id, last_id, prev_id, event_time_ms):
+    """Binance futures combined-stream depthUpdate; bids / asks as [(price, qty)], qty 0 removes."""
+    s = symbol.upper() + "USDT"
+    return json.dumps({"stream": f"{symbol.lower()}usdt@depth@100ms", "data": {
+        "e": "depthUpdate", "E": event_time_ms, "T": event_time_ms - 2, "s": s,
+        "U": first_id, "u": last_id, "pu": prev_id,
+        "b": [[f"{p:.4f}", f"{q:.3f}"] for p, q in bids], "a": [[f"{p:.4f}", f"{q:.3f}"] for p, q in asks],
+    }}, separators=(",", ":"))
+
+
+HOUR_MS = 3_600_000
+
+
+def funding_rate(coin, time_ms):
+    """Deterministic hourly funding rate of a coin: a slow swing plus per-coin bias."""
+    bias = (zlib.crc32(coin.encode()) % 21 - 6) * 1e-6
+    return bias + 1.25e-5 + 2e-5 * math.sin(time_ms / HOUR_MS / 37 + len(coin))
+
+
+def funding_history(coin, start_ms, end_ms, listed_ms, limit=500):
+    """
+    Hyperliquid fundingHistory rows of `coin` in [start_ms, end_ms]: one per
+    hour since `listed_ms`, oldest first, at most `limit` (the API's cap).
+    Times carry the few ms of jitter the real ones have.
+    """
+    first = max(start_ms, listed_ms)
+    hour = first // HOUR_MS
+    rows = []
+    while len(rows) < limit:
+        time_ms = hour * HOUR_MS + hour % 7 * 11
+        if time_ms > end_ms:
+            break
+        if time_ms >= first:
+            rate = funding_rate(coin, time_ms)
+            rows.append({"coin": coin, "fundingRate": f"{rate:.8f}", "premium": f"{rate - 1.25e-5:.8f}",
+                         "time": time_ms})
+        hour += 1
+    return rows
+
+
+def asset_context(coin, time_ms):
+    """Hyperliquid metaAndAssetCtxs entry of a perp, funding matching funding_history()."""
+    seed = zlib.crc32(coin.encode())
+    mark = 0.05 + (seed * 7919 % 100000) / 7.0
+    rate = funding_rate(coin, time_ms)
+    return {
+        "funding": f"{rate:.8f}", "openInterest": f"{(seed * 104729 % 5_000_000) / mark + 10:.2f}",
+        "prevDayPx": f"{mark * 0.98:.5f}", "dayNtlVlm": f"{seed * 15485863 % 300_000_000:.2f}",
+        "premium": f"{rate - 1.25e-5:.8f}", "oraclePx": f"{mark * 0.9999:.5f}", "markPx": f"{mark:.5f}",
+        "midPx": f"{mark:.5f}", "impactPxs": [f"{mark * 0.9998:.5f}", f"{mark * 1.0002:.5f}"],
+    }
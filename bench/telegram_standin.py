@@ -0,0 +1,124 @@
+"""
+Local stand-in for the Telegram Bot API's sendMessage, for kimp_alerts.
+
+Accepts GET or POST /bot<token>/sendMessage with chat_id and text (query
+string, form or JSON), records every delivered message and answers like the
+real API:
+
+    200  {"ok": true, "result": {...}}
+    401  wrong token
+    400  missing chat_id or text
+    429  {"ok": false, "parameters": {"retry_after": N}} for the requests
+         --rate-limit picks (every Nth), or whatever `script` says
+
+`script` is a list of statuses (200, 429, 400, 500, ...) answered in order
+before falling back to the normal behaviour, so a test can ask for exactly
+"one 429, then OK". Point TelegramSink at it with api_base.
+
+    python3 bench/telegram_standin.py --port 8902 --rate-limit 5
+    KIMP_TELEGRAM_TOKEN=TEST ... TelegramSink("TEST", "@chat", api_base="http://127.0.0.1:8902")
+"""
+import argparse
+import asyncio
+import time
+
+from aiohttp import web
+
+TOKEN = "TEST"
+
+
+class TelegramStandIn:
+    """
+    :param token: Bot token the stand-in accepts
+    :param rate_limit: Answer every Nth request with 429 (0: never)
+    :param retry_after: retry_after sent with a 429, in seconds (floats allowed, unlike Telegram)
+    :param script: Statuses to answer first, in order
+    """
+
+    def __init__(self, token=TOKEN, rate_limit=0, retry_after=1, script=()):
+        self.token = token
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.script = list(script)
+        self.messages = []  # (chat_id, text) delivered
+        self.requests = 0
+        self.statuses = []  # status of every answer, in order
+        self.times = []  # time.monotonic() of every request
+        self._runner = None
+
+    def _answer(self, status, body):
+        self.statuses.append(status)
+        return web.json_response(body, status=status)
+
+    async def send_message(self, request):
+        self.requests += 1
+        self.times.append(time.monotonic())
+        if request.match_info["token"] != self.token:
+            return self._answer(401, {"ok": False, "error_code": 401, "description": "Unauthorized"})
+        params = dict(request.query)
+        if request.method == "POST":
+            if request.content_type == "application/json":
+                params.update(await request.json())
+            else:
+                params.update(await request.post())
+        status = self.script.pop(0) if self.script else 200
+        if status == 200 and self.rate_limit and self.requests % self.rate_limit == 0:
+            status = 429
+        if status == 429:
+            return self._answer(429, {"ok": False, "error_code": 429,
+                                      "description": f"Too Many Requests: retry after {self.retry_after}",
+                                      "parameters": {"retry_after": self.retry_after}})
+        if status != 200:
+            return self._answer(status, {"ok": False, "error_code": status, "description": "Stand-in error"})
+        if not params.get("chat_id") or not params.get("text"):
+            return self._answer(400, {"ok": False, "error_code": 400, "description": "Bad Request: message text is empty"})
+        self.messages.append((params["chat_id"], params["text"]))
+        return self._answer(200, {"ok": True, "result": {"message_id": len(self.messages),
+                                                          "chat": {"id": params["chat_id"]},
+                                                          "text": params["text"]}})
+
+    def app(self):
+        app = web.Application()
+        app.router.add_route("*", "/bot{token}/sendMessage", self.send_message)
+        return app
+
+    async def start(self, port=0, host="127.0.0.1"):
+        """Serve in the running loop; returns the api_base URL."""
+        self._runner = web.AppRunner(self.app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        return f"http://{host}:{port}"
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+async def serve(standin, port):
+    api_base = await standin.start(port)
+    print(f"Telegram stand-in on {api_base} (token {standin.token})")
+    try:
+        while True:
+            await asyncio.sleep(3600)
+    finally:
+        await standin.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8902)
+    parser.add_argument("--token", default=TOKEN)
+    parser.add_argument("--rate-limit", type=int, default=0, metavar="N", help="answer every Nth request with 429")
+    parser.add_argument("--retry-after", type=float, default=1)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(TelegramStandIn(args.token, args.rate_limit, args.retry_after), args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+"""
+crypto-tools: wallet seeds, Hyperliquid funding history and the kimchi
+premium monitor behind one command (see crypto_tools.cli).
+
+Importing the package loads nothing else; each subcommand imports its own
+modules when it runs.
+"""
+__version__ = "0.1.0"
@@ -0,0 +1,54 @@
+"""
+The crypto-tools command.
+
+    crypto-tools seed [--words 12 | --check PHRASE | --derive N ...]
+    crypto-tools funding COIN ... | all | --screen [...]
+    crypto-tools kimp [--replay FILE ... | --processes ...]
+
+Subcommands are looked up by name and their module is imported only when
+that subcommand runs, so `crypto-tools funding --offline` never loads
+requests, websockets or ecdsa. Everything after the subcommand is passed to
+the module's own argument parser; `crypto-tools funding --help` is
+`python3 get-funding.py --help`.
+"""
+import importlib
+import sys
+
+# name -> (module, function taking argv, one-line help)
+COMMANDS = {
+    "seed": ("mk_seed", "main", "BIP-39 mnemonics and EVM keys (mk_seed.py)"),
+    "funding": ("get_funding", "main", "Hyperliquid funding history and screener (get-funding.py)"),
+    "kimp": ("kimp_monitor", "cli", "kimchi premium monitor (kimp_monitor.py)"),
+}
+
+
+def usage():
+    lines = ["usage: crypto-tools {" + ",".join(COMMANDS) + "} [args ...]", "", "commands:"]
+    lines += [f"  {name:<9} {help_text}" for name, (_, _, help_text) in COMMANDS.items()]
+    lines += ["", "crypto-tools COMMAND --help for the options of each."]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Run a subcommand; returns the exit status."""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0 if argv else 2
+    if argv[0] == "--version":
+        from crypto_tools import __version__
+        print(f"crypto-tools {__version__}")
+        return 0
+    name, args = argv[0], argv[1:]
+    if name not in COMMANDS:
+        print(f"crypto-tools: unknown command {name!r}\n\n{usage()}", file=sys.stderr)
+        return 2
+    module_name, function, _ = COMMANDS[name]
+    # The subcommand's own parser reports its name as the program.
+    sys.argv[0] = f"crypto-tools {name}"
+    try:
+        result = getattr(importlib.import_module(module_name), function)(args)
+    except KeyboardInterrupt:
+        print("\nProcess interrupted by user. Exiting...")
+        return 130
+    return result if isinstance(result, int) else 0
@@ -0,0 +1,274 @@
+"""
+Hyperliquid /info client for the funding tools.
+
+All requests go through one pooled requests.Session (kept-alive connections
+instead of a TCP + TLS handshake per call) and one TokenBucket shared by every
+worker thread, sized to Hyperliquid's REST budget:
+
+    1200 weight per minute per IP
+    info requests weigh 20; fundingHistory adds 1 per 20 rows returned
+
+A fundingHistory request reserves its base weight plus the row weight its
+time range implies before it is sent, and settles the difference once the
+rows are counted, so a burst of workers cannot overrun the budget even with
+many requests in flight.
+
+429 and 5xx responses, timeouts and dropped connections are retried with
+jittered exponential backoff (a 429 also empties the bucket, so the other
+workers back off too). When the retries run out the request raises InfoError
+instead of returning an empty result, so a gap in the data is never silent.
+"""
+import math
+import random
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+API_URL = "https://api.hyperliquid.xyz/info"
+WEIGHT_PER_MINUTE = 1200
+INFO_WEIGHT = 20
+# fundingHistory: one extra weight per this many rows in the response, at
+# most MAX_ROWS rows per response, one row per funding interval.
+ROWS_PER_WEIGHT = 20
+MAX_ROWS = 500
+FUNDING_INTERVAL_MS = 60 * 60 * 1000
+# Windows short enough that a full response means the funding interval was
+# shorter than assumed, never just a window that fit exactly. Record times
+# jitter by a few ms, so a span of n intervals can hold n + 1 records.
+WINDOW_MS = (MAX_ROWS - 2) * FUNDING_INTERVAL_MS - 1
+# First Hyperliquid funding record (2023-05-12 UTC): where a full backfill starts.
+HISTORY_START_MS = 1_683_849_600_000
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+# One perp's current state from metaAndAssetCtxs; funding is the hourly rate,
+# open_interest and volume (24h) are in USD.
+AssetContext = namedtuple("AssetContext", "coin funding mark open_interest volume premium")
+
+
+def _float(value):
+    return float(value) if value is not None else math.nan
+
+
+class InfoError(Exception):
+    """An /info request that failed for good (after retries, or not retryable)."""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    :param capacity: Largest burst, in weight
+    :param per_second: Refill rate, in weight per second
+    """
+
+    def __init__(self, capacity=WEIGHT_PER_MINUTE, per_second=WEIGHT_PER_MINUTE / 60):
+        self.capacity = capacity
+        self.per_second = per_second
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.waited = 0.0  # seconds spent blocked in acquire(), all threads
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.per_second)
+        self.updated = now
+
+    def acquire(self, weight):
+        """Block until `weight` tokens are available and take them."""
+        with self._cond:
+            start = None
+            while True:
+                self._refill()
+                if self.tokens >= weight:
+                    self.tokens -= weight
+                    if start is not None:
+                        self.waited += time.monotonic() - start
+                    return
+                if start is None:
+                    start = time.monotonic()
+                self._cond.wait((weight - self.tokens) / self.per_second)
+
+    def charge(self, weight):
+        """
+        Settle weight already spent (e.g. by the size of a response); may go
+        into debt. A negative weight refunds an over-reservation.
+        """
+        with self._cond:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - weight)
+            if weight < 0:
+                self._cond.notify_all()
+
+    def drain(self):
+        """The server says we are over the limit: start refilling from empty."""
+        with self._cond:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0)
+
+
+class InfoClient:
+    """
+    Rate-limited, retrying client for POST /info.
+
+    :param api_url: /info endpoint
+    :param bucket: TokenBucket shared with other clients on the same IP; None makes one
+    :param pool_size: Kept-alive connections (set to the number of worker threads)
+    :param retries: Retries per request after the first attempt
+    :param base_delay: First backoff ceiling in seconds
+    :param max_delay: Upper bound for any single backoff
+    :param timeout: Per-request timeout in seconds
+    """
+
+    def __init__(self, api_url=API_URL, bucket=None, pool_size=8, retries=5, base_delay=0.5, max_delay=10.0,
+                 timeout=10.0):
+        self.api_url = api_url
+        self.bucket = bucket or TokenBucket()
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        # Imported here, not at module load: --offline and --help never need requests.
+        import requests
+        from requests.adapters import HTTPAdapter
+        # A body cut off mid-transfer is as transient as a dropped connection;
+        # any other requests error (bad redirects, undecodable content) is not.
+        self._retry_errors = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+        self._fatal_errors = (requests.RequestException, ValueError)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.requests = 0
+        self.retried = 0
+
+    def _backoff(self, attempt, response=None):
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(self.max_delay, float(retry_after))
+                except ValueError:
+                    pass
+        # Full jitter, as in FeedSupervisor: workers that failed together retry apart.
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def post(self, payload, weight=INFO_WEIGHT):
+        """JSON response of one /info request; raises InfoError when it cannot be had."""
+        for attempt in range(self.retries + 1):
+            self.bucket.acquire(weight)
+            self.requests += 1
+            response = None
+            try:
+                response = self.session.post(self.api_url, json=payload, timeout=self.timeout)
+                if response.status_code not in RETRY_STATUS:
+                    response.raise_for_status()
+                    return response.json()
+                error = f"HTTP {response.status_code}"
+                if response.status_code == 429:
+                    self.bucket.drain()
+            except self._retry_errors as e:
+                error = f"{type(e).__name__}: {e}"
+            except self._fatal_errors as e:
+                # Other 4xx, a body that is not JSON, or another requests error: retrying won't help.
+                raise InfoError(f"{payload.get('type')} {payload.get('coin', '')}: {e}") from e
+            if attempt < self.retries:
+                self.retried += 1
+                time.sleep(self._backoff(attempt, response))
+        raise InfoError(f"{payload.get('type')} {payload.get('coin', '')}: {error} after {self.retries + 1} attempts")
+
+    def funding_history(self, coin, start_time, end_time):
+        """fundingHistory records of `coin` in [start_time, end_time] (ms)."""
+        expected = min(MAX_ROWS, (end_time - start_time) // FUNDING_INTERVAL_MS + 1) // ROWS_PER_WEIGHT
+        rows = self.post({"type": "fundingHistory", "coin": coin, "startTime": start_time, "endTime": end_time},
+                         INFO_WEIGHT + expected)
+        if not isinstance(rows, list):
+            raise InfoError(f"fundingHistory {coin}: unexpected response {str(rows)[:200]}")
+        self.bucket.charge(len(rows) // ROWS_PER_WEIGHT - expected)
+        return rows
+
+    def perp_names(self):
+        """Names of all listed (not delisted) Hyperliquid perps."""
+        meta = self.post({"type": "meta"})
+        return [asset["name"] for asset in meta["universe"] if not asset.get("isDelisted")]
+
+    def asset_contexts(self):
+        """[AssetContext] of every listed perp, from a single metaAndAssetCtxs request."""
+        try:
+            meta, contexts = self.post({"type": "metaAndAssetCtxs"})
+            assets = meta["universe"]
+        except (TypeError, ValueError, KeyError) as e:
+            raise InfoError(f"metaAndAssetCtxs: unexpected response: {e}") from e
+        out = []
+        for asset, ctx in zip(assets, contexts):
+            if asset.get("isDelisted"):
+                continue
+            mark = _float(ctx.get("markPx"))
+            out.append(AssetContext(asset["name"], _float(ctx.get("funding")), mark,
+                                    _float(ctx.get("openInterest")) * mark, _float(ctx.get("dayNtlVlm")),
+                                    _float(ctx.get("premium"))))
+        return out
+
+    def close(self):
+        self.session.close()
+
+
+def plan_windows(start_ms, end_ms, window_ms=WINDOW_MS):
+    """Split [start_ms, end_ms] into back-to-back [start, end] windows of at most window_ms."""
+    windows = []
+    while start_ms <= end_ms:
+        windows.append((start_ms, min(start_ms + window_ms, end_ms)))
+        start_ms += window_ms + 1
+    return windows
+
+
+def find_gaps(times, interval_ms=FUNDING_INTERVAL_MS):
+    """(before, after) for each pair of consecutive record times more than 1.5 intervals apart."""
+    limit = interval_ms * 3 // 2
+    return [(a, b) for a, b in zip(times, times[1:]) if b - a > limit]
+
+
+def fetch_funding_histories(client, ranges, workers=8):
+    """
+    Fetch fundingHistory for [(coin, start_ms, end_ms)] ranges of any length
+    on `workers` threads.
+
+    The first request of a range asks for all of it. The API answers with the
+    oldest MAX_ROWS rows, which covers a short range in one request and shows
+    where a coin's history really starts. When that answer is full, the rest
+    of the range (from just after its last row) is split by plan_windows()
+    and the windows are fetched in parallel; a window that still comes back
+    full is continued from its last row. No window is assumed complete.
+
+    Yields (coin, start_ms, end_ms, rows, error) per request as it finishes;
+    exactly one of rows / error is None. An error means [start_ms, end_ms]
+    of that coin is missing.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+
+        def submit(coin, start, end, first):
+            pending[pool.submit(client.funding_history, coin, start, end)] = (coin, start, end, first)
+
+        for coin, start, end in ranges:
+            submit(coin, start, end, True)
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    coin, start, end, first = pending.pop(future)
+                    try:
+                        rows = future.result()
+                    except InfoError as e:
+                        yield coin, start, end, None, e
+                        continue
+                    if len(rows) >= MAX_ROWS and rows[-1]["time"] < end:
+                        rest = rows[-1]["time"] + 1
+                        for window in plan_windows(rest, end) if first else [(rest, end)]:
+                            submit(coin, *window, False)
+                    yield coin, start, end, rows, None
+        finally:
+            for future in pending:
+                future.cancel()  # a consumer that stops early doesn't wait for the queue
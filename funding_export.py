@@ -0,0 +1,241 @@
+"""
+Streaming export of funding history to CSV and a fixed-width binary format.
+
+Nothing here holds a coin's whole history in memory. Records are
+(time ms, rate, premium) tuples and pass through in bounded blocks:
+
+- ChunkSpool takes fetched chunks in whatever order the workers finish,
+  writes each one to its own temporary run file, and merges the runs back in
+  time order. A run is only opened once the merge reaches its first record
+  and is read a block at a time, so memory is bounded by the runs that
+  overlap in time (for the range planner's disjoint windows, one), not by
+  the number of runs. Records with the same time keep the last one added.
+- export() writes one ordered record stream to CSV and/or binary in a single
+  pass.
+
+Binary file (".fund"), little-endian:
+
+    header   24 bytes   magic b"FUNDHIST", version u16, record size u16,
+                        coin (ASCII, NUL-padded to 12 bytes)
+    records  24 bytes   time i64 (ms), rate f64, premium f64 (NaN if none)
+
+Records are oldest first and 8-byte aligned, so FundingFile maps the file
+and exposes times, rates and premiums as strided memoryviews over the
+mapping: nothing is parsed or copied, and a FundingSeries can be built
+straight on top (bisect and the running sums work on memoryviews).
+"""
+import csv
+import heapq
+import math
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+MAGIC = b"FUNDHIST"
+VERSION = 1
+HEADER = struct.Struct("<8sHH12s")
+RECORD = struct.Struct("<qdd")
+# Records per read / write block.
+BLOCK = 4096
+
+
+def _premium(value):
+    return float(value) if value is not None else math.nan
+
+
+def row_records(rows):
+    """(time, rate, premium) tuples from fundingHistory rows (API dicts); rows whose rate doesn't parse are skipped."""
+    records = []
+    for row in rows:
+        try:
+            records.append((row["time"], float(row["fundingRate"]), _premium(row.get("premium"))))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return records
+
+
+def _read_run(path):
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(RECORD.size * BLOCK)
+            if not block:
+                return
+            yield from RECORD.iter_unpack(block)
+
+
+class ChunkSpool:
+    """
+    Spills fetched chunks of one coin to temporary run files and merges them
+    in time order. Memory use while merging is one block per run open at
+    the same time.
+
+    :param directory: Where the run files go (default: the system temp dir)
+    """
+
+    def __init__(self, directory=None):
+        self._dir = tempfile.TemporaryDirectory(prefix="funding-", dir=directory)
+        self.runs = []
+        self.records = 0
+        self.invalid = 0  # rows skipped by add_rows()
+
+    def add_rows(self, rows):
+        """One chunk of fundingHistory rows (API dicts)."""
+        records = row_records(rows)
+        self.invalid += len(rows) - len(records)
+        self.add(records)
+
+    def add(self, records):
+        """One chunk of (time, rate, premium) records."""
+        records = sorted(records)
+        if not records:
+            return
+        n = len(self.runs)
+        path = os.path.join(self._dir.name, f"{n}.run")
+        with open(path, "wb") as f:
+            for start in range(0, len(records), BLOCK):
+                f.write(b"".join(RECORD.pack(*record) for record in records[start:start + BLOCK]))
+        self.runs.append((records[0][0], n, path))
+        self.records += len(records)
+
+    def merged(self):
+        """All records, oldest first, one per time (the latest chunk wins)."""
+        runs = sorted(self.runs)  # by first time
+        # (time, run number, rate, premium, reader): equal times pop oldest run first.
+        heap = []
+        opened = 0
+        previous = None
+        while heap or opened < len(runs):
+            # Open every run that starts before the next record out.
+            while opened < len(runs) and (not heap or runs[opened][0] <= heap[0][0]):
+                _, n, path = runs[opened]
+                opened += 1
+                reader = _read_run(path)
+                time, rate, premium = next(reader)
+                heapq.heappush(heap, (time, n, rate, premium, reader))
+            time, n, rate, premium, reader = heap[0]
+            following = next(reader, None)
+            if following is None:
+                heapq.heappop(heap)
+            else:
+                heapq.heapreplace(heap, (following[0], n, following[1], following[2], reader))
+            if previous is not None and time != previous[0]:
+                yield previous
+            previous = (time, rate, premium)
+        if previous is not None:
+            yield previous
+
+    def close(self):
+        self._dir.cleanup()
+
+
+class BinaryWriter:
+    """Writes a .fund file; records must come oldest first."""
+
+    def __init__(self, path, coin):
+        name = coin.encode("ascii")
+        if len(name) > 12:
+            raise ValueError(f"Coin name too long for the binary header: {coin}")
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, name))
+        self.records = 0
+        self._block = bytearray(RECORD.size * BLOCK)
+        self._fill = 0
+
+    def write(self, time, rate, premium):
+        RECORD.pack_into(self._block, self._fill * RECORD.size, time, rate, premium)
+        self._fill += 1
+        self.records += 1
+        if self._fill == BLOCK:
+            self.file.write(self._block)
+            self._fill = 0
+
+    def close(self):
+        self.file.write(memoryview(self._block)[:self._fill * RECORD.size])
+        self.file.close()
+
+
+class CsvWriter:
+    """Writes the CSV get-funding.py always saved: coin, fundingRate, premium, time."""
+
+    def __init__(self, path, coin):
+        self.path = path
+        self.coin = coin
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(["coin", "fundingRate", "premium", "time"])
+        self.records = 0
+
+    def write(self, time, rate, premium):
+        self.writer.writerow([self.coin, repr(rate), "" if math.isnan(premium) else repr(premium), time])
+        self.records += 1
+
+    def close(self):
+        self.file.close()
+
+
+def export(records, coin, csv_path=None, bin_path=None):
+    """
+    Write an ordered (time, rate, premium) stream to CSV and/or binary in one
+    pass; returns the number of records.
+    """
+    writers = []
+    try:
+        if csv_path:
+            writers.append(CsvWriter(csv_path, coin))
+        if bin_path:
+            writers.append(BinaryWriter(bin_path, coin))
+        count = 0
+        for time, rate, premium in records:
+            for writer in writers:
+                writer.write(time, rate, premium)
+            count += 1
+        return count
+    finally:
+        for writer in writers:
+            writer.close()
+
+
+class FundingFile:
+    """
+    A .fund file mapped read-only; times / rates / premiums are zero-copy
+    views into the mapping (copies on big-endian machines).
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError(f"{path}: not a funding history file")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, coin = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self._map.close()
+            raise ValueError(f"{path}: not a version {VERSION} funding history file")
+        self.coin = coin.rstrip(b"\0").decode("ascii")
+        count = (size - HEADER.size) // RECORD.size
+        self._view = memoryview(self._map)[HEADER.size:HEADER.size + count * RECORD.size]
+        if sys.byteorder == "little":
+            self.times = self._view.cast("q")[0::3]
+            floats = self._view.cast("d")
+            self.rates = floats[1::3]
+            self.premiums = floats[2::3]
+        else:
+            records = list(RECORD.iter_unpack(self._view))
+            self.times = array("q", (r[0] for r in records))
+            self.rates = array("d", (r[1] for r in records))
+            self.premiums = array("d", (r[2] for r in records))
+
+    def __len__(self):
+        return len(self.times)
+
+    def close(self):
+        # Views into the mapping must go before it can be closed.
+        for view in (self.times, self.rates, self.premiums):
+            if isinstance(view, memoryview):
+                view.release()
+        self._view.release()
+        self._map.close()
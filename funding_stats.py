@@ -0,0 +1,133 @@
+"""
+Funding-rate analytics over contiguous arrays for get-funding.py.
+
+A coin's history is two arrays, record times (array('q'), ms) and hourly
+funding rates (array('d')), parsed once. Running sums of the rates and of
+their squares (itertools.accumulate) then give the sum, mean and standard
+deviation over any time window with two bisects and a few subtractions,
+whatever the window's length. The sums run from the newest record backwards
+and are only extended as deep as the oldest window asked for, so a 30-day
+screener over years of stored history never touches the older records.
+Windows with no records give NaN instead of dividing by zero.
+
+Rates are hourly, so APR = rate x 24 x 365; volatility is the standard
+deviation of the hourly rate in the same APR units.
+"""
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from itertools import accumulate
+from operator import mul
+
+
+NAN = float("nan")
+HOURS_PER_YEAR = 24 * 365
+DEFAULT_WINDOWS = "8h,24h,7d,30d"
+
+# Stats of one window; apr, cumulative and volatility in percent.
+WindowStats = namedtuple("WindowStats", "records apr cumulative volatility")
+
+
+class FundingSeries:
+    """
+    Funding history of one coin with prefix sums for window queries.
+
+    :param times: Record times in ms, ascending (array('q') or memoryview, e.g.
+                  FundingFile.times, used as is; other sequences are copied)
+    :param rates: Hourly funding rates, same length
+    """
+
+    def __init__(self, times, rates):
+        self.times = times if isinstance(times, (array, memoryview)) else array("q", times)
+        self.rates = rates if isinstance(rates, (array, memoryview)) else array("d", rates)
+        # sums[k] / sumsq[k]: sum of the newest k rates / squared rates.
+        self.sums = array("d", [0.0])
+        self.sumsq = array("d", [0.0])
+        self.invalid = 0  # records dropped by from_rows()
+
+    @classmethod
+    def from_rows(cls, rows):
+        """From fundingHistory rows sorted by time; rows whose rate doesn't parse are dropped and counted."""
+        times, rates = array("q"), array("d")
+        invalid = 0
+        for row in rows:
+            try:
+                rate = float(row["fundingRate"])
+            except (KeyError, TypeError, ValueError):
+                invalid += 1
+                continue
+            times.append(row["time"])
+            rates.append(rate)
+        series = cls(times, rates)
+        series.invalid = invalid
+        return series
+
+    def __len__(self):
+        return len(self.rates)
+
+    def _extend(self, depth):
+        """Make sums / sumsq reach the newest `depth` records."""
+        have = len(self.sums) - 1
+        if depth <= have:
+            return
+        size = len(self.rates)
+        chunk = self.rates[size - depth:size - have][::-1]
+        self.sums.extend(accumulate(chunk, initial=self.sums[-1]))
+        self.sumsq.extend(accumulate(map(mul, chunk, chunk), initial=self.sumsq[-1]))
+        del self.sums[have + 1]  # the initial value, already there
+        del self.sumsq[have + 1]
+
+    def window(self, start_ms, end_ms):
+        """WindowStats of the records in [start_ms, end_ms]."""
+        size = len(self.rates)
+        i = bisect_left(self.times, start_ms)
+        j = bisect_right(self.times, end_ms)
+        n = j - i
+        if n <= 0:
+            return WindowStats(0, NAN, NAN, NAN)
+        self._extend(size - i)
+        # Records i..j-1 are the newest size-i minus the newest size-j.
+        total = self.sums[size - i] - self.sums[size - j]
+        mean = total / n
+        variance = max(0.0, (self.sumsq[size - i] - self.sumsq[size - j]) / n - mean * mean)
+        return WindowStats(n, mean * 100 * HOURS_PER_YEAR, total * 100, math.sqrt(variance) * 100 * HOURS_PER_YEAR)
+
+    def last(self, seconds, end_ms):
+        """WindowStats of the `seconds` before end_ms."""
+        return self.window(end_ms - int(seconds * 1000) + 1, end_ms)
+
+
+def screen(series, windows, end_ms, sort_by, top=None, ascending=False):
+    """
+    Rank coins by APR over one window.
+
+    :param series: {coin: FundingSeries}
+    :param windows: {name: seconds} (time_windows.parse_windows)
+    :param end_ms: Windows end here (the end of the fetched period)
+    :param sort_by: Window name to rank by; coins without records in it go last
+    :param top: Keep this many coins
+    :param ascending: Most negative funding first
+    :return: [(coin, {window name: WindowStats})], ranked
+    """
+    rows = [(coin, {name: s.last(seconds, end_ms) for name, seconds in windows.items()})
+            for coin, s in series.items()]
+    sign = 1 if ascending else -1
+
+    def key(row):
+        apr = row[1][sort_by].apr
+        return (math.isnan(apr), sign * apr if not math.isnan(apr) else 0.0)
+
+    rows.sort(key=key)
+    return rows[:top] if top else rows
+
+
+def rank_contexts(contexts, min_open_interest=0.0, min_volume=0.0, top=None, ascending=False):
+    """
+    Rank AssetContexts by current funding, keeping those with at least
+    `min_open_interest` open interest and `min_volume` 24h volume (USD).
+    """
+    kept = [c for c in contexts
+            if not math.isnan(c.funding) and c.open_interest >= min_open_interest and c.volume >= min_volume]
+    kept.sort(key=lambda c: c.funding, reverse=not ascending)
+    return kept[:top] if top else kept
@@ -0,0 +1,121 @@
+"""
+Local SQLite store of Hyperliquid funding history for get-funding.py.
+
+Records are keyed by (coin, time), so storing a chunk twice is harmless.
+Next to them the store keeps, per coin, the span [start, end] that has been
+fetched completely. A span can hold no records at all (before a listing),
+so the span itself is tracked rather than guessed from the records.
+
+A run asks missing() for the parts of its range outside that span, usually
+just the hours since the previous run. It fetches those, adds each chunk as
+it arrives, marks the pieces that came back complete with covered(), and
+reads the whole period back from the store. A piece with a failed request is
+not marked, so the next run fetches it again.
+"""
+import sqlite3
+from array import array
+
+NAN = float("nan")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS funding (
+    coin TEXT NOT NULL,
+    time INTEGER NOT NULL,
+    rate REAL NOT NULL,
+    premium REAL,
+    PRIMARY KEY (coin, time)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    coin TEXT PRIMARY KEY,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL
+);
+"""
+
+
+class FundingStore:
+    """
+    :param path: SQLite database file (created if missing)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self.invalid = {}  # coin -> rows skipped by add() since this store was opened
+
+    def coverage(self, coin):
+        """(start, end) fetched completely for `coin`, or None."""
+        return self.db.execute("SELECT start, end FROM coverage WHERE coin = ?", (coin,)).fetchone()
+
+    def missing(self, coin, start, end):
+        """
+        [(start, end)] pieces to fetch so that [start, end] is covered, oldest
+        first. Pieces reach up to the stored span, so it stays one span: after
+        a week away, --hours 52 fetches the whole week.
+        """
+        span = self.coverage(coin)
+        if span is None:
+            return [(start, end)]
+        pieces = []
+        if start < span[0]:
+            pieces.append((start, span[0] - 1))
+        if end > span[1]:
+            pieces.append((span[1] + 1, end))
+        return pieces
+
+    def add(self, rows):
+        """
+        Store fundingHistory rows (API dicts); existing (coin, time) keys are
+        overwritten. Rows whose rate or premium doesn't parse are skipped and
+        counted in `invalid`.
+        """
+        records = []
+        for row in rows:
+            try:
+                premium = row.get("premium")
+                records.append((row["coin"], row["time"], float(row["fundingRate"]),
+                                float(premium) if premium is not None else None))
+            except (KeyError, TypeError, ValueError):
+                coin = row.get("coin") if isinstance(row, dict) else None
+                self.invalid[coin] = self.invalid.get(coin, 0) + 1
+        self.db.executemany("INSERT OR REPLACE INTO funding (coin, time, rate, premium) VALUES (?, ?, ?, ?)", records)
+
+    def covered(self, coin, start, end):
+        """Record that [start, end] of `coin` has been fetched completely."""
+        span = self.coverage(coin)
+        if span is not None:
+            if span[0] > end + 1 or start > span[1] + 1:
+                return  # not adjacent (a piece before it failed); missing() asks for the gap again
+            start, end = min(start, span[0]), max(end, span[1])
+        self.db.execute("INSERT OR REPLACE INTO coverage (coin, start, end) VALUES (?, ?, ?)", (coin, start, end))
+
+    def commit(self):
+        self.db.commit()
+
+    def records(self, coin, start, end):
+        """(time, rate, premium) of `coin` in [start, end], oldest first, streamed from the database."""
+        for time, rate, premium in self.db.execute(
+                "SELECT time, rate, premium FROM funding WHERE coin = ? AND time BETWEEN ? AND ? ORDER BY time",
+                (coin, start, end)):
+            yield time, rate, premium if premium is not None else NAN
+
+    def columns(self, coin, start, end):
+        """(times, rates) of `coin` in [start, end] as array('q') / array('d'), oldest first."""
+        times, rates = array("q"), array("d")
+        for time, rate in self.db.execute(
+                "SELECT time, rate FROM funding WHERE coin = ? AND time BETWEEN ? AND ? ORDER BY time",
+                (coin, start, end)):
+            times.append(time)
+            rates.append(rate)
+        return times, rates
+
+    def coins(self):
+        """Coins with stored history."""
+        return [coin for coin, in self.db.execute("SELECT coin FROM coverage ORDER BY coin")]
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
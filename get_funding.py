@@ -0,0 +1,302 @@
+"""
+Hyperliquid funding history for one or more perps: `crypto-tools funding`,
+or `python3 get-funding.py`.
+"""
+import argparse
+import os
+import time
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+import sys
+
+from funding_export import ChunkSpool, export
+from funding_client import API_URL, FUNDING_INTERVAL_MS, HISTORY_START_MS, InfoClient, fetch_funding_histories, find_gaps
+from funding_stats import DEFAULT_WINDOWS, FundingSeries, rank_contexts, screen
+from funding_store import FundingStore
+from time_windows import format_span, parse_windows
+
+# Concurrent requests; the shared token bucket keeps them within Hyperliquid's weight budget.
+WORKERS = 8
+# Local funding history; each run only fetches what it doesn't hold yet.
+DB_PATH = "funding_history.db"
+
+def get_current_time_ms():
+    """Returns the current time in milliseconds."""
+    return int(time.time() * 1000)
+
+def format_time(time_ms):
+    return datetime.fromtimestamp(time_ms / 1000, tz=timezone.utc).strftime('%Y-%m-%d %H:%M')
+
+def print_funding_rates(coin, series, windows, end_ms, table=True, start_ms=None, covered_from=None):
+    """
+    Prints the funding rates in a readable format.
+
+    :param coin: The coin the records belong to
+    :param series: FundingSeries of the coin
+    :param windows: {name: seconds} windows to summarize, ending at end_ms
+    :param end_ms: End of the fetched period
+    :param table: Print every record, not just the window summaries
+    :param start_ms: Start of the requested period; the table only lists records from here
+    :param covered_from: Start of the history the series holds completely; windows
+                         reaching further back are labelled with the span they cover
+    """
+    if not len(series):
+        print(f"No funding rates found for {coin} in the specified time range.")
+        return
+
+    if table:
+        print(f"Historical Funding Rates for {coin}-USD:")
+        print("-" * 60)
+        print(f"{'Timestamp':<30} {'Funding Rate (%)':<20} {'APR (%)':<20}")
+        print("-" * 60)
+        kst = timezone(timedelta(hours=9))
+        first = bisect_left(series.times, start_ms) if start_ms is not None else 0
+        for timestamp_ms, funding_rate in zip(series.times[first:], series.rates[first:]):
+            funding_rate *= 100
+            timestamp = datetime.fromtimestamp(timestamp_ms / 1000, tz=kst).strftime('%Y-%m-%d %H:%M:%S UTC+9')
+            print(f"{timestamp:<30} {funding_rate:<20.4f} {funding_rate * 24 * 365:<20.4f}")
+        print()
+    else:
+        print(f"{coin}-USD:")
+
+    if series.invalid:
+        print(f"Skipped {series.invalid} invalid funding rate value(s)")
+    for name, seconds in windows.items():
+        stats = series.last(seconds, end_ms)
+        if covered_from is not None and end_ms - seconds * 1000 + 1 < covered_from:
+            span = f"covers {format_span((end_ms - covered_from) / 1000)}, "
+        else:
+            span = ""
+        print(f"Last {name:<4} ({span}{stats.records:>4} records): average APR {stats.apr:.1f}%, "
+              f"cumulative {stats.cumulative:.4f}%, volatility {stats.volatility:.1f}%")
+
+
+def print_screener(ranked, windows, sort_by):
+    """
+    Prints coins ranked by funding, one row each.
+
+    :param ranked: screen() result
+    :param windows: {name: seconds} shown as APR columns
+    :param sort_by: The ranking window, also used for the cumulative and volatility columns
+    """
+    columns = "".join(f"{name + ' APR%':>12}" for name in windows)
+    print(f"{'#':>4} {'Coin':<12}{columns} {sort_by + ' cum%':>12} {sort_by + ' vol%':>11} {'records':>8}")
+    for rank, (coin, stats) in enumerate(ranked, 1):
+        aprs = "".join(f"{stats[name].apr:>12.1f}" for name in windows)
+        ranking = stats[sort_by]
+        print(f"{rank:>4} {coin:<12}{aprs} {ranking.cumulative:>12.4f} {ranking.volatility:>11.1f} {ranking.records:>8}")
+
+
+def print_contexts(contexts):
+    """
+    Prints the current funding of ranked perps, one row each.
+
+    :param contexts: AssetContexts in rank order (rank_contexts)
+    """
+    print(f"{'#':>4} {'Coin':<12}{'Funding (%/h)':>14}{'APR (%)':>10}{'Premium (%)':>12}{'Mark':>14}"
+          f"{'OI ($M)':>10}{'24h vol ($M)':>14}")
+    for rank, c in enumerate(contexts, 1):
+        print(f"{rank:>4} {c.coin:<12}{c.funding * 100:>14.4f}{c.funding * 100 * 24 * 365:>10.1f}"
+              f"{c.premium * 100:>12.4f}{c.mark:>14.6g}{c.open_interest / 1e6:>10.2f}{c.volume / 1e6:>14.2f}")
+
+
+def save_funding_rates(coin, records, directory, formats):
+    """
+    Streams a coin's records to funding_history_<COIN>.csv and/or .fund.
+
+    :param coin: The coin the records belong to
+    :param records: (time, rate, premium) tuples, oldest first
+    :param directory: Where the files go
+    :param formats: Subset of {"csv", "bin"}
+    """
+    base = os.path.join(directory, f"funding_history_{coin}")
+    csv_path = base + ".csv" if "csv" in formats else None
+    bin_path = base + ".fund" if "bin" in formats else None
+    try:
+        count = export(records, coin, csv_path, bin_path)
+    except (OSError, ValueError) as e:
+        print(f"Failed to save data to file: {e}")
+        return
+    if not count:
+        print(f"{coin}: no data to save.")
+        return
+    print(f"{coin}: saved {count} records to " + " and ".join(p for p in (csv_path, bin_path) if p))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hyperliquid funding history for one or more perps.")
+    parser.add_argument("coins", nargs="*", metavar="COIN", help="perp names (e.g. HYPE PENGU), or 'all'")
+    parser.add_argument("--hours", type=float, default=52, help="history to fetch and list, in hours (default 52)")
+    parser.add_argument("--since", metavar="YYYY-MM-DD", help="fetch from this UTC date instead of --hours")
+    parser.add_argument("--full", action="store_true", help="fetch each coin's whole history")
+    parser.add_argument("--api-url", default=API_URL, help=f"/info endpoint (default {API_URL})")
+    parser.add_argument("--workers", type=int, default=WORKERS, help=f"concurrent requests (default {WORKERS})")
+    parser.add_argument("--db", default=DB_PATH, help=f"local history store (default {DB_PATH})")
+    parser.add_argument("--no-db", action="store_true", help="fetch the whole period and keep nothing")
+    parser.add_argument("--offline", action="store_true", help="answer from the local store only, no requests")
+    parser.add_argument("--windows", default=DEFAULT_WINDOWS, metavar="LIST",
+                        help=f"summary windows ending now (default {DEFAULT_WINDOWS})")
+    parser.add_argument("--sort", metavar="WINDOW", help="rank coins by APR over this window (default: the second one)")
+    parser.add_argument("--ascending", action="store_true", help="most negative funding first")
+    parser.add_argument("--top", type=int, metavar="N", help="show only the first N coins")
+    parser.add_argument("--screen", action="store_true",
+                        help="rank every perp by current funding from one request, then fetch the history of the top --drill")
+    parser.add_argument("--drill", type=int, default=10, metavar="N",
+                        help="with --screen, fetch the history of the first N coins (default 10, 0 for none)")
+    parser.add_argument("--min-oi", type=float, default=0.0, metavar="USD", help="with --screen, minimum open interest")
+    parser.add_argument("--min-volume", type=float, default=0.0, metavar="USD", help="with --screen, minimum 24h volume")
+    parser.add_argument("--table", action="store_true", help="print every record also when fetching several coins")
+    parser.add_argument("--save", action="store_true", help="save each coin to funding_history_<COIN>.csv / .fund")
+    parser.add_argument("--save-dir", default=".", metavar="DIR", help="where --save writes (default .)")
+    parser.add_argument("--save-format", default="csv", metavar="LIST",
+                        help="csv, bin (fixed-width, memory-mappable; see funding_export) or csv,bin (default csv)")
+    args = parser.parse_args(argv)
+    try:
+        windows = parse_windows(args.windows)
+    except ValueError as e:
+        parser.error(str(e))
+    sort_by = args.sort or list(windows)[min(1, len(windows) - 1)]
+    if sort_by not in windows:
+        parser.error(f"--sort {sort_by} is not one of --windows {args.windows}")
+
+    save_formats = set(args.save_format.split(","))
+    if not save_formats <= {"csv", "bin"}:
+        parser.error(f"--save-format {args.save_format}: use csv, bin or csv,bin")
+    if args.offline and args.no_db:
+        parser.error("--offline needs the local store")
+    if args.screen == bool(args.coins):
+        parser.error("give coins (or 'all'), or --screen")
+    if args.screen and args.offline:
+        parser.error("--screen needs current data; use 'all --offline' for stored history")
+    store = None if args.no_db else FundingStore(args.db)
+    client = None if args.offline else InfoClient(args.api_url, pool_size=args.workers)
+    if args.screen:
+        # One request for the whole market; history only for the candidates.
+        ranked = rank_contexts(client.asset_contexts(), args.min_oi, args.min_volume, ascending=args.ascending)
+        print_contexts(ranked[:args.top] if args.top else ranked)
+        coins = [context.coin for context in ranked[:args.drill]]
+        if not coins:
+            client.close()
+            if store is not None:
+                store.close()
+            return
+        print()
+    elif [coin.lower() for coin in args.coins] == ["all"]:
+        coins = store.coins() if args.offline else client.perp_names()
+    else:
+        coins = [coin.upper() for coin in args.coins]
+
+    end_time_ms = get_current_time_ms()
+    if args.full:
+        start_time_ms = HISTORY_START_MS
+    elif args.since:
+        start_time_ms = int(datetime.strptime(args.since, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp() * 1000)
+    else:
+        start_time_ms = end_time_ms - int(args.hours * 60 * 60 * 1000)
+
+    # Only what the store doesn't hold yet: usually the hours since the last run.
+    if args.offline:
+        pieces = {coin: [] for coin in coins}
+    elif store is not None:
+        pieces = {coin: store.missing(coin, start_time_ms, end_time_ms) for coin in coins}
+    else:
+        pieces = {coin: [(start_time_ms, end_time_ms)] for coin in coins}
+    ranges = [(coin, *piece) for coin in coins for piece in pieces[coin]]
+    print(f"{len(coins)} coin(s) from {format_time(start_time_ms)} UTC: "
+          f"{len(ranges)} range(s) to fetch, {args.workers} requests at a time")
+
+    started = time.monotonic()
+    # Without the store, chunks are spilled to disk as they arrive and merged in order afterwards.
+    spools = {coin: ChunkSpool() for coin in coins} if store is None else None
+    failed = {}
+    incomplete = set()
+    for coin, start_ms, end_ms, funding_rates, error in (
+            fetch_funding_histories(client, ranges, args.workers) if ranges else ()):
+        if error is not None:
+            failed.setdefault(coin, []).append(f"{format_time(start_ms)} to {format_time(end_ms)}: {error}")
+            incomplete.add((coin, next(p for p in pieces[coin] if p[0] <= start_ms <= p[1])))
+            continue
+        if store is not None:
+            store.add(funding_rates)
+        else:
+            spools[coin].add_rows(funding_rates)
+    elapsed = time.monotonic() - started
+    if store is not None:
+        for coin, start_ms, end_ms in ranges:
+            if (coin, (start_ms, end_ms)) not in incomplete:
+                store.covered(coin, start_ms, end_ms)
+        store.commit()
+    if client is not None:
+        client.close()
+
+    # The window stats reach back the longest window even when fewer hours
+    # were asked for; the store may already hold that history.
+    stats_start_ms = min(start_time_ms, end_time_ms - max(windows.values()) * 1000 + 1)
+    series = {}
+    covered_from = {}  # coin -> start of the history its series holds completely
+    for coin in coins:
+        if store is not None:
+            series[coin] = FundingSeries(*store.columns(coin, stats_start_ms, end_time_ms))
+            series[coin].invalid = store.invalid.get(coin, 0)
+            span = store.coverage(coin)
+            covered_from[coin] = max(span[0], stats_start_ms) if span else end_time_ms
+            if args.offline and (span is None or span[0] > start_time_ms or span[1] < end_time_ms - FUNDING_INTERVAL_MS):
+                print(f"{coin}: the store only covers "
+                      + (f"{format_time(span[0])} to {format_time(span[1])}" if span else "nothing"))
+        else:
+            # Merged in time order, one record per timestamp
+            times, rates = array("q"), array("d")
+            for time_ms, rate, _ in spools[coin].merged():
+                times.append(time_ms)
+                rates.append(rate)
+            series[coin] = FundingSeries(times, rates)
+            series[coin].invalid = spools[coin].invalid
+            covered_from[coin] = start_time_ms
+
+        # Print the funding rates
+        if args.table or len(coins) == 1:
+            print_funding_rates(coin, series[coin], windows, end_time_ms, table=True,
+                                start_ms=start_time_ms, covered_from=covered_from[coin])
+        if coin in failed:
+            print(f"{coin}: incomplete, {len(failed[coin])} request(s) failed")
+        gaps = find_gaps(series[coin].times)
+        if gaps:
+            print(f"{coin}: {len(gaps)} gap(s) in the history, the largest "
+                  f"{max(b - a for a, b in gaps) / 3_600_000:.0f}h: "
+                  + ", ".join(f"{format_time(a)} to {format_time(b)}" for a, b in gaps[:3]))
+
+        if args.save:
+            if store is not None:
+                records = store.records(coin, start_time_ms, end_time_ms)
+            else:
+                records = spools[coin].merged()
+            save_funding_rates(coin, records, args.save_dir, save_formats)
+        if spools is not None:
+            spools[coin].close()
+
+    if len(coins) > 1:
+        print()
+        print_screener(screen(series, windows, end_time_ms, sort_by, args.top, args.ascending), windows, sort_by)
+        clipped = [name for name, seconds in windows.items()
+                   if any(end_time_ms - seconds * 1000 + 1 < start for start in covered_from.values())]
+        if clipped:
+            print(f"{', '.join(clipped)} cover as little as "
+                  f"{format_span((end_time_ms - max(covered_from.values())) / 1000)} for some coins; "
+                  f"the records column shows how much each holds")
+
+    if client is not None:
+        print(f"\nFetched {len(coins)} coin(s) with {client.requests} requests ({client.retried} retried) "
+              f"in {elapsed:.2f}s, {client.bucket.waited:.2f}s waiting for the rate limit")
+    if store is not None:
+        store.close()
+    for coin, errors in failed.items():
+        for error in errors:
+            print(f"Failed: {coin} {error}", file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\nProcess interrupted by user. Exiting...")
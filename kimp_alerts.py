@@ -0,0 +1,216 @@
+"""
+Non-blocking alert pipeline for kimp_monitor.
+
+The hot path calls AlertPipeline.admit(), which applies the per-pair
+cooldown / deduplication; only an admitted alert is formatted and handed to
+every sink by publish(), one put_nowait() per sink. Each sink drains its own
+bounded queue in a background task, so a slow disk or a slow Telegram round
+trip never stalls the websocket readers. When a sink falls behind, its
+oldest pending alerts are dropped.
+"""
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+
+
+class QueueSink(ABC):
+    """Base class: a bounded queue drained by run() in a background task."""
+
+    name = "sink"
+
+    def __init__(self, maxsize=1000):
+        self.queue = asyncio.Queue(maxsize)
+        self.dropped = 0
+        self.sent = 0
+
+    def offer(self, msg):
+        """Enqueue without blocking; drop the oldest pending alert when full."""
+        try:
+            self.queue.put_nowait(msg)
+        except asyncio.QueueFull:
+            self.queue.get_nowait()
+            self.queue.put_nowait(msg)
+            self.dropped += 1
+
+    def drain(self):
+        """Return everything currently queued."""
+        msgs = []
+        while not self.queue.empty():
+            msgs.append(self.queue.get_nowait())
+        return msgs
+
+    @abstractmethod
+    async def run(self):
+        """Deliver queued alerts until cancelled."""
+
+
+class FileSink(QueueSink):
+    """
+    Appends alerts to a text file.
+
+    The file is opened once and alerts are written in batches every
+    flush_interval seconds from a worker thread, instead of an open/write/close
+    inside the event loop for each alert.
+    """
+
+    name = "file"
+
+    def __init__(self, path="kimp_alert.txt", flush_interval=1.0, maxsize=10000):
+        super().__init__(maxsize)
+        self.path = path
+        self.flush_interval = flush_interval
+        self._file = None
+
+    def _write(self, text):
+        if self._file is None:
+            self._file = open(self.path, "a+")
+        self._file.write(text)
+        self._file.flush()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                await asyncio.sleep(self.flush_interval)
+                msgs = self.drain()
+                if msgs:
+                    await loop.run_in_executor(None, self._write, "\n".join(msgs) + "\n")
+                    self.sent += len(msgs)
+        finally:
+            # Shutdown: write whatever is left synchronously and close.
+            msgs = self.drain()
+            if msgs:
+                self._write("\n".join(msgs) + "\n")
+                self.sent += len(msgs)
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class TelegramSink(QueueSink):
+    """
+    Sends alerts through the Telegram Bot API over a pooled aiohttp session.
+
+    api_base can point to a local stand-in server for testing.
+    """
+
+    name = "telegram"
+
+    def __init__(self, token, chat_id, api_base="https://api.telegram.org",
+                 concurrency=2, timeout=10.0, maxsize=100, retries=2):
+        super().__init__(maxsize)
+        self.url = f"{api_base}/bot{token}/sendMessage"
+        self.chat_id = chat_id
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retries = retries  # resends of a rate-limited (429) alert
+        self.failed = 0
+        self.rate_limited = 0
+
+    async def _send(self, session, msg):
+        params = {"chat_id": self.chat_id, "text": msg}
+        try:
+            for attempt in range(self.retries + 1):
+                async with session.get(self.url, params=params) as response:
+                    if response.status == 200:
+                        self.sent += 1
+                        return
+                    if response.status != 429:
+                        self.failed += 1
+                        print("Failed to send message:", response.status, await response.text())
+                        return
+                    # Telegram tells us how long to back off; then send it again.
+                    self.rate_limited += 1
+                    body = await response.json(content_type=None)
+                    retry_after = body.get("parameters", {}).get("retry_after", 1)
+                if attempt < self.retries:
+                    await asyncio.sleep(retry_after)
+            self.failed += 1
+            print(f"Failed to send message: still rate limited after {self.retries + 1} attempts")
+        except Exception as e:
+            self.failed += 1
+            print("Telegram error:", e)
+
+    async def _worker(self, session):
+        while True:
+            msg = await self.queue.get()
+            await self._send(session, msg)
+
+    async def run(self):
+        try:
+            import aiohttp  # only needed for Telegram alerts
+        except ImportError:
+            raise RuntimeError("Please install aiohttp for Telegram alerts: pip install aiohttp") from None
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            await asyncio.gather(*(self._worker(session) for _ in range(self.concurrency)))
+
+
+class MemorySink(QueueSink):
+    """Keeps alerts in a list; used by replay to count and dump them."""
+
+    name = "memory"
+
+    def __init__(self):
+        super().__init__()
+        self.alerts = []
+
+    def offer(self, msg):
+        self.alerts.append(msg)
+        self.sent += 1
+
+    async def run(self):
+        pass
+
+
+class AlertPipeline:
+    """
+    Deduplicates alerts per (pair, side) and fans them out to the sinks.
+
+    Within `cooldown` seconds of an alert, further alerts on the same pair and
+    side are suppressed unless the premium moved at least `escalate` further
+    away from zero than the last one that went out.
+    """
+
+    def __init__(self, sinks, cooldown=60.0, escalate=0.5):
+        self.sinks = list(sinks)
+        self.cooldown = cooldown
+        self.escalate = escalate
+        self.last = {}  # (pair, side) -> (time, diff)
+        self.counts = Counter()  # (pair, side) -> alerts sent
+        self.submitted = 0
+        self.suppressed = 0
+
+    def admit(self, pair, diff, now=None):
+        """Apply the cooldown for an alert on pair; True when it should go out."""
+        if now is None:
+            now = time.monotonic()
+        key = (pair, diff > 0)
+        last = self.last.get(key)
+        if last is not None:
+            last_time, last_diff = last
+            if now - last_time < self.cooldown and abs(diff) - abs(last_diff) < self.escalate:
+                self.suppressed += 1
+                return False
+        self.last[key] = (now, diff)
+        self.counts[key] += 1
+        self.submitted += 1
+        return True
+
+    def publish(self, msg):
+        """Hand an admitted alert to every sink."""
+        for sink in self.sinks:
+            sink.offer(msg)
+
+    def stats(self):
+        return {
+            "submitted": self.submitted,
+            "suppressed": self.suppressed,
+            **{f"{sink.name}_dropped": sink.dropped for sink in self.sinks},
+            **{f"{sink.name}_sent": sink.sent for sink in self.sinks},
+        }
+
+    async def run(self):
+        await asyncio.gather(*(sink.run() for sink in self.sinks))
@@ -0,0 +1,285 @@
+"""
+Local order books and the executable premium for kimp_monitor.
+
+The last-trade premium says little about what a hedge of real size would
+capture. With --depth-notional, kimp_monitor keeps a local book per pair on
+both legs and walks them for a fixed KRW notional:
+
+    over     sell the notional on Upbit (walk the bids) and buy the same
+             quantity on the USDT market (walk the asks): the KRW per USDT a
+             positive premium actually pays
+    reverse  buy on Upbit (walk the asks) and sell on the USDT market (walk
+             the bids): the KRW per USDT a reverse premium actually costs
+
+Both are NaN while either book is too thin for the notional or stale.
+
+Books are fed by:
+
+- Upbit "orderbook" stream: a full top-of-book snapshot per message.
+- Hyperliquid "l2Book" subscription per coin: a snapshot per message.
+- Binance futures "<symbol>@depth@100ms" diff stream, kept in step with a
+  REST snapshot by DiffDepthSync.
+
+Each side is two parallel lists sorted best first, so a snapshot is a list
+rebuild, a diff is a bisect plus at most one insert / delete, and a depth
+walk is a loop from the front that stops as soon as the notional is filled.
+"""
+import math
+from array import array
+from bisect import bisect_left
+from itertools import repeat
+
+from kimp_decode import loads
+
+NAN = float("nan")
+# Diff events kept while a Binance snapshot is on its way.
+MAX_BUFFERED_EVENTS = 1000
+
+
+class BookSide:
+    """
+    Price levels of one side, best first. Keys are prices for asks and
+    negated prices for bids, so both sides sort ascending.
+    """
+
+    __slots__ = ("sign", "keys", "sizes")
+
+    def __init__(self, bids):
+        self.sign = -1.0 if bids else 1.0
+        self.keys = []
+        self.sizes = []
+
+    def replace(self, levels):
+        """Snapshot: (price, size) levels, best first as the exchanges send them."""
+        sign = self.sign
+        self.keys = [sign * price for price, _ in levels]
+        self.sizes = [size for _, size in levels]
+
+    def set(self, price, size):
+        """Diff: set the size at price; 0 removes the level."""
+        key = self.sign * price
+        keys = self.keys
+        n = bisect_left(keys, key)
+        if n < len(keys) and keys[n] == key:
+            if size:
+                self.sizes[n] = size
+            else:
+                del keys[n]
+                del self.sizes[n]
+        elif size:
+            keys.insert(n, key)
+            self.sizes.insert(n, size)
+
+    def best(self):
+        return self.sign * self.keys[0] if self.keys else NAN
+
+    def qty_for(self, notional):
+        """Quantity obtained by trading `notional` (quote currency) from the best level; None if too thin."""
+        sign = self.sign
+        remaining = notional
+        qty = 0.0
+        for key, size in zip(self.keys, self.sizes):
+            price = sign * key
+            value = price * size
+            if value >= remaining:
+                return qty + remaining / price
+            qty += size
+            remaining -= value
+        return None
+
+    def cost_of(self, qty):
+        """Quote amount for trading `qty` from the best level; None if too thin."""
+        sign = self.sign
+        remaining = qty
+        cost = 0.0
+        for key, size in zip(self.keys, self.sizes):
+            if size >= remaining:
+                return cost + remaining * sign * key
+            cost += size * sign * key
+            remaining -= size
+        return None
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class OrderBook:
+    """Bids and asks of one market; `time` is the receive time of the last update."""
+
+    __slots__ = ("bids", "asks", "time")
+
+    def __init__(self):
+        self.bids = BookSide(bids=True)
+        self.asks = BookSide(bids=False)
+        self.time = -math.inf
+
+    def replace(self, bids, asks, now):
+        self.bids.replace(bids)
+        self.asks.replace(asks)
+        self.time = now
+
+    def update(self, bids, asks, now):
+        for price, size in bids:
+            self.bids.set(price, size)
+        for price, size in asks:
+            self.asks.set(price, size)
+        self.time = now
+
+    def clear(self):
+        self.bids.replace(())
+        self.asks.replace(())
+        self.time = -math.inf
+
+
+def executable_rates(krw_book, usdt_book, notional):
+    """
+    (over, reverse) implied KRW per USDT for a hedge of `notional` KRW; see
+    the module docstring. Either is NaN when a book is too thin.
+    """
+    over = reverse = NAN
+    qty = krw_book.bids.qty_for(notional)
+    if qty:
+        cost = usdt_book.asks.cost_of(qty)
+        if cost:
+            over = notional / cost
+    qty = krw_book.asks.qty_for(notional)
+    if qty:
+        proceeds = usdt_book.bids.cost_of(qty)
+        if proceeds:
+            reverse = notional / proceeds
+    return over, reverse
+
+
+class DepthBooks:
+    """
+    Books of both legs for every pair and their latest executable rates.
+
+    :param pairs: Number of pairs (engine size)
+    :param notional: Hedge size in KRW
+    :param max_age: Rates are NaN when either book is older than this (seconds)
+    """
+
+    def __init__(self, pairs, notional, max_age=10.0):
+        self.notional = notional
+        self.max_age = max_age
+        self.krw = [OrderBook() for _ in range(pairs)]
+        self.usdt = [OrderBook() for _ in range(pairs)]
+        # Implied KRW per USDT; subtract USDT/KRW for the premium.
+        self.over = array("d", repeat(NAN, pairs))
+        self.reverse = array("d", repeat(NAN, pairs))
+
+    def evaluate(self, i, now):
+        """Walk both books of pair i after either changed."""
+        krw, usdt = self.krw[i], self.usdt[i]
+        if now - krw.time > self.max_age or now - usdt.time > self.max_age:
+            self.over[i] = self.reverse[i] = NAN
+            return
+        self.over[i], self.reverse[i] = executable_rates(krw, usdt, self.notional)
+
+
+class DiffDepthSync:
+    """
+    Keeps an OrderBook in step with a Binance futures diff-depth stream,
+    following Binance's procedure: buffer events until a REST snapshot
+    arrives, drop events older than it, require the first applied event to
+    span the snapshot's lastUpdateId, then require every event's `pu` to be
+    the previous event's `u`. Any gap resets the book and asks for a new
+    snapshot.
+    """
+
+    def __init__(self, book):
+        self.book = book
+        self.buffer = []
+        self.snapshot_id = None
+        self.last_u = None
+        self.snapshot_pending = False
+        self.resyncs = 0
+
+    def needs_snapshot(self):
+        return self.snapshot_id is None and not self.snapshot_pending
+
+    def reset(self):
+        self.book.clear()
+        self.buffer = []
+        self.snapshot_id = None
+        self.last_u = None
+        self.resyncs += 1
+
+    def on_event(self, first_u, last_u, prev_u, bids, asks, now):
+        """Apply one depthUpdate; True when the book changed."""
+        if self.snapshot_id is None:
+            if len(self.buffer) < MAX_BUFFERED_EVENTS:
+                self.buffer.append((first_u, last_u, prev_u, bids, asks))
+            return False
+        if self.last_u is None:
+            if last_u < self.snapshot_id:
+                return False  # already in the snapshot
+            if first_u > self.snapshot_id:
+                self.reset()  # events between the snapshot and this one are gone
+                return False
+        elif prev_u != self.last_u:
+            self.reset()
+            return False
+        self.book.update(bids, asks, now)
+        self.last_u = last_u
+        return True
+
+    def on_snapshot(self, last_update_id, bids, asks, now):
+        """Install a REST snapshot and replay the buffered events over it."""
+        self.snapshot_pending = False
+        buffered, self.buffer = self.buffer, []
+        self.snapshot_id = last_update_id
+        self.last_u = None
+        self.book.replace(bids, asks, now)
+        for event in buffered:
+            self.on_event(*event, now)
+            if self.snapshot_id is None:
+                return  # gap inside the buffer; reset() already cleared the book
+
+
+def parse_upbit_orderbook(message):
+    """(code, bids, asks, timestamp_ms) from an Upbit orderbook frame, or None."""
+    data = loads(message)
+    units = data.get("orderbook_units")
+    if data.get("type") != "orderbook" or not units:
+        return None
+    bids = [(u["bid_price"], u["bid_size"]) for u in units]
+    asks = [(u["ask_price"], u["ask_size"]) for u in units]
+    return data["code"], bids, asks, int(data.get("timestamp") or 0)
+
+
+def parse_hyperliquid_l2(message):
+    """(coin, bids, asks, time_ms) from a Hyperliquid l2Book push, or None."""
+    data = loads(message)
+    if data.get("channel") != "l2Book":
+        return None
+    book = data["data"]
+    bids, asks = book["levels"]
+    return (book["coin"],
+            [(float(level["px"]), float(level["sz"])) for level in bids],
+            [(float(level["px"]), float(level["sz"])) for level in asks],
+            int(book.get("time") or 0))
+
+
+def parse_binance_depth(message):
+    """(stream, U, u, pu, bids, asks, event_ms) from a combined-stream depthUpdate, or None."""
+    data = loads(message)
+    event = data.get("data")
+    if not event or event.get("e") != "depthUpdate":
+        return None
+    return (data["stream"], event["U"], event["u"], event["pu"],
+            [(float(p), float(q)) for p, q in event["b"]],
+            [(float(p), float(q)) for p, q in event["a"]],
+            int(event.get("E") or 0))
+
+
+def fetch_binance_depth(rest, symbol, limit=1000):
+    """REST snapshot for DiffDepthSync: (lastUpdateId, bids, asks)."""
+    import requests  # only needed for Binance depth
+
+    response = requests.get(f"{rest}/fapi/v1/depth", params={"symbol": symbol.upper(), "limit": limit}, timeout=10)
+    response.raise_for_status()
+    data = response.json()
+    return (data["lastUpdateId"],
+            [(float(p), float(q)) for p, q in data["bids"]],
+            [(float(p), float(q)) for p, q in data["asks"]])
@@ -0,0 +1,94 @@
+"""
+Premium engine for kimp_monitor.
+
+Every ticker gets a fixed slot in preallocated price arrays, so a tick is an
+index write plus one division instead of string-keyed dict lookups and
+repeated float() conversions.
+"""
+import time
+from array import array
+from itertools import repeat
+
+NAN = float("nan")
+NEVER = float("-inf")
+
+
+class PremiumEngine:
+    """
+    Latest KRW / USDT prices per ticker and the premiums derived from them.
+
+    kimp[i] = krw[i] / usdt[i]      implied USDT/KRW rate of that coin
+    diff[i] = kimp[i] - usdt_krw    premium in KRW per USDT
+
+    Missing legs are stored as nan, which propagates through the arithmetic,
+    so a pair without both prices simply has a nan diff.
+
+    Every leg also records when it was last updated (time.monotonic() unless
+    the caller passes its own clock); a premium is fresh only while all
+    three legs are younger than max_age seconds.
+    """
+
+    def __init__(self, tickers, max_age=10.0):
+        self.tickers = list(tickers)  # ["btc", "eth", ...]
+        self.labels = [ticker.upper() for ticker in self.tickers]
+        self.index = {ticker: i for i, ticker in enumerate(self.tickers)}
+        n = len(self.tickers)
+        self.krw = array("d", repeat(NAN, n))
+        self.usdt = array("d", repeat(NAN, n))
+        self.kimp = array("d", repeat(NAN, n))
+        self.diff = array("d", repeat(NAN, n))
+        self.usdt_krw = NAN
+        self.max_age = max_age
+        self.krw_time = array("d", repeat(NEVER, n))
+        self.usdt_time = array("d", repeat(NEVER, n))
+        self.usdt_krw_time = NEVER
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def _recompute(self, i):
+        kimp = self.krw[i] / self.usdt[i] if self.usdt[i] else NAN
+        self.kimp[i] = kimp
+        diff = kimp - self.usdt_krw
+        self.diff[i] = diff
+        return diff
+
+    def update_krw(self, i, price, now=None):
+        """Set the KRW price of ticker i and return its new premium."""
+        self.krw[i] = price
+        self.krw_time[i] = time.monotonic() if now is None else now
+        return self._recompute(i)
+
+    def update_usdt(self, i, price, now=None):
+        """Set the USDT price of ticker i and return its new premium."""
+        self.usdt[i] = price
+        self.usdt_time[i] = time.monotonic() if now is None else now
+        return self._recompute(i)
+
+    def update_usdt_krw(self, price, now=None):
+        """
+        Set the USDT/KRW rate and revalue every pair in a single pass.
+
+        kimp does not depend on USDT/KRW, so this is one subtraction per pair,
+        written into the existing diff array.
+        """
+        self.usdt_krw = price
+        self.usdt_krw_time = time.monotonic() if now is None else now
+        diff = self.diff
+        for i, kimp in enumerate(self.kimp):
+            diff[i] = kimp - price
+
+    def age(self, i, now=None):
+        """Age in seconds of the oldest leg behind pair i's premium."""
+        oldest = min(self.krw_time[i], self.usdt_time[i], self.usdt_krw_time)
+        return (time.monotonic() if now is None else now) - oldest
+
+    def fresh(self, i, now=None):
+        """True when pair i has a premium and none of its legs is stale."""
+        return self.diff[i] == self.diff[i] and self.age(i, now) <= self.max_age
+
+    def ready(self, now=None):
+        """Indices of the pairs whose premium is computable and fresh."""
+        if now is None:
+            now = time.monotonic()
+        return [i for i in range(len(self.diff)) if self.fresh(i, now)]
@@ -0,0 +1,168 @@
+"""
+Latency instrumentation for the kimp_monitor hot path.
+
+Each tick is stamped when it arrives (the supervisor's receive time), after
+decoding, after the premium is computed, after it is printed and, if one
+fires, after the alert is queued. The gaps between stamps, plus the delay
+from the exchange's own timestamp to receipt, go into fixed-size log-linear
+histograms per feed and stage. Recording a stage is a clock read, a
+bit_length() and a list increment.
+
+Histograms are exposed as plain text on a local HTTP port and/or printed as
+a periodic summary. Run with --no-metrics to disable them entirely; the hot
+path then only tests `metrics is not None`.
+"""
+import asyncio
+import time
+
+STAGES = ("network", "decode", "premium", "output", "alert", "tick_to_alert")
+NETWORK, DECODE, PREMIUM, OUTPUT, ALERT, TICK_TO_ALERT = range(len(STAGES))
+
+
+class Histogram:
+    """
+    Log-linear histogram of nanosecond values: four buckets per power of two,
+    so any recorded value is within ~12% of its bucket midpoint. Only bucket
+    counts are kept; count, mean and max are derived from them when read.
+    """
+
+    __slots__ = ("counts",)
+
+    def __init__(self):
+        self.counts = [0] * 256
+
+    def record(self, ns):
+        if ns <= 0:
+            # Negative when the exchange clock is ahead of ours; bit_length()
+            # ignores the sign, so clamp before bucketing.
+            self.counts[0] += 1
+            return
+        bits = ns.bit_length()
+        if bits > 3:
+            self.counts[(bits << 2) | ((ns >> (bits - 3)) & 3)] += 1
+        else:
+            self.counts[ns] += 1
+
+    @staticmethod
+    def bucket_mid(index):
+        if index < 16:
+            return index
+        bits, sub = index >> 2, index & 3
+        width = 1 << (bits - 3)
+        return ((4 + sub) << (bits - 3)) + width // 2
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    @property
+    def max(self):
+        for index in range(len(self.counts) - 1, -1, -1):
+            if self.counts[index]:
+                return self.bucket_mid(index)
+        return 0
+
+    @property
+    def total(self):
+        return sum(self.bucket_mid(index) * n for index, n in enumerate(self.counts) if n)
+
+    def mean(self):
+        count = self.count
+        return self.total / count if count else 0
+
+    def quantile(self, q):
+        """Approximate q-quantile in ns (0 when empty)."""
+        rank = q * self.count
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                return self.bucket_mid(index)
+        return 0
+
+
+class LatencyMetrics:
+    """
+    Per-feed, per-stage latency histograms.
+
+    The feed handler calls decoded() once per message, the premium / output /
+    alert code calls mark() as the tick moves along; each mark records the
+    time since the previous stamp of the same tick.
+    """
+
+    def __init__(self, feeds):
+        self.feeds = list(feeds)
+        self.histograms = {feed: [Histogram() for _ in STAGES] for feed in self.feeds}
+        # Converts time.monotonic() receive times to epoch ms for the network stage.
+        self._epoch_offset_ms = (time.time() - time.monotonic()) * 1e3
+        self._current = None
+        self._recv = 0.0
+        self._last = 0.0
+
+    def decoded(self, feed, recv, exchange_ms):
+        """Start a tick: recv is the monotonic receive time, exchange_ms the exchange's timestamp (0 if none)."""
+        t = time.monotonic()
+        hist = self._current = self.histograms[feed]
+        self._recv = recv
+        self._last = t
+        hist[DECODE].record(int((t - recv) * 1e9))
+        if exchange_ms:
+            hist[NETWORK].record(int((recv * 1e3 + self._epoch_offset_ms - exchange_ms) * 1e6))
+
+    def mark(self, stage):
+        t = time.monotonic()
+        hist = self._current
+        hist[stage].record(int((t - self._last) * 1e9))
+        if stage == ALERT:
+            hist[TICK_TO_ALERT].record(int((t - self._recv) * 1e9))
+        self._last = t
+
+    def summary(self):
+        """Text table: one line per feed and stage with count, mean, p50/p90/p99 and max in microseconds."""
+        lines = [f"{'feed':<14} {'stage':<14} {'count':>10} {'mean':>10} {'p50':>10} {'p90':>10} {'p99':>10} {'max':>10}  (us)"]
+        for feed in self.feeds:
+            for stage, hist in zip(STAGES, self.histograms[feed]):
+                if not hist.count:
+                    continue
+                lines.append(
+                    f"{feed:<14} {stage:<14} {hist.count:>10} {hist.mean() / 1e3:>10.1f} "
+                    f"{hist.quantile(0.5) / 1e3:>10.1f} {hist.quantile(0.9) / 1e3:>10.1f} "
+                    f"{hist.quantile(0.99) / 1e3:>10.1f} {hist.max / 1e3:>10.1f}"
+                )
+        return "\n".join(lines)
+
+    def exposition(self):
+        """Prometheus-style text exposition of the same numbers."""
+        lines = []
+        for feed in self.feeds:
+            for stage, hist in zip(STAGES, self.histograms[feed]):
+                labels = f'feed="{feed}",stage="{stage}"'
+                for q in (0.5, 0.9, 0.99):
+                    lines.append(f'kimp_latency_seconds{{{labels},quantile="{q}"}} {hist.quantile(q) / 1e9:.9f}')
+                lines.append(f"kimp_latency_seconds_sum{{{labels}}} {hist.total / 1e9:.9f}")
+                lines.append(f"kimp_latency_seconds_count{{{labels}}} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    async def serve(self, port, host="127.0.0.1"):
+        """Serve exposition() to any HTTP GET on host:port."""
+        async def handle(reader, writer):
+            try:
+                await reader.readuntil(b"\r\n\r\n")
+                body = self.exposition().encode()
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/plain; version=0.0.4\r\n"
+                             b"Content-Length: " + str(len(body)).encode() + b"\r\nConnection: close\r\n\r\n" + body)
+                await writer.drain()
+            except (asyncio.IncompleteReadError, ConnectionError):
+                pass
+            finally:
+                writer.close()
+
+        server = await asyncio.start_server(handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def report(self, interval):
+        """Print summary() every interval seconds."""
+        while True:
+            await asyncio.sleep(interval)
+            print(self.summary())
@@ -1,229 +1,575 @@
+import argparse
 import asyncio
-import json
 from datetime import datetime
-import websockets
-import requests
+import os
+import time
+
+from kimp_alerts import AlertPipeline, FileSink, MemorySink, TelegramSink
+from kimp_book import (DepthBooks, DiffDepthSync, fetch_binance_depth, parse_binance_depth,
+                       parse_hyperliquid_l2, parse_upbit_orderbook)
+from kimp_decode import AllMidsDecoder, decode_binance, decode_upbit, loads
+from kimp_engine import PremiumEngine
+from kimp_metrics import ALERT, OUTPUT, PREMIUM, LatencyMetrics
+from kimp_presenter import ConflatingPresenter
+from kimp_stats import DEFAULT_WINDOWS, RollingStats
+from kimp_recorder import (LEG_KRW, LEG_USDT, LEG_USDT_KRW, SOURCE_BINANCE, SOURCE_HYPERLIQUID,
+                           SOURCE_UPBIT, TickRecorder, iter_ticks)
+from kimp_shm import USDT_KRW_SLOT, FeedProcesses, PriceBook
+from kimp_supervisor import FeedSupervisor
+from kimp_symbols import SymbolRegistry, load_config
+from time_windows import parse_windows
 
 THRESHOLD_USDT_DIFF = 3.5
 REVERSE_PREMIUM_THRESHOLD = -2
 OVER_PREMIUM_THRESHOLD = 3.5
+# Adaptive alerts against the rolling stats of ADAPTIVE_WINDOW (off when None):
+# |z-score| of the premium, and its distance in KRW from the rolling mean.
+ZSCORE_THRESHOLD = None
+DEVIATION_THRESHOLD = None
+ADAPTIVE_WINDOW = "15m"
+
+# Premiums built from a price older than this (seconds) are not reported.
+STALE_AFTER = 10.0
+# Hedge size in KRW for the executable premium from order book depth
+# (--depth-notional); when set, the threshold alerts use it instead of the
+# last-trade premium. Off when None.
+DEPTH_NOTIONAL = None
+
+# Set by setup() from the symbol config; see kimp_symbols.py.
+registry = None
+# Fixed symbol index with preallocated price arrays; see kimp_engine.py.
+engine = None
+# Feed-specific names resolved to (engine index[, scale]) once, up front.
+binance_streams = {}
+upbit_codes = {}
+hyperliquid_mids = None
+
+# DepthBooks and the book feeds' lookups when DEPTH_NOTIONAL is set; see kimp_book.py.
+depth = None
+hyperliquid_books = {}
+binance_depth = {}  # depth stream -> (engine index, scale, DiffDepthSync)
+
+# TickRecorder when running with --record; see kimp_recorder.py.
+recorder = None
+# RollingStats over the premium series; see kimp_stats.py.
+stats = None
+# ConflatingPresenter unless running with --output ticks; see kimp_presenter.py.
+presenter = None
+# LatencyMetrics unless running with --no-metrics; see kimp_metrics.py.
+metrics = None
+# With --processes: the shared-memory PriceBook the feed processes write to
+# and the FeedProcesses that run them; see kimp_shm.py.
+book = None
+feed_processes = None
+# Replay drives the same logic from recorded ticks: times come from the
+# records instead of the wall clock, and premiums are only printed on request.
+REPLAY = False
+QUIET = False
+
+# Alerts are queued and written / sent in the background; see kimp_alerts.py.
+# Built by setup_alerts() (or replay()), not at import.
+ALERT_FILE = "kimp_alert.txt"
+alerts = None
+
+def setup_alerts():
+    """Alert pipeline to kimp_alert.txt, and Telegram when KIMP_TELEGRAM_TOKEN is set."""
+    global alerts
+    sinks = [FileSink(ALERT_FILE)]
+    token = os.environ.get("KIMP_TELEGRAM_TOKEN")
+    if token:
+        sinks.append(TelegramSink(token, os.environ.get("KIMP_TELEGRAM_CHAT_ID", "@kimpmonitor")))
+    alerts = AlertPipeline(sinks)
+
+def setup(config):
+    """Build the symbol registry, premium engine and feed lookups from config."""
+    global registry, engine, binance_streams, upbit_codes, hyperliquid_mids
+    global depth, hyperliquid_books, binance_depth
+    registry = SymbolRegistry.from_config(config)
+    engine = PremiumEngine(registry.tickers, max_age=STALE_AFTER)
+    binance_streams = registry.binance_streams()
+    upbit_codes = registry.upbit_codes()
+    hyperliquid_mids = AllMidsDecoder(registry.hyperliquid_coins())
+    if DEPTH_NOTIONAL:
+        depth = DepthBooks(len(engine), DEPTH_NOTIONAL, max_age=STALE_AFTER)
+        hyperliquid_books = registry.hyperliquid_coins()
+        binance_depth = {stream: (i, scale, DiffDepthSync(depth.usdt[i]))
+                         for stream, (i, scale) in registry.binance_depth_streams().items()}
+
+def format_premium(i, now):
+    timestamp = (datetime.fromtimestamp(now) if REPLAY else datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+    ticker = engine.tickers[i]
+    label = engine.labels[i]
+    diff = engine.diff[i]
+    line = f"[{timestamp}] [{label}] diff: {diff:,.2f} ({ticker}_kimp: {engine.kimp[i]:,.2f}, USDT/KRW: {engine.usdt_krw}, {label}/KRW: {engine.krw[i]:,})"
+    if depth is not None:
+        # nan: a book is too thin for the notional, or stale.
+        line += (f" [{DEPTH_NOTIONAL:,.0f} KRW] over: {depth.over[i] - engine.usdt_krw:,.2f}, "
+                 f"reverse: {depth.reverse[i] - engine.usdt_krw:,.2f}")
+    return line
+
+def raise_alert(key, value, i, now, note=""):
+    """Send an alert for pair i unless the cooldown on (key, sign of value) holds it back."""
+    if alerts.admit(key, value, now):
+        alerts.publish(format_premium(i, now) + note)
+        if metrics is not None:
+            metrics.mark(ALERT)
+
+def check_adaptive(i, diff, now):
+    """Alert when the premium departs from its own recent behaviour."""
+    window = stats[ADAPTIVE_WINDOW]
+    ticker = engine.tickers[i]
+    if ZSCORE_THRESHOLD is not None:
+        z = window.zscore(i, diff)
+        if abs(z) >= ZSCORE_THRESHOLD:  # False while z is nan (not enough history)
+            raise_alert(f"{ticker}/z{ADAPTIVE_WINDOW}", z, i, now, f" z({ADAPTIVE_WINDOW}): {z:+.2f}")
+    if DEVIATION_THRESHOLD is not None:
+        deviation = diff - window.mean(i)
+        if abs(deviation) >= DEVIATION_THRESHOLD:
+            raise_alert(f"{ticker}/mean{ADAPTIVE_WINDOW}", deviation, i, now,
+                        f" vs mean({ADAPTIVE_WINDOW}): {deviation:+.2f}")
+
+def print_prices(i, now=None):
+    """Print the latest price and computed kimp ratio of pair i with a timestamp."""
+    # Skip pairs with a missing leg, and pairs whose premium would be built
+    # from a leg that stopped updating (dropped or silent feed).
+    if not engine.fresh(i, now):
+        return
+
+    diff = engine.diff[i]
+    if stats is not None:
+        stats.update(i, diff, now)
+
+    if presenter is not None:
+        # Conflated output: note the pair, the presenter renders it later.
+        presenter.update(i)
+        if metrics is not None:
+            metrics.mark(OUTPUT)
+    elif not QUIET:
+        print(format_premium(i, now))
+        if metrics is not None:
+            metrics.mark(OUTPUT)
 
-# Shared dictionary to store latest prices.
-price_data = {
-    "btc_usdt": None,  # Binance BTC/USDT
-    "eth_usdt": None,  # Binance ETH/USDT
-    "trump_usdt": None,  # Binance trump/USDT
-    "xrp_usdt": None,
-    "doge_usdt": None,
-    "sol_usdt": None,
-
-    "btc_krw": None,   # Upbit BTC/KRW
-    "eth_krw": None,   # Upbit ETH/KRW
-    "trump_krw": None,   # Upbit trump/KRW
-    "xrp_krw": None,
-    "doge_krw": None,
-    "sol_krw": None,
-
-    "usdt_krw": None   # Upbit USDT/KRW
-}
-
-# ticker: "btc" or "eth"
-async def print_prices(ticker):
-    """Print the latest prices and computed kimp ratios with a timestamp."""
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    usdt_krw = float(price_data['usdt_krw'])
-    # print(usdt_krw)
-
-    # if ticker != "btc":
-    #     return
-    
-    # Compute kimp ratios when both prices are available.
-    if price_data[f'{ticker}_krw'] is not None and price_data[f'{ticker}_usdt'] is not None:
-        calculated_kimp = float(price_data[f'{ticker}_krw']) / float(price_data[f'{ticker}_usdt'])
-        diff = calculated_kimp - usdt_krw
-        upbit_krw = price_data[f'{ticker}_krw']
-        msg = f"[{now}] [{ticker.upper()}] diff: {diff:,.2f} ({ticker}_kimp: {calculated_kimp:,.2f}, USDT/KRW: {usdt_krw}, {ticker.upper()}/KRW: {upbit_krw:,})"
-        print(msg)
-
-        # if abs(diff) >= THRESHOLD_USDT_DIFF:
+    # Alerts are evaluated on every tick; the message is only formatted for
+    # alerts that get past the cooldown.
+    # if abs(diff) >= THRESHOLD_USDT_DIFF:
+    if depth is None:
         if diff <= REVERSE_PREMIUM_THRESHOLD or diff >= OVER_PREMIUM_THRESHOLD:
-            # await send_telegram_message(msg)
-            await write_file_message(msg)
+            raise_alert(engine.tickers[i], diff, i, now)
+    else:
+        # What a hedge of DEPTH_NOTIONAL would capture, not the last trades.
+        over = depth.over[i] - engine.usdt_krw
+        reverse = depth.reverse[i] - engine.usdt_krw
+        if over >= OVER_PREMIUM_THRESHOLD:
+            raise_alert(engine.tickers[i], over, i, now)
+        if reverse <= REVERSE_PREMIUM_THRESHOLD:
+            raise_alert(engine.tickers[i], reverse, i, now)
+    if stats is not None and (ZSCORE_THRESHOLD is not None or DEVIATION_THRESHOLD is not None):
+        check_adaptive(i, diff, now)
 
     # if diff is lower than THRESHOLD_USDT_DIFF, hedge
     # if diff is higher than THRESHOLD_USDT_DIFF, unhedge
-    
-    
-    # print(f"[{now}] BTC/USDT: {price_data['btc_usdt']}, BTC/KRW: {price_data['btc_krw']}, BTC Kimp: {btc_kimp}, "
-    #       f"ETH/USDT: {price_data['eth_usdt']}, ETH/KRW: {price_data['eth_krw']}, ETH Kimp: {eth_kimp}, "
-    #       f"USDT/KRW: {price_data['usdt_krw']}")
 
+def print_all_prices(now=None):
+    """Report every pair after a USDT/KRW move revalued them all."""
+    for i in engine.ready(now):
+        print_prices(i, now)
+
+
+# Normalized ticks. Live feed handlers and replay() both go through these.
+
+def on_krw(i, price, exchange_ms, now):
+    if recorder is not None:
+        recorder.record(LEG_KRW, SOURCE_UPBIT, i, price, exchange_ms, now)
+    engine.update_krw(i, price, now)
+    if metrics is not None:
+        metrics.mark(PREMIUM)
+    print_prices(i, now)
+
+def on_usdt(i, price, source, exchange_ms, now):
+    if recorder is not None:
+        recorder.record(LEG_USDT, source, i, price, exchange_ms, now)
+    engine.update_usdt(i, price, now)
+    if metrics is not None:
+        metrics.mark(PREMIUM)
+    # allMids refreshes every coin at once; those premiums are reported on
+    # the next KRW or USDT/KRW tick instead.
+    if source != SOURCE_HYPERLIQUID:
+        print_prices(i, now)
+
+def on_hyperliquid_mids(mids, now):
+    """An allMids push: [(i, price)] for every listed coin at once, one premium stage for the message."""
+    for i, price in mids:
+        if recorder is not None:
+            recorder.record(LEG_USDT, SOURCE_HYPERLIQUID, i, price, 0, now)
+        engine.update_usdt(i, price, now)
+    if metrics is not None:
+        metrics.mark(PREMIUM)
+
+def on_usdt_krw(price, exchange_ms, now):
+    if recorder is not None:
+        recorder.record(LEG_USDT_KRW, SOURCE_UPBIT, 0, price, exchange_ms, now)
+    engine.update_usdt_krw(price, now)
+    if metrics is not None:
+        metrics.mark(PREMIUM)
+    print_all_prices(now)
+
+
+def on_book(i, now):
+    """Either order book of pair i changed: walk both and report."""
+    depth.evaluate(i, now)
+    if metrics is not None:
+        metrics.mark(PREMIUM)
+    print_prices(i, now)
+
+
+def handle_binance(message, now):
+    """Binance combined stream: {"stream": "btcusdt@ticker", "data": {"c": "<last>", "E": <ms>, ...}}"""
+    decoded = decode_binance(message)
+    if decoded is None:
+        return
+    stream, last_price, event_ms = decoded
+    if metrics is not None:
+        metrics.decoded("Binance", now, event_ms)
+    target = binance_streams.get(stream)
+    if target is not None:
+        i, scale = target
+        on_usdt(i, last_price / scale, SOURCE_BINANCE, event_ms, now)
+
+def handle_upbit(message, now):
+    """Upbit ticker: {"code": "KRW-BTC", "trade_price": <last>, "timestamp": <ms>, ...}, sent as binary frames."""
+    decoded = decode_upbit(message)
+    if decoded is None:
+        return
+    code, trade_price, timestamp_ms = decoded # "KRW-BTC"
+    if metrics is not None:
+        metrics.decoded("Upbit", now, timestamp_ms)
+    if code == "KRW-USDT":
+        on_usdt_krw(trade_price, timestamp_ms, now)
+        return
+    i = upbit_codes.get(code)
+    if i is not None:
+        on_krw(i, trade_price, timestamp_ms, now)
+
+def handle_hyperliquid(message, now):
+    """Hyperliquid allMids: {"channel": "allMids", "data": {"mids": {"<coin>": "<mid>", ...}}}"""
+    # Fast path: pick only our coins out of the raw allMids push.
+    mids = hyperliquid_mids.decode(message)
+    if mids is not None:
+        if metrics is not None:
+            metrics.decoded("Hyperliquid", now, 0)
+        on_hyperliquid_mids([(i, mid / scale) for (i, scale), mid in mids], now)
+        return
 
-async def binance_ws():
+    data = loads(message)
+    channel = data.get("channel")
+
+    # Handle the subscription response message.
+    if channel == "subscriptionResponse":
+        print("Subscription response received:", data)
+
+    # Look for mid price updates.
+    elif channel == "allMids":
+        mids = data.get("data", {}).get("mids", {})
+        if metrics is not None:
+            metrics.decoded("Hyperliquid", now, 0)
+        on_hyperliquid_mids([(i, float(mids[coin]) / scale) for coin, (i, scale) in hyperliquid_mids.coins.items()
+                             if mids.get(coin) is not None], now)
+
+
+def scaled(levels, scale):
+    """Contract levels (kPEPE / 1000PEPE) in per-coin price and size."""
+    return [(price / scale, size * scale) for price, size in levels]
+
+def handle_upbit_orderbook(message, now):
+    """Upbit orderbook: {"type": "orderbook", "code": "KRW-BTC", "orderbook_units": [{"ask_price": ..., "bid_price": ..., "ask_size": ..., "bid_size": ...}, ...]}"""
+    parsed = parse_upbit_orderbook(message)
+    if parsed is None:
+        return
+    code, bids, asks, timestamp_ms = parsed
+    if metrics is not None:
+        metrics.decoded("Upbit", now, timestamp_ms)
+    i = upbit_codes.get(code)
+    if i is not None:
+        depth.krw[i].replace(bids, asks, now)
+        on_book(i, now)
+
+def handle_hyperliquid_l2(message, now):
+    """Hyperliquid l2Book: {"channel": "l2Book", "data": {"coin": "BTC", "time": <ms>, "levels": [[bids], [asks]]}}"""
+    parsed = parse_hyperliquid_l2(message)
+    if parsed is None:
+        return
+    coin, bids, asks, time_ms = parsed
+    if metrics is not None:
+        metrics.decoded("Hyperliquid", now, time_ms)
+    target = hyperliquid_books.get(coin)
+    if target is not None:
+        i, scale = target
+        if scale != 1:
+            bids, asks = scaled(bids, scale), scaled(asks, scale)
+        depth.usdt[i].replace(bids, asks, now)
+        on_book(i, now)
+
+def handle_binance_depth(message, now):
+    """Binance diff depth: {"stream": "btcusdt@depth@100ms", "data": {"e": "depthUpdate", "U": ..., "u": ..., "pu": ..., "b": [...], "a": [...]}}"""
+    parsed = parse_binance_depth(message)
+    if parsed is None:
+        return
+    stream, first_u, last_u, prev_u, bids, asks, event_ms = parsed
+    if metrics is not None:
+        metrics.decoded("Binance", now, event_ms)
+    target = binance_depth.get(stream)
+    if target is None:
+        return
+    i, scale, sync = target
+    if scale != 1:
+        bids, asks = scaled(bids, scale), scaled(asks, scale)
+    if sync.on_event(first_u, last_u, prev_u, bids, asks, now):
+        on_book(i, now)
+    elif sync.needs_snapshot():
+        request_depth_snapshot(stream, scale, sync)
+
+def request_depth_snapshot(stream, scale, sync):
+    """Fetch the REST snapshot a Binance depth stream needs, in a worker thread."""
+    sync.snapshot_pending = True
+    symbol = stream.split("@", 1)[0]
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(None, fetch_binance_depth, registry.config["rest"]["binance"], symbol)
+
+    def done(future):
+        try:
+            last_update_id, bids, asks = future.result()
+        except Exception as e:
+            print(f"Binance depth snapshot for {symbol} failed: {e}")
+            # Retry on a later event, but not on every one of them.
+            loop.call_later(5.0, setattr, sync, "snapshot_pending", False)
+            return
+        if scale != 1:
+            bids, asks = scaled(bids, scale), scaled(asks, scale)
+        sync.on_snapshot(last_update_id, bids, asks, time.monotonic())
+
+    future.add_done_callback(done)
+
+
+def feed_specs(config):
+    """
+    One (feed, name, uri, subscription, targets) per connection: Upbit and
+    (when it is the USDT source) Binance are sharded to stay within
+    per-connection stream limits; the Hyperliquid allMids subscription covers
+    every coin on one connection. targets maps the feed's names to engine
+    indexes.
     """
-    Connects to Binance's combined websocket stream for BTC/USDT and ETH/USDT.
+    uris = config["uris"]
+    specs = []
+    upbit = registry.upbit_subscriptions()
+    for n, subscription in enumerate(upbit):
+        name = "Upbit" if len(upbit) == 1 else f"Upbit[{n}]"
+        specs.append(("upbit", name, uris["upbit"], subscription, upbit_codes))
+    if registry.usdt_source == "binance":
+        binance = registry.binance_subscriptions()
+        for n, subscription in enumerate(binance):
+            name = "Binance" if len(binance) == 1 else f"Binance[{n}]"
+            specs.append(("binance", name, uris["binance"], subscription, binance_streams))
+    else:
+        for subscription in registry.hyperliquid_subscriptions():
+            specs.append(("hyperliquid", "Hyperliquid", uris["hyperliquid"], subscription, hyperliquid_mids.coins))
+    if depth is not None:
+        # Order books on connections of their own, next to the tickers.
+        for n, subscription in enumerate(registry.upbit_orderbook_subscriptions()):
+            specs.append(("upbit_orderbook", f"Upbit book[{n}]", uris["upbit"], subscription, upbit_codes))
+        if registry.usdt_source == "binance":
+            for n, subscription in enumerate(registry.binance_depth_subscriptions()):
+                specs.append(("binance_depth", f"Binance depth[{n}]", uris["binance"], subscription, binance_depth))
+        else:
+            for subscription in registry.hyperliquid_l2_subscriptions():
+                specs.append(("hyperliquid_l2", "Hyperliquid book", uris["hyperliquid"], subscription, hyperliquid_books))
+    return specs
+
+def build_feeds(config):
     """
-    # uri = "wss://stream.binance.com:9443/stream?streams=btcusdt@ticker/ethusdt@ticker/glmusdt@ticker"
-    uri = "wss://fstream.binance.com/stream?streams=btcusdt@ticker/ethusdt@ticker/trumpusdt@ticker/xrpusdt@ticker/dogeusdt@ticker"
-    async with websockets.connect(uri) as ws:
-        while True:
-            try:
-                message = await ws.recv()
-                data = json.loads(message)
-                stream = data.get("stream")
-                ticker_data = data.get("data")
-                if ticker_data == None:
-                    continue
-                if stream == "btcusdt@ticker":
-                    price_data["btc_usdt"] = float(ticker_data.get("c"))
-                    await print_prices("btc")
-                elif stream == "ethusdt@ticker":
-                    price_data["eth_usdt"] = float(ticker_data.get("c"))
-                    await print_prices("eth")
-                elif stream == "trumpusdt@ticker":
-                    price_data["trump_usdt"] = float(ticker_data.get("c"))
-                    await print_prices("trump")
-                elif stream == "xrpusdt@ticker":
-                    price_data["xrp_usdt"] = float(ticker_data.get("c"))
-                    await print_prices("xrp")
-                elif stream == "dogeusdt@ticker":
-                    price_data["doge_usdt"] = float(ticker_data.get("c"))
-                    await print_prices("doge")
-                # print_prices()
-            except Exception as e:
-                print("Binance error:", e)
-                # break
-
-async def upbit_ws():
+    One FeedSupervisor per connection in feed_specs(). Each supervisor
+    (kimp_supervisor.py) reconnects with jittered backoff and resubscribes
+    when its socket drops or goes quiet.
+    """
+    handlers = {"upbit": handle_upbit, "binance": handle_binance, "hyperliquid": handle_hyperliquid,
+                "upbit_orderbook": handle_upbit_orderbook, "binance_depth": handle_binance_depth,
+                "hyperliquid_l2": handle_hyperliquid_l2}
+    return [FeedSupervisor(name, uri, subscription, handlers[feed])
+            for feed, name, uri, subscription, _ in feed_specs(config)]
+
+async def evaluate(poll_interval):
     """
-    Connects to Upbit's websocket to subscribe to BTC/KRW, ETH/KRW, and USDT/KRW tickers.
+    --processes: run the premium, output and alert logic on the prices the
+    feed processes publish in the shared book, polling it every poll_interval
+    seconds. Ticks keep the receive time stamped by their feed process.
     """
-    # Subscribe to KRW-BTC, KRW-ETH, and KRW-USDT tickers.
-    uri = "wss://api.upbit.com/websocket/v1"
-    subscribe_msg = [
-        {"ticket": "unique_ticket"},
-        {"type": "ticker", "codes": ["KRW-BTC", "KRW-ETH", "KRW-TRUMP", "KRW-XRP", "KRW-DOGE", "KRW-SOL", "KRW-USDT"]}
-    ]
-    async with websockets.connect(uri) as ws:
-        await ws.send(json.dumps(subscribe_msg))
-        while True:
-            try:
-                message = await ws.recv()
-                if isinstance(message, bytes):
-                    message = message.decode("utf-8")
-                data = json.loads(message)
-                code = data.get("code").lower() # "krw-btc"
-                trade_price = data.get("trade_price")
-                if trade_price is None:
-                    continue
-                dict_ticker = code.split("-")[1] + "_krw" # form of "btc_krw"
-                # print(dict_ticker)
-                # print(trade_price)
-                price_data[dict_ticker] = float(trade_price)
-                if dict_ticker != "usdt_krw":
-                    await print_prices(code.split("-")[1]) # "btc"
-                # if code == "KRW-BTC":
-                #     price_data["btc_krw"] = trade_price
-                #     print_prices("btc")
-                # elif code == "KRW-ETH":
-                #     price_data["eth_krw"] = trade_price
-                #     print_prices("eth")
-                # elif code == "KRW-GLM":
-                #     price_data["glm_krw"] = trade_price
-                #     print_prices("glm")
-                # elif code == "KRW-USDT":
-                #     price_data["usdt_krw"] = trade_price
-                # print_prices()
-            except Exception as e:
-                print("Upbit error:", e)
-                # break
-
-async def hyperliquid_ws():
-    # Replace this URL with the official Hyperliquid websocket endpoint if different.
-    url = "wss://api.hyperliquid.xyz/ws"
-
-    async with websockets.connect(url) as ws:
-        # Send the subscription message for all mid prices.
-        subscribe_msg = {
-            "method": "subscribe",
-            "subscription": {
-                "type": "allMids"
-            }
-        }
-
-        await ws.send(json.dumps(subscribe_msg))
-        print("Subscribed")
-
-        # Listen for messages indefinitely.
-        while True:
-            try:
-                message = await ws.recv()
-                data = json.loads(message)
-                channel = data.get("channel")
-                # print (data)
-                
-                # Handle the subscription response message.
-                if channel == "subscriptionResponse":
-                    print("Subscription response received:", data)
-                
-                # Look for mid price updates.
-                elif channel == "allMids":
-                    # The data is expected in the format: { "data": { "mids": { "<symbol>": "<price>", ... } } }
-                    mids = data.get("data", {}).get("mids", {})
-                    # Depending on the API naming convention, the key might be "BTCUSDT", "BTC/USDT", etc.
-                    btc_price = mids.get("BTC")
-                    xrp_price = mids.get("XRP")
-                    trump_price = mids.get("TRUMP")
-                    sol_price = mids.get("SOL")
-                    # if btc_price is not None:
-                        # print("BTC/USDT Perp Price:", btc_price)
-                        # print("XRP/USDT Perp Price:", xrp_price)
-                        # print("TRUMP/USDT Perp Price:", trump_price)
-                    # else:
-                        # Optionally print if no BTC price is found.
-                        # print("BTC/USDT price not found in mids:", mids)
-
-                    price_data["btc_usdt"] = float(btc_price)
-                    price_data["xrp_usdt"] = float(xrp_price)
-                    price_data["trump_usdt"] = float(trump_price)
-                    price_data["sol_usdt"] = float(sol_price)
-            except Exception as e:
-                print("Hyperliquid error: ", e)
-                # continue
-
-                # await print_prices("btc")
-
-async def send_telegram_message(msg):
-    BOT_TOKEN = "7985657708:AAGLhMYKDeizF5Jy7l46mUgqzzQojPElyG0"  # Replace with your actual token
-    CHAT_ID = "@kimpmonitor"                  # Replace with your chat ID (as an integer)
-    MESSAGE_TEXT = msg
-
-    # Telegram API URL
-    url = f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage"
-    # Parameters
-    params = {
-        "chat_id": CHAT_ID,
-        "text": MESSAGE_TEXT
-    }
-
-    # Make a GET request
-    response = requests.get(url, params=params)
-
-    if response.status_code == 200:
-        print("Message sent successfully!")
+    pairs = len(engine)
+    if registry.usdt_source == "binance":
+        usdt_feed, usdt_source = "Binance", SOURCE_BINANCE
     else:
-        print("Failed to send message:", response.text)
+        usdt_feed, usdt_source = "Hyperliquid", SOURCE_HYPERLIQUID
+    while True:
+        for slot, price, recv, exchange_ms in book.updates():
+            if slot == USDT_KRW_SLOT:
+                if metrics is not None:
+                    metrics.decoded("Upbit", recv, exchange_ms)
+                on_usdt_krw(price, exchange_ms, recv)
+            elif slot <= pairs:
+                if metrics is not None:
+                    metrics.decoded("Upbit", recv, exchange_ms)
+                on_krw(slot - 1, price, exchange_ms, recv)
+            else:
+                if metrics is not None:
+                    metrics.decoded(usdt_feed, recv, exchange_ms)
+                on_usdt(slot - 1 - pairs, price, usdt_source, exchange_ms, recv)
+        await asyncio.sleep(poll_interval)
 
-async def write_file_message(msg):
-    # f = open("kimp_alert.txt", "a+")
-    # f.write(msg + "\n")
-    with open("kimp_alert.txt", "a+") as f:
-        f.write(msg + "\n")
+def init_stats(windows):
+    """Rolling stats over `windows` ("1m,15m,...") for every pair, or none when empty."""
+    global stats
+    stats = RollingStats(len(engine), parse_windows(windows)) if windows else None
+    if (ZSCORE_THRESHOLD is not None or DEVIATION_THRESHOLD is not None) and (
+            stats is None or ADAPTIVE_WINDOW not in stats.windows):
+        raise SystemExit(f"--adaptive-window {ADAPTIVE_WINDOW} must be one of --stats-windows")
+
+def replay(paths, alerts_out=None, windows=DEFAULT_WINDOWS):
+    """
+    Drive the premium and alert logic from recorded tick logs as fast as
+    possible, then summarize the alerts the current thresholds produce.
+    """
+    global engine, alerts, REPLAY
+    REPLAY = True
+    logs = [iter_ticks(path) for path in sorted(paths)]
+    tickers = list(dict.fromkeys(ticker for file_tickers, _ in logs for ticker in file_tickers))
+    engine = PremiumEngine(tickers, max_age=STALE_AFTER)
+    init_stats(windows)
+    sink = MemorySink()
+    alerts = AlertPipeline([sink])
 
-async def main():
-    # Run both websocket connections concurrently.
-    # await asyncio.gather(binance_ws(), upbit_ws())
-    await asyncio.gather(hyperliquid_ws(), upbit_ws())
+    ticks = 0
+    start = time.perf_counter()
+    for file_tickers, records in logs:
+        index = [engine.index[ticker] for ticker in file_tickers]  # file symbol id -> engine index
+        for exchange_ms, recv_ns, symbol_id, leg, source, price in records:
+            now = recv_ns * 1e-9
+            if leg == LEG_KRW:
+                on_krw(index[symbol_id], price, exchange_ms, now)
+            elif leg == LEG_USDT:
+                on_usdt(index[symbol_id], price, source, exchange_ms, now)
+            else:
+                on_usdt_krw(price, exchange_ms, now)
+            ticks += 1
+    elapsed = time.perf_counter() - start
+
+    print(f"Replayed {ticks:,} ticks from {len(logs)} file(s) in {elapsed:.2f}s ({ticks / max(elapsed, 1e-9):,.0f} ticks/s)")
+    print(f"Thresholds: reverse <= {REVERSE_PREMIUM_THRESHOLD}, over >= {OVER_PREMIUM_THRESHOLD}, "
+          f"z({ADAPTIVE_WINDOW}) >= {ZSCORE_THRESHOLD}, deviation({ADAPTIVE_WINDOW}) >= {DEVIATION_THRESHOLD}")
+    print(f"Alerts: {alerts.submitted} sent, {alerts.suppressed} suppressed by cooldown")
+    for (ticker, over), count in alerts.counts.most_common():
+        print(f"  {ticker.upper():<10} {'over' if over else 'reverse':<8} {count}")
+    if alerts_out:
+        with open(alerts_out, "w") as f:
+            f.writelines(msg + "\n" for msg in sink.alerts)
+        print(f"Alerts written to {alerts_out}")
+
+async def main(config, record_dir=None, metrics_port=None, metrics_interval=None,
+               output="lines", output_interval=1.0, windows=DEFAULT_WINDOWS,
+               processes=False, poll_interval=0.001):
+    global recorder, presenter, book, feed_processes
+    setup(config)
+    if alerts is None:  # benchmarks install their own pipeline
+        setup_alerts()
+    init_stats(windows)
+    tasks = [alerts.run()]
+    if processes:
+        if record_dir:
+            raise SystemExit("--record needs every tick, but --processes conflates them; use one or the other")
+        if depth is not None:
+            raise SystemExit("--depth-notional keeps its order books in one process; it cannot be combined with --processes")
+        # Feeds decode in their own processes; this one only evaluates.
+        specs = feed_specs(config)
+        book = PriceBook(len(engine), len(specs))
+        feed_processes = FeedProcesses(book, specs)
+        feed_processes.start()
+        tasks += [evaluate(poll_interval), feed_processes.watch()]
+        print(f"Monitoring {len(registry)} symbols over {len(specs)} feed processes (USDT leg: {registry.usdt_source})")
+    else:
+        feeds = build_feeds(config)
+        tasks += [feed.run() for feed in feeds]
+        print(f"Monitoring {len(registry)} symbols over {len(feeds)} connections (USDT leg: {registry.usdt_source})")
+    if record_dir:
+        recorder = TickRecorder(record_dir, registry.tickers)
+        print(f"Recording ticks to {record_dir}/")
+    if output != "ticks":
+        presenter = ConflatingPresenter(engine, output_interval, output, format_premium,
+                                        stats=stats, stats_window=ADAPTIVE_WINDOW)
+        tasks.append(presenter.run())
+    if metrics is not None:
+        if metrics_port:
+            tasks.append(metrics.serve(metrics_port))
+            print(f"Latency metrics on http://127.0.0.1:{metrics_port}/")
+        if metrics_interval:
+            tasks.append(metrics.report(metrics_interval))
+    try:
+        # Run all websocket connections (or the evaluator) concurrently.
+        await asyncio.gather(*tasks)
+    finally:
+        if recorder is not None:
+            recorder.close()
+        if feed_processes is not None:
+            feed_processes.stop()
+            book.close()
+
+def cli(argv=None):
+    """Command line: live monitoring, or --replay of recorded ticks."""
+    global REVERSE_PREMIUM_THRESHOLD, OVER_PREMIUM_THRESHOLD, ZSCORE_THRESHOLD, DEVIATION_THRESHOLD
+    global ADAPTIVE_WINDOW, DEPTH_NOTIONAL, QUIET, metrics
+    parser = argparse.ArgumentParser(description="Monitor the kimchi premium of Upbit KRW markets against USDT prices.")
+    parser.add_argument("--config", help="JSON symbol config merged over kimp_symbols.DEFAULT_CONFIG")
+    parser.add_argument("--record", metavar="DIR", help="append every tick to per-day logs in DIR")
+    parser.add_argument("--output", choices=["lines", "table", "ticks"], default="lines",
+                        help="lines: latest premium of each changed pair per interval; table: refreshing table; "
+                             "ticks: print every tick (can throttle the feeds on a slow terminal)")
+    parser.add_argument("--output-interval", type=float, default=1.0, metavar="SECONDS",
+                        help="seconds between lines/table frames (default 1)")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT", help="serve latency histograms on 127.0.0.1:PORT")
+    parser.add_argument("--metrics-interval", type=float, default=60.0, metavar="SECONDS",
+                        help="print a latency summary this often (0 disables; default 60)")
+    parser.add_argument("--no-metrics", action="store_true", help="disable latency instrumentation")
+    parser.add_argument("--processes", action="store_true",
+                        help="run every feed connection in its own process, sharing prices through shared memory")
+    parser.add_argument("--poll-interval", type=float, default=0.001, metavar="SECONDS",
+                        help="how often the evaluator polls the shared price book with --processes (default 0.001)")
+    parser.add_argument("--depth-notional", type=float, metavar="KRW",
+                        help="also follow order books and report / alert on the premium executable for this KRW size")
+    parser.add_argument("--replay", nargs="+", metavar="FILE", help="replay recorded .ticks files instead of connecting")
+    parser.add_argument("--reverse-threshold", type=float, default=REVERSE_PREMIUM_THRESHOLD, help="alert when diff <= this")
+    parser.add_argument("--over-threshold", type=float, default=OVER_PREMIUM_THRESHOLD, help="alert when diff >= this")
+    parser.add_argument("--stats-windows", default=DEFAULT_WINDOWS, metavar="LIST",
+                        help=f"rolling premium statistics windows (default {DEFAULT_WINDOWS}; empty string disables)")
+    parser.add_argument("--zscore", type=float, metavar="Z", help="alert when |z-score| of the premium reaches Z")
+    parser.add_argument("--deviation", type=float, metavar="KRW",
+                        help="alert when the premium is this far from its rolling mean")
+    parser.add_argument("--adaptive-window", default=ADAPTIVE_WINDOW, metavar="WINDOW",
+                        help=f"window used by --zscore / --deviation (default {ADAPTIVE_WINDOW})")
+    parser.add_argument("--print", action="store_true", help="print every premium during --replay")
+    parser.add_argument("--alerts-out", metavar="FILE", help="write the alerts raised during --replay to FILE")
+    args = parser.parse_args(argv)
+    REVERSE_PREMIUM_THRESHOLD = args.reverse_threshold
+    OVER_PREMIUM_THRESHOLD = args.over_threshold
+    ZSCORE_THRESHOLD = args.zscore
+    DEVIATION_THRESHOLD = args.deviation
+    ADAPTIVE_WINDOW = args.adaptive_window
+    DEPTH_NOTIONAL = args.depth_notional
+
+    if args.replay:
+        QUIET = not args.print
+        replay(args.replay, args.alerts_out, args.stats_windows)
+    else:
+        if not args.no_metrics:
+            metrics = LatencyMetrics(["Upbit", "Binance", "Hyperliquid"])
+        asyncio.run(main(load_config(args.config), args.record, args.metrics_port, args.metrics_interval,
+                         args.output, args.output_interval, args.stats_windows,
+                         args.processes, args.poll_interval))
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    cli()
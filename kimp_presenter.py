@@ -0,0 +1,97 @@
+"""
+Conflated console output for kimp_monitor.
+
+Printing every tick of every pair lets a slow terminal or pipe throttle the
+event loop. The presenter only remembers which pairs changed (a set add per
+tick); every `interval` seconds it renders the latest premium of those pairs
+and writes the whole frame with a single write() from a worker thread. If a
+write takes longer than the interval, the intermediate frames are simply
+never built, so console cost per second stays bounded by the number of pairs,
+not by the message rate.
+"""
+import asyncio
+import sys
+import time
+from datetime import datetime
+
+CLEAR = "\x1b[H\x1b[2J"
+
+
+class ConflatingPresenter:
+    """
+    :param engine: PremiumEngine whose latest values are rendered
+    :param interval: Seconds between frames
+    :param mode: "lines" prints one line per pair that changed since the last
+                 frame; "table" redraws a full table of every pair
+    :param format_line: Callable(i, now) -> str used in "lines" mode
+    :param stream: Where frames are written (default sys.stdout)
+    :param stats: Optional RollingStats; "table" mode then shows the rolling
+                  mean and z-score of `stats_window`
+    """
+
+    def __init__(self, engine, interval=1.0, mode="lines", format_line=None, stream=None,
+                 stats=None, stats_window=None):
+        if mode not in ("lines", "table"):
+            raise ValueError(f"Unknown presenter mode: {mode}")
+        self.engine = engine
+        self.interval = interval
+        self.mode = mode
+        self.format_line = format_line
+        self.stream = stream or sys.stdout
+        self.window = stats[stats_window] if stats is not None and stats_window in stats.windows else None
+        self.window_name = stats_window
+        self.dirty = set()
+        self.frames = 0
+
+    def update(self, i):
+        """Called on every tick of pair i; rendering happens later."""
+        self.dirty.add(i)
+
+    def render_lines(self, now):
+        dirty, self.dirty = self.dirty, set()
+        engine = self.engine
+        lines = [self.format_line(i, now) for i in sorted(dirty) if engine.fresh(i, now)]
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def render_table(self, now):
+        self.dirty = set()
+        engine = self.engine
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        window = self.window
+        header = f"{'pair':<10} {'diff':>10} {'kimp':>12} {'KRW':>18} {'USDT':>14} {'age(s)':>8}"
+        if window is not None:
+            header += f" {'mean(' + self.window_name + ')':>12} {'z':>7}"
+        rows = [f"{CLEAR}[{timestamp}] USDT/KRW: {engine.usdt_krw:,.2f}", header]
+        for i, label in enumerate(engine.labels):
+            diff = engine.diff[i]
+            if diff != diff:
+                continue
+            age = engine.age(i, now)
+            marker = "" if age <= engine.max_age else "  stale"
+            row = (f"{label:<10} {diff:>10,.2f} {engine.kimp[i]:>12,.2f} {engine.krw[i]:>18,.4f} "
+                   f"{engine.usdt[i]:>14,.6f} {age:>8.1f}")
+            if window is not None:
+                row += f" {window.mean(i):>12,.2f} {window.zscore(i, diff):>7.2f}"
+            rows.append(row + marker)
+        return "\n".join(rows) + "\n"
+
+    def render(self, now=None):
+        if now is None:
+            now = time.monotonic()
+        if self.mode == "table":
+            return self.render_table(now)
+        return self.render_lines(now)
+
+    def _write(self, text):
+        self.stream.write(text)
+        self.stream.flush()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.interval)
+            frame = self.render()
+            if frame:
+                # A slow terminal blocks this worker thread, not the feeds.
+                await loop.run_in_executor(None, self._write, frame)
+                self.frames += 1
@@ -0,0 +1,168 @@
+"""
+Tick recorder and reader for kimp_monitor.
+
+Every normalized tick is appended to a per-day (UTC) binary log,
+<directory>/YYYYMMDD.ticks, through a memory map, next to a
+YYYYMMDD.symbols.json table that maps symbol ids to tickers.
+
+File layout (little endian):
+
+    header  32 bytes  magic b"KIMPTICK", version u32, record size u32,
+                      record count u64, 8 reserved bytes
+    records 32 bytes  exchange_ms i64   exchange timestamp (0 if the feed has none)
+                      recv_ns     i64   local receive time, ns since the epoch
+                      symbol_id   u32
+                      leg         u8    LEG_KRW / LEG_USDT / LEG_USDT_KRW
+                      source      u8    SOURCE_UPBIT / SOURCE_BINANCE / SOURCE_HYPERLIQUID
+                      2 pad bytes
+                      price       f64   already divided by the contract scale
+
+The record count in the header is updated with every tick, so a file is
+readable up to the last complete record even after a crash.
+"""
+import json
+import mmap
+import os
+import struct
+import time
+from datetime import datetime, timezone
+
+MAGIC = b"KIMPTICK"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQ8x")
+RECORD = struct.Struct("<qqIBB2xd")
+COUNT_OFFSET = 16  # byte offset of the record count in the header
+
+LEG_KRW, LEG_USDT, LEG_USDT_KRW = 0, 1, 2
+SOURCE_UPBIT, SOURCE_BINANCE, SOURCE_HYPERLIQUID = 0, 1, 2
+
+DAY_NS = 86400 * 10**9
+# Grow files by this many records at a time.
+GROW_RECORDS = 1 << 18
+
+
+def day_of(ns):
+    return datetime.fromtimestamp(ns / 1e9, tz=timezone.utc).strftime("%Y%m%d")
+
+
+class TickRecorder:
+    """
+    Appends ticks to the current day's log.
+
+    :param directory: Where the per-day files are written
+    :param tickers: Tickers in engine index order; ticks are recorded by index
+    """
+
+    def __init__(self, directory, tickers):
+        self.directory = directory
+        self.tickers = list(tickers)
+        os.makedirs(directory, exist_ok=True)
+        # Converts the monotonic receive times used by the engine to epoch ns.
+        self._offset_ns = time.time_ns() - time.monotonic_ns()
+        self._file = None
+        self._mm = None
+        self._ids = []  # engine index -> symbol id in the current file
+        self._count = 0
+        self._capacity = 0
+        self._day_end = 0
+        self.records = 0
+
+    def _symbol_ids(self, day):
+        """Map our tickers onto the day's symbol table, extending it as needed."""
+        path = os.path.join(self.directory, f"{day}.symbols.json")
+        table = []
+        if os.path.exists(path):
+            with open(path) as f:
+                table = json.load(f)
+        ids = {ticker: n for n, ticker in enumerate(table)}
+        for ticker in self.tickers:
+            if ticker not in ids:
+                ids[ticker] = len(table)
+                table.append(ticker)
+        with open(path, "w") as f:
+            json.dump(table, f)
+        return [ids[ticker] for ticker in self.tickers]
+
+    def _open(self, recv_ns):
+        self.close()
+        day = day_of(recv_ns)
+        self._day_end = (recv_ns // DAY_NS + 1) * DAY_NS
+        self._ids = self._symbol_ids(day)
+        path = os.path.join(self.directory, f"{day}.ticks")
+        exists = os.path.exists(path) and os.path.getsize(path) >= HEADER.size
+        self._file = open(path, "r+b" if exists else "w+b")
+        if exists:
+            magic, version, size, count = HEADER.unpack(self._file.read(HEADER.size))
+            if magic != MAGIC or size != RECORD.size:
+                raise ValueError(f"{path} is not a version {VERSION} tick log")
+            self._count = count
+        else:
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, 0))
+            self._count = 0
+        self._map(self._count + GROW_RECORDS)
+
+    def _map(self, capacity):
+        if self._mm is not None:
+            self._mm.close()
+        self._file.truncate(HEADER.size + capacity * RECORD.size)
+        self._capacity = capacity
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+
+    def record(self, leg, source, i, price, exchange_ms, now):
+        """
+        Append one tick. `i` is the engine index (ignored for LEG_USDT_KRW),
+        `now` the time.monotonic() receive time the feed handler saw.
+        """
+        recv_ns = int(now * 1e9) + self._offset_ns
+        if recv_ns >= self._day_end:
+            self._open(recv_ns)
+        if self._count == self._capacity:
+            self._map(self._capacity + GROW_RECORDS)
+        symbol_id = self._ids[i] if leg != LEG_USDT_KRW else 0
+        RECORD.pack_into(self._mm, HEADER.size + self._count * RECORD.size,
+                         exchange_ms, recv_ns, symbol_id, leg, source, price)
+        self._count += 1
+        struct.pack_into("<Q", self._mm, COUNT_OFFSET, self._count)
+        self.records += 1
+
+    def flush(self):
+        if self._mm is not None:
+            self._mm.flush()
+
+    def close(self):
+        """Unmap and trim the file to the records actually written."""
+        if self._mm is None:
+            return
+        self._mm.flush()
+        self._mm.close()
+        self._mm = None
+        self._file.truncate(HEADER.size + self._count * RECORD.size)
+        self._file.close()
+        self._file = None
+
+
+def open_ticks(path):
+    """
+    Map a tick log for reading.
+
+    :return: (tickers, mmap, count); the records start at HEADER.size. Iterate
+             them with RECORD.iter_unpack(memoryview(mm)[HEADER.size:HEADER.size + count * RECORD.size]).
+    """
+    with open(path, "rb") as f:
+        magic, version, size, count = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or size != RECORD.size:
+            raise ValueError(f"{path} is not a version {VERSION} tick log")
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    # Never trust the header beyond what is actually on disk.
+    count = min(count, (len(mm) - HEADER.size) // RECORD.size)
+    symbols_path = path[:-len(".ticks")] + ".symbols.json" if path.endswith(".ticks") else path + ".symbols.json"
+    with open(symbols_path) as f:
+        tickers = json.load(f)
+    return tickers, mm, count
+
+
+def iter_ticks(path):
+    """Yield (tickers, records) where records iterates RECORD tuples of the file."""
+    tickers, mm, count = open_ticks(path)
+    view = memoryview(mm)[HEADER.size:HEADER.size + count * RECORD.size]
+    return tickers, RECORD.iter_unpack(view)
@@ -0,0 +1,267 @@
+"""
+Shared-memory price book for running kimp_monitor's feeds in separate processes.
+
+With --processes every websocket connection (each Upbit / Binance shard, the
+Hyperliquid allMids feed) runs in its own process: it decodes its messages
+and writes normalized prices into a PriceBook in shared memory. The main
+process only evaluates: it polls the book for changed slots and runs the
+usual premium, output and alert logic on them. Decoding then spreads over
+cores, and a feed stuck on a slow connection or a large message never holds
+up the others.
+
+Book layout (native byte order, one slot per price):
+
+    header   16 bytes   magic b"KIMPBOOK", pairs u32, writers u32
+    messages u64 x writers        messages handled, per feed process
+    seqs     u64 x slots          version of each slot (odd while being written)
+    data     24 bytes x slots     price f64, receive time f64 (time.monotonic()),
+                                  exchange timestamp i64 (ms, 0 if none)
+
+Slot 0 is USDT/KRW, slots 1..pairs the KRW leg and pairs+1..2*pairs the USDT
+leg of each pair. Every slot has exactly one writing process, so a slot is
+a seqlock: the writer makes the version odd, writes the data and makes it
+even again; a reader retries while the version is odd or changed under it.
+The receive times are comparable across processes because time.monotonic()
+is a system-wide clock.
+
+Slots hold the latest value, not a queue: ticks that arrive faster than the
+evaluator polls are conflated, which is what the premium needs (latest price
+wins) but not what a tick recorder needs.
+
+The stores rely on CPython writing each 8-byte field with one aligned store
+and on the CPU keeping stores in program order (x86-64); on weakly ordered
+CPUs a torn read is possible, though rare.
+"""
+import asyncio
+import struct
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+from kimp_decode import AllMidsDecoder, decode_binance, decode_upbit
+from kimp_supervisor import FeedSupervisor
+
+MAGIC = b"KIMPBOOK"
+HEADER = struct.Struct("=8sII")
+SLOT = struct.Struct("=ddq")
+USDT_KRW_SLOT = 0
+# A writer holds a slot odd for a few hundred ns; give up on a slot after this
+# many retries (a descheduled writer) and pick it up on the next poll.
+READ_RETRIES = 100
+
+
+def krw_slot(i):
+    return 1 + i
+
+
+def usdt_slot(i, pairs):
+    return 1 + pairs + i
+
+
+class PriceBook:
+    """
+    Seqlock price slots in shared memory.
+
+    :param pairs: Number of pairs (engine size)
+    :param writers: Number of feed processes (one message counter each)
+    :param name: Attach to the existing book of this name; None creates one
+    """
+
+    def __init__(self, pairs, writers, name=None):
+        self.pairs = pairs
+        self.writers = writers
+        self.slots = 1 + 2 * pairs
+        counters = HEADER.size
+        seqs = counters + 8 * writers
+        data = seqs + 8 * self.slots
+        size = data + SLOT.size * self.slots
+        self.created = name is None
+        self.shm = SharedMemory(name=name, create=self.created, size=size)
+        buf = self.shm.buf
+        if self.created:
+            HEADER.pack_into(buf, 0, MAGIC, pairs, writers)
+        elif HEADER.unpack_from(buf, 0) != (MAGIC, pairs, writers):
+            self.shm.close()
+            raise ValueError(f"{name} is not a price book for {pairs} pairs and {writers} writers")
+        self.name = self.shm.name
+        self._messages = buf[counters:seqs].cast("Q")
+        self._seqs = buf[seqs:data].cast("Q")
+        self._data = buf[data:size]
+        self._seen = [0] * self.slots
+
+    def write(self, slot, price, now, exchange_ms=0):
+        """Publish a price; only the slot's own feed process may call this."""
+        seqs = self._seqs
+        # Next odd version, also when a killed predecessor left the slot odd.
+        seq = (seqs[slot] + 1) | 1
+        seqs[slot] = seq  # odd: write in progress
+        SLOT.pack_into(self._data, slot * SLOT.size, price, now, exchange_ms)
+        seqs[slot] = seq + 1
+
+    def _read(self, slot):
+        seqs = self._seqs
+        for _ in range(READ_RETRIES):
+            seq = seqs[slot]
+            if seq & 1:
+                continue
+            value = SLOT.unpack_from(self._data, slot * SLOT.size)
+            if seqs[slot] == seq:
+                return seq, value
+        return None, None
+
+    def read(self, slot):
+        """(price, receive time, exchange ms) of a slot, or None if it kept changing."""
+        return self._read(slot)[1]
+
+    def updates(self):
+        """
+        [(slot, price, receive time, exchange ms)] for every slot written
+        since the previous call; the latest value only.
+        """
+        seqs = self._seqs.tolist()
+        seen = self._seen
+        if seqs == seen:
+            return []
+        out = []
+        for slot, seq in enumerate(seqs):
+            if seq == seen[slot]:
+                continue
+            seq, value = self._read(slot)
+            if value is None:
+                continue  # still being written; retried on the next call
+            seen[slot] = seq
+            out.append((slot, *value))
+        return out
+
+    def count_message(self, writer):
+        self._messages[writer] += 1
+
+    def messages(self):
+        """Messages handled so far, per feed process."""
+        return self._messages.tolist()
+
+    def close(self):
+        # Views into the segment must go before it can be closed.
+        self._messages.release()
+        self._seqs.release()
+        self._data.release()
+        self.shm.close()
+        if self.created:
+            self.shm.unlink()
+
+
+def _feed_handler(book, writer, feed, targets):
+    """Decode one feed's messages straight into the book."""
+    # Slot numbers inlined (krw_slot / usdt_slot): this runs for every tick.
+    pairs = book.pairs
+    write = book.write
+    count = book.count_message
+
+    if feed == "upbit":
+        def handle(message, now):
+            count(writer)
+            decoded = decode_upbit(message)
+            if decoded is None:
+                return
+            code, price, timestamp_ms = decoded
+            if code == "KRW-USDT":
+                write(USDT_KRW_SLOT, price, now, timestamp_ms)
+                return
+            i = targets.get(code)
+            if i is not None:
+                write(1 + i, price, now, timestamp_ms)
+
+    elif feed == "binance":
+        def handle(message, now):
+            count(writer)
+            decoded = decode_binance(message)
+            if decoded is None:
+                return
+            stream, price, event_ms = decoded
+            target = targets.get(stream)
+            if target is not None:
+                i, scale = target
+                write(1 + pairs + i, price / scale, now, event_ms)
+
+    elif feed == "hyperliquid":
+        mids_decoder = AllMidsDecoder(targets)
+
+        def handle(message, now):
+            count(writer)
+            mids = mids_decoder.decode(message)
+            if mids is None:
+                return  # subscriptionResponse and the like
+            for (i, scale), mid in mids:
+                write(1 + pairs + i, mid / scale, now, 0)
+
+    else:
+        raise ValueError(f"Unknown feed: {feed}")
+    return handle
+
+
+def run_feed(book_name, pairs, writers, writer, feed, name, uri, subscription, targets):
+    """Entry point of a feed process: one supervised connection writing into the book."""
+    book = PriceBook(pairs, writers, book_name)
+    supervisor = FeedSupervisor(name, uri, subscription, _feed_handler(book, writer, feed, targets))
+    try:
+        asyncio.run(supervisor.run())
+    except KeyboardInterrupt:
+        pass  # Ctrl-C reaches the whole process group; the parent reports it
+    finally:
+        book.close()
+
+
+class FeedProcesses:
+    """
+    Starts one process per feed spec and restarts any that exit.
+
+    :param book: PriceBook the processes write to
+    :param specs: [(feed, name, uri, subscription, targets)], feed being
+                  "upbit", "binance" or "hyperliquid" and targets the
+                  feed's name -> engine index lookup
+    """
+
+    def __init__(self, book, specs):
+        self.book = book
+        self.specs = list(specs)
+        # spawn, not fork: the parent may already be running an event loop.
+        self._context = get_context("spawn")
+        self.processes = [None] * len(self.specs)
+        self.restarts = 0
+        self.stopped = False
+
+    def _start(self, writer):
+        feed, name, uri, subscription, targets = self.specs[writer]
+        process = self._context.Process(
+            target=run_feed, name=f"kimp-{name}", daemon=True,
+            args=(self.book.name, self.book.pairs, self.book.writers, writer, feed, name, uri, subscription, targets),
+        )
+        process.start()
+        self.processes[writer] = process
+
+    def start(self):
+        for writer in range(len(self.specs)):
+            self._start(writer)
+
+    def check(self):
+        """Restart feed processes that died."""
+        if self.stopped:
+            return
+        for writer, process in enumerate(self.processes):
+            if process is not None and not process.is_alive():
+                print(f"{process.name} exited with code {process.exitcode}; restarting")
+                self.restarts += 1
+                self._start(writer)
+
+    async def watch(self, interval=1.0):
+        while True:
+            await asyncio.sleep(interval)
+            self.check()
+
+    def stop(self):
+        self.stopped = True
+        for process in self.processes:
+            if process is not None and process.is_alive():
+                process.terminate()
+        for process in self.processes:
+            if process is not None:
+                process.join(5)
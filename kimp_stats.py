@@ -0,0 +1,155 @@
+"""
+Rolling statistics of the premium series for kimp_monitor.
+
+Each window (e.g. 15m) is cut into a fixed number of slots. Per pair, the
+premium's last value in every closed slot goes into a ring buffer with a
+running sum and sum of squares (mean / standard deviation / z-score), and
+each slot's low / high goes into monotonic deques (window min / max). A tick
+only touches the pair's open slot; closing a slot pushes one value and evicts
+expired ones, both amortized O(1). Memory is pairs x windows x slots.
+"""
+import math
+from array import array
+from collections import deque
+from itertools import repeat
+
+NAN = float("nan")
+
+DEFAULT_WINDOWS = "1m,15m,1h,24h"
+
+
+class RollingWindow:
+    """
+    Rolling stats over `seconds` for every pair, at `slots` resolution.
+
+    Mean, std and z-score use closed slots only; min / max also include the
+    open slot, so intra-slot extremes are never missed.
+    """
+
+    def __init__(self, pairs, seconds, slots=60):
+        self.seconds = seconds
+        self.slots = slots
+        self.slot_seconds = seconds / slots
+        self.open_slot = [-1] * pairs
+        self.open_last = array("d", repeat(NAN, pairs))
+        self.open_min = array("d", repeat(NAN, pairs))
+        self.open_max = array("d", repeat(NAN, pairs))
+        self.values = [deque() for _ in range(pairs)]  # (slot, last value), oldest first
+        self.mins = [deque() for _ in range(pairs)]  # (slot, low), increasing lows
+        self.maxs = [deque() for _ in range(pairs)]  # (slot, high), decreasing highs
+        self.sum = array("d", repeat(0.0, pairs))
+        self.sumsq = array("d", repeat(0.0, pairs))
+        self._closes = [0] * pairs
+
+    def update(self, i, diff, now):
+        slot = int(now / self.slot_seconds)
+        if slot != self.open_slot[i]:
+            if self.open_slot[i] >= 0:
+                self._close(i, slot)
+            self.open_slot[i] = slot
+            self.open_min[i] = self.open_max[i] = diff
+        elif diff < self.open_min[i]:
+            self.open_min[i] = diff
+        elif diff > self.open_max[i]:
+            self.open_max[i] = diff
+        self.open_last[i] = diff
+
+    def _close(self, i, next_slot):
+        seq = self.open_slot[i]
+        value = self.open_last[i]
+        values, mins, maxs = self.values[i], self.mins[i], self.maxs[i]
+        oldest = next_slot - self.slots
+        if seq < oldest:
+            # Quiet for longer than the window: the closing slot has expired
+            # too, so nothing of the pair's history is left.
+            values.clear()
+            mins.clear()
+            maxs.clear()
+            self.sum[i] = self.sumsq[i] = 0.0
+            self._closes[i] = 0
+            return
+
+        values.append((seq, value))
+        self.sum[i] += value
+        self.sumsq[i] += value * value
+        low, high = self.open_min[i], self.open_max[i]
+        while mins and mins[-1][1] >= low:
+            mins.pop()
+        mins.append((seq, low))
+        while maxs and maxs[-1][1] <= high:
+            maxs.pop()
+        maxs.append((seq, high))
+
+        # Drop slots that fell out of the window ending at the next open slot.
+        while values and values[0][0] < oldest:
+            _, old = values.popleft()
+            self.sum[i] -= old
+            self.sumsq[i] -= old * old
+        while mins and mins[0][0] < oldest:
+            mins.popleft()
+        while maxs and maxs[0][0] < oldest:
+            maxs.popleft()
+
+        # Re-sum once per window length so rounding in the running sums
+        # cannot drift (O(slots) every `slots` closes: still O(1) amortized).
+        self._closes[i] += 1
+        if self._closes[i] >= self.slots:
+            self._closes[i] = 0
+            self.sum[i] = math.fsum(v for _, v in values)
+            self.sumsq[i] = math.fsum(v * v for _, v in values)
+
+    def count(self, i):
+        return len(self.values[i])
+
+    def mean(self, i):
+        n = len(self.values[i])
+        return self.sum[i] / n if n else NAN
+
+    def std(self, i):
+        n = len(self.values[i])
+        if n < 2:
+            return NAN
+        mean = self.sum[i] / n
+        return math.sqrt(max(self.sumsq[i] / n - mean * mean, 0.0))
+
+    def zscore(self, i, diff):
+        std = self.std(i)
+        if not std > 0:  # nan (too few samples) or a flat series
+            return NAN
+        return (diff - self.sum[i] / len(self.values[i])) / std
+
+    def min(self, i):
+        mins = self.mins[i]
+        return min(mins[0][1], self.open_min[i]) if mins else self.open_min[i]
+
+    def max(self, i):
+        maxs = self.maxs[i]
+        return max(maxs[0][1], self.open_max[i]) if maxs else self.open_max[i]
+
+
+class RollingStats:
+    """
+    One RollingWindow per configured window for all pairs.
+
+    :param pairs: Number of pairs (engine size)
+    :param windows: {"15m": 900, ...}, see time_windows.parse_windows()
+    :param slots: Slots per window
+    """
+
+    def __init__(self, pairs, windows, slots=60):
+        self.windows = {name: RollingWindow(pairs, seconds, slots) for name, seconds in windows.items()}
+        self._all = list(self.windows.values())
+
+    def update(self, i, diff, now):
+        for window in self._all:
+            window.update(i, diff, now)
+
+    def __getitem__(self, name):
+        return self.windows[name]
+
+    def describe(self, i, diff):
+        """{window: (mean, std, min, max, z)} for pair i at premium diff."""
+        return {
+            name: (w.mean(i), w.std(i), w.min(i), w.max(i), w.zscore(i, diff))
+            for name, w in self.windows.items()
+        }
@@ -0,0 +1,172 @@
+"""
+Supervised websocket feeds for kimp_monitor.
+
+FeedSupervisor owns one websocket connection: it connects, sends the
+subscription, hands every message to a synchronous handler and, when the
+socket drops or goes quiet, reconnects with jittered exponential backoff and
+subscribes again. It records message age and how long each outage lasted.
+"""
+import asyncio
+import random
+import time
+from collections import deque
+
+import websockets
+
+
+class IdleTimer:
+    """
+    Calls `on_expire` once `timeout` seconds pass without a reset(). reset()
+    only moves the deadline; the single loop callback re-arms itself when it
+    fires early, so a busy feed costs one float store per message.
+    """
+
+    def __init__(self, timeout, on_expire):
+        self.timeout = timeout
+        self.on_expire = on_expire
+        self._loop = asyncio.get_running_loop()
+        self._deadline = self._loop.time() + timeout
+        self._expired = False
+        self._handle = self._loop.call_at(self._deadline, self._fire)
+
+    def reset(self):
+        self._deadline = self._loop.time() + self.timeout
+
+    def expired(self):
+        return self._expired
+
+    def cancel(self):
+        self._handle.cancel()
+
+    def _fire(self):
+        if self._loop.time() < self._deadline:
+            self._handle = self._loop.call_at(self._deadline, self._fire)
+            return
+        self._expired = True
+        self.on_expire()
+
+
+class FeedSupervisor:
+    """
+    Keeps a single websocket feed alive.
+
+    :param name: Feed name used in log lines (e.g. 'Upbit')
+    :param uri: Websocket URI
+    :param subscribe: Message(s) to send after every (re)connect, or None
+    :param on_message: Callable(message, recv_time) run for every message
+    :param base_delay: First reconnect delay ceiling in seconds
+    :param max_delay: Upper bound for any single reconnect delay
+    :param idle_timeout: Reconnect when no message arrives for this long
+    :param open_timeout: Give up on a connection attempt after this long
+    """
+
+    def __init__(self, name, uri, subscribe, on_message, base_delay=0.5, max_delay=10.0,
+                 idle_timeout=30.0, open_timeout=10.0):
+        self.name = name
+        self.uri = uri
+        if isinstance(subscribe, str):
+            subscribe = [subscribe]
+        self.subscribe = subscribe or []
+        self.on_message = on_message
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.idle_timeout = idle_timeout
+        self.open_timeout = open_timeout
+
+        self.connected = False
+        self.connects = 0
+        self.drops = 0
+        self.messages = 0
+        self.last_message = None  # time.monotonic() of the last message
+        self.down_since = None  # time.monotonic() when the current outage started
+        self.recoveries = deque(maxlen=100)  # outage durations in seconds
+
+    def age(self, now=None):
+        """Seconds since the last message (inf before the first one)."""
+        if self.last_message is None:
+            return float("inf")
+        return (time.monotonic() if now is None else now) - self.last_message
+
+    def max_recovery_time(self):
+        """
+        Worst-case gap between a drop and the first message after it, not
+        counting the exchange's own silence: one capped backoff delay plus a
+        timed-out connection attempt, repeated until one succeeds.
+        """
+        return self.max_delay + self.open_timeout
+
+    def _backoff(self, attempt):
+        # "Full jitter": spread reconnects over [0, cap] so several feeds that
+        # dropped together don't hammer the exchange in lockstep.
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    async def _session(self):
+        try:
+            ws = await websockets.connect(self.uri, open_timeout=self.open_timeout)
+        except (asyncio.TimeoutError, TimeoutError):
+            raise ConnectionError(f"connect timed out after {self.open_timeout}s") from None
+        # One idle deadline pushed forward on every message; when it passes,
+        # the timer aborts the socket and recv() fails. (wait_for() here costs
+        # a task per message and can swallow a cancellation that races with a
+        # ready message, leaving shutdown hanging; asyncio.timeout() needs 3.11.)
+        idle = IdleTimer(self.idle_timeout, ws.transport.abort)
+        try:
+            for msg in self.subscribe:
+                await ws.send(msg)
+            self.connected = True
+            self.connects += 1
+            while True:
+                try:
+                    message = await ws.recv()
+                except websockets.ConnectionClosed:
+                    if idle.expired():
+                        raise asyncio.TimeoutError(f"no message for {self.idle_timeout}s") from None
+                    raise
+                idle.reset()
+                now = time.monotonic()
+                if self.down_since is not None:
+                    outage = now - self.down_since
+                    self.recoveries.append(outage)
+                    self.down_since = None
+                    print(f"{self.name} recovered after {outage:.2f}s")
+                self.last_message = now
+                self.messages += 1
+                try:
+                    self.on_message(message, now)
+                except Exception as e:
+                    # A malformed message is not a reason to reconnect.
+                    print(f"{self.name} error:", e)
+        finally:
+            idle.cancel()
+            await ws.close()
+
+    async def run(self):
+        attempt = 0
+        while True:
+            messages = self.messages
+            try:
+                await self._session()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Idle and connect timeouts carry their own description.
+                print(f"{self.name} disconnected: {e}")
+            self.connected = False
+            if self.down_since is None:
+                self.down_since = time.monotonic()
+                self.drops += 1
+            if self.messages != messages:
+                attempt = 0  # the last connection worked; start backing off afresh
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+
+    def stats(self):
+        return {
+            "connected": self.connected,
+            "connects": self.connects,
+            "drops": self.drops,
+            "messages": self.messages,
+            "age": self.age(),
+            "last_recovery": self.recoveries[-1] if self.recoveries else None,
+            "max_recovery": max(self.recoveries) if self.recoveries else None,
+        }
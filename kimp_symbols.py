@@ -0,0 +1,225 @@
+"""
+Symbol registry for kimp_monitor.
+
+One config decides which coins are monitored and where their USDT leg comes
+from; every subscription (Upbit codes, Binance streams, Hyperliquid coins) is
+derived from it. With "symbols": "auto" the universe is every coin listed on
+Upbit KRW that also has a USDT perp on the configured USDT source.
+
+Large universes are split into shards so that no single websocket carries
+more streams than the exchange allows per connection.
+"""
+import json
+import re
+from collections import namedtuple
+
+DEFAULT_CONFIG = {
+    # List of tickers (["btc", "eth"]) or "auto" for the KRW / USDT overlap.
+    "symbols": ["btc", "eth", "trump", "xrp", "doge", "sol"],
+    "exclude": [],
+    # Where the USDT leg comes from: "hyperliquid" (allMids) or "binance" (futures tickers).
+    "usdt_source": "hyperliquid",
+    # Ticker -> exchange name when it differs, e.g. {"pepe": "kPEPE"} on Hyperliquid.
+    "usdt_names": {},
+    # Binance futures allows 200 streams per connection; Upbit does not publish
+    # a hard limit, so keep its shards moderate.
+    "binance_streams_per_connection": 200,
+    "upbit_codes_per_connection": 100,
+    "uris": {
+        "binance": "wss://fstream.binance.com/stream",
+        "upbit": "wss://api.upbit.com/websocket/v1",
+        "hyperliquid": "wss://api.hyperliquid.xyz/ws",
+    },
+    "rest": {
+        "binance": "https://fapi.binance.com",
+        "upbit": "https://api.upbit.com",
+        "hyperliquid": "https://api.hyperliquid.xyz",
+    },
+}
+
+# ticker: "btc"; upbit_code: "KRW-BTC"; usdt_name: exchange name of the USDT
+# market ("BTC" / "kPEPE" on Hyperliquid, "btcusdt" / "1000pepeusdt" on
+# Binance); usdt_scale: coins per quoted unit (1000 for kPEPE / 1000PEPE).
+Symbol = namedtuple("Symbol", "ticker upbit_code usdt_name usdt_scale")
+
+_BINANCE_MULTIPLIER = re.compile(r"^(1000+)(.+)$")
+
+
+def load_config(path=None):
+    """DEFAULT_CONFIG with the JSON file at `path` (if any) merged over it."""
+    config = json.loads(json.dumps(DEFAULT_CONFIG))  # deep copy
+    if path:
+        with open(path) as f:
+            overrides = json.load(f)
+        for key, value in overrides.items():
+            if isinstance(value, dict) and isinstance(config.get(key), dict):
+                config[key].update(value)
+            else:
+                config[key] = value
+    return config
+
+
+def chunks(items, size):
+    """Split items into lists of at most `size`."""
+    return [items[n:n + size] for n in range(0, len(items), size)]
+
+
+def hyperliquid_scale(name):
+    """kPEPE -> ("PEPE", 1000); BTC -> ("BTC", 1)."""
+    if len(name) > 1 and name[0] == "k" and name[1:].isupper():
+        return name[1:], 1000
+    return name, 1
+
+
+def binance_scale(base_asset):
+    """1000PEPE -> ("PEPE", 1000); BTC -> ("BTC", 1)."""
+    match = _BINANCE_MULTIPLIER.match(base_asset)
+    if match:
+        return match.group(2), int(match.group(1))
+    return base_asset, 1
+
+
+def usdt_market(name, source):
+    """Exchange market name and scale for a coin or explicit market name."""
+    if source == "binance":
+        name = name.lower()
+        if not name.endswith("usdt"):
+            name += "usdt"
+        return name, binance_scale(name[:-4].upper())[1]
+    return name, hyperliquid_scale(name)[1]
+
+
+def fetch_upbit_krw_coins(rest):
+    """Base coins of every Upbit KRW market, e.g. {"BTC", "ETH", ...}."""
+    import requests  # only needed for "auto" discovery
+
+    response = requests.get(f"{rest}/v1/market/all", timeout=10)
+    response.raise_for_status()
+    return {m["market"][4:] for m in response.json() if m["market"].startswith("KRW-")}
+
+
+def fetch_binance_usdt_coins(rest):
+    """{coin: (stream name, scale)} for trading Binance USDT-M perpetuals."""
+    import requests
+
+    response = requests.get(f"{rest}/fapi/v1/exchangeInfo", timeout=10)
+    response.raise_for_status()
+    coins = {}
+    for s in response.json()["symbols"]:
+        if s.get("quoteAsset") != "USDT" or s.get("contractType") != "PERPETUAL" or s.get("status") != "TRADING":
+            continue
+        coin, scale = binance_scale(s["baseAsset"])
+        coins[coin] = (s["symbol"].lower(), scale)
+    return coins
+
+
+def fetch_hyperliquid_coins(rest):
+    """{coin: (Hyperliquid name, scale)} for listed Hyperliquid perps."""
+    import requests
+
+    response = requests.post(f"{rest}/info", json={"type": "meta"}, timeout=10)
+    response.raise_for_status()
+    coins = {}
+    for asset in response.json()["universe"]:
+        if asset.get("isDelisted"):
+            continue
+        coin, scale = hyperliquid_scale(asset["name"])
+        coins[coin] = (asset["name"], scale)
+    return coins
+
+
+class SymbolRegistry:
+    """The monitored symbols, in engine index order, and their subscriptions."""
+
+    def __init__(self, symbols, config):
+        self.symbols = list(symbols)
+        self.config = config
+        self.usdt_source = config["usdt_source"]
+        self.tickers = [s.ticker for s in self.symbols]
+
+    @classmethod
+    def from_config(cls, config):
+        source = config["usdt_source"]
+        if source not in ("hyperliquid", "binance"):
+            raise ValueError(f"Unknown usdt_source: {source}")
+        exclude = {t.upper() for t in config["exclude"]}
+        names = {t.upper(): n for t, n in config["usdt_names"].items()}
+
+        if config["symbols"] == "auto":
+            rest = config["rest"]
+            krw = fetch_upbit_krw_coins(rest["upbit"])
+            if source == "binance":
+                usdt = fetch_binance_usdt_coins(rest["binance"])
+            else:
+                usdt = fetch_hyperliquid_coins(rest["hyperliquid"])
+            coins = sorted((krw & usdt.keys()) - exclude - {"USDT"})
+        else:
+            coins = [t.upper() for t in config["symbols"] if t.upper() not in exclude]
+            usdt = {coin: usdt_market(coin, source) for coin in coins}
+        usdt.update({coin: usdt_market(name, source) for coin, name in names.items()})
+
+        symbols = [Symbol(coin.lower(), f"KRW-{coin}", *usdt[coin]) for coin in coins]
+        return cls(symbols, config)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def upbit_codes(self):
+        """{"KRW-BTC": engine index, ...}"""
+        return {s.upbit_code: i for i, s in enumerate(self.symbols)}
+
+    def binance_streams(self):
+        """{"btcusdt@ticker": (engine index, scale), ...}"""
+        return {f"{s.usdt_name}@ticker": (i, s.usdt_scale) for i, s in enumerate(self.symbols)}
+
+    def hyperliquid_coins(self):
+        """{"BTC": (engine index, scale), ...}"""
+        return {s.usdt_name: (i, s.usdt_scale) for i, s in enumerate(self.symbols)}
+
+    def upbit_subscriptions(self):
+        """One ticker subscription message per Upbit connection."""
+        codes = ["KRW-USDT"] + [s.upbit_code for s in self.symbols]
+        return [
+            json.dumps([{"ticket": f"kimp-{n}"}, {"type": "ticker", "codes": shard}])
+            for n, shard in enumerate(chunks(codes, self.config["upbit_codes_per_connection"]))
+        ]
+
+    def binance_subscriptions(self):
+        """One SUBSCRIBE message per Binance connection."""
+        streams = list(self.binance_streams())
+        return [
+            json.dumps({"method": "SUBSCRIBE", "params": shard, "id": n + 1})
+            for n, shard in enumerate(chunks(streams, self.config["binance_streams_per_connection"]))
+        ]
+
+    def hyperliquid_subscriptions(self):
+        """allMids carries every coin, so one connection is enough."""
+        return [json.dumps({"method": "subscribe", "subscription": {"type": "allMids"}})]
+
+    # Order book streams for --depth-notional (kimp_book.py).
+
+    def upbit_orderbook_subscriptions(self):
+        """One orderbook subscription message per Upbit connection."""
+        codes = [s.upbit_code for s in self.symbols]
+        return [
+            json.dumps([{"ticket": f"kimp-book-{n}"}, {"type": "orderbook", "codes": shard}])
+            for n, shard in enumerate(chunks(codes, self.config["upbit_codes_per_connection"]))
+        ]
+
+    def binance_depth_streams(self):
+        """{"btcusdt@depth@100ms": (engine index, scale), ...}"""
+        return {f"{s.usdt_name}@depth@100ms": (i, s.usdt_scale) for i, s in enumerate(self.symbols)}
+
+    def binance_depth_subscriptions(self):
+        streams = list(self.binance_depth_streams())
+        return [
+            json.dumps({"method": "SUBSCRIBE", "params": shard, "id": n + 1})
+            for n, shard in enumerate(chunks(streams, self.config["binance_streams_per_connection"]))
+        ]
+
+    def hyperliquid_l2_subscriptions(self):
+        """l2Book is per coin: one subscribe message per coin, all on one connection."""
+        return [[
+            json.dumps({"method": "subscribe", "subscription": {"type": "l2Book", "coin": s.usdt_name}})
+            for s in self.symbols
+        ]]
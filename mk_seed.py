@@ -1,105 +1,299 @@
 #!/usr/bin/env python3
+"""
+BIP-39 mnemonic generation and validation, offline.
 
-import os
-import requests
-import hashlib
+The English wordlist ships as crypto_tools/bip39_english.txt and is
+checked against the SHA-256 of the official list before use; it is loaded
+once, together with a word -> index map. Encoding and decoding work on one
+Python int: entropy bits shifted left to make room for the checksum, then
+11 bits per word, so no bit strings are built.
+
+Keys follow BIP-44 for Ethereum, m/44'/60'/account'/0/index. Deriving many
+of them pays for PBKDF2 and the path down to m/44'/60'/account'/0 once;
+each address index is then one HMAC-SHA512 and a modular addition, since
+a private child key needs only the parent's public key. Many mnemonics
+are spread over a process pool.
 
+    python3 mk_seed.py                 # 24 words + EVM private key
+    python3 mk_seed.py --words 12
+    python3 mk_seed.py --check "word1 word2 ..."
+    python3 mk_seed.py --derive 1000 --accounts 2
+    python3 mk_seed.py --phrases mnemonics.txt --derive 10 --workers 8
+"""
+import argparse
+import hashlib
+import hmac
+import os
+import secrets
 import sys
+import unicodedata
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 
-try:
-    from mnemonic import Mnemonic
-    import bip32utils
-except ImportError:
-    print("Please install required packages: pip install mnemonic bip32utils")
-    sys.exit(1)
+WORDLIST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "crypto_tools", "bip39_english.txt")
+# SHA-256 of bip-0039/english.txt in github.com/bitcoin/bips
+WORDLIST_SHA256 = "2f5eed53a4727b4bf8880d8f3f199efc90e58503646d9ff8eff3a2ed3b24dbda"
+# Words in a phrase -> entropy bits; the checksum is entropy bits / 32.
+ENTROPY_BITS = {12: 128, 15: 160, 18: 192, 21: 224, 24: 256}
+PBKDF2_ROUNDS = 2048
+CURVE_ORDER = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+HARDENED = 0x80000000
 
-def seed_phrase_to_private_key(phrase: str, passphrase: str = "") -> str:
+# A BIP32 private node: key as an int, 32-byte chain code.
+HDNode = namedtuple("HDNode", "key chain")
+
+
+@lru_cache(maxsize=None)
+def load_wordlist(path=WORDLIST_PATH):
+    """(words, {word: index}) of the bundled English wordlist."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if hashlib.sha256(data).hexdigest() != WORDLIST_SHA256:
+        raise ValueError(f"{path} is not the official BIP-39 English wordlist")
+    words = tuple(data.decode("ascii").split())
+    return words, {word: index for index, word in enumerate(words)}
+
+
+def entropy_to_mnemonic(entropy: bytes) -> list:
+    """Words for 16, 20, 24, 28 or 32 bytes of entropy."""
+    bits = len(entropy) * 8
+    if bits not in ENTROPY_BITS.values():
+        raise ValueError(f"Entropy must be 128-256 bits in steps of 32, got {bits}")
+    words, _ = load_wordlist()
+    checksum_bits = bits // 32
+    # Entropy followed by the first entropy/32 bits of its SHA-256.
+    value = (int.from_bytes(entropy, "big") << checksum_bits) | (hashlib.sha256(entropy).digest()[0] >> (8 - checksum_bits))
+    count = (bits + checksum_bits) // 11
+    return [words[(value >> (11 * (count - 1 - i))) & 0x7FF] for i in range(count)]
+
+
+def mnemonic_to_entropy(phrase) -> bytes:
     """
-    1) Convert the 24-word BIP-39 mnemonic to a seed.
-    2) Use BIP32 to derive the Ethereum private key at the path m/44'/60'/0'/0/0.
-    3) Return the private key in hex form, prefixed with 0x.
+    Entropy of a phrase (str or list of words).
+
+    :raises ValueError: Wrong word count, a word not in the list, or a bad checksum
     """
-    # 1) Convert to seed (BIP-39)
-    mnemo = Mnemonic("english")
-    seed = mnemo.to_seed(phrase, passphrase=passphrase)  # "mnemonic" + passphrase is standard
+    words = phrase.split() if isinstance(phrase, str) else list(phrase)
+    if len(words) not in ENTROPY_BITS:
+        raise ValueError(f"A mnemonic has 12, 15, 18, 21 or 24 words, got {len(words)}")
+    _, index = load_wordlist()
+    value = 0
+    for word in words:
+        try:
+            value = (value << 11) | index[unicodedata.normalize("NFKD", word).lower()]
+        except KeyError:
+            raise ValueError(f"Not a BIP-39 word: {word!r}") from None
+    bits = ENTROPY_BITS[len(words)]
+    checksum_bits = bits // 32
+    entropy = (value >> checksum_bits).to_bytes(bits // 8, "big")
+    if value & ((1 << checksum_bits) - 1) != hashlib.sha256(entropy).digest()[0] >> (8 - checksum_bits):
+        raise ValueError("Mnemonic checksum does not match")
+    return entropy
+
+
+def validate_mnemonic(phrase) -> bool:
+    """True if `phrase` is a valid English BIP-39 mnemonic."""
+    try:
+        mnemonic_to_entropy(phrase)
+    except ValueError:
+        return False
+    return True
 
-    # 2) Create a BIP32 master key from the seed
-    master_key = bip32utils.BIP32Key.fromEntropy(seed)
 
+def generate_mnemonic(words: int = 24) -> list:
+    """A new mnemonic of `words` words from the OS CSPRNG (secrets)."""
+    if words not in ENTROPY_BITS:
+        raise ValueError(f"A mnemonic has 12, 15, 18, 21 or 24 words, got {words}")
+    return entropy_to_mnemonic(secrets.token_bytes(ENTROPY_BITS[words] // 8))
+
+
+def mnemonic_to_seed(phrase: str, passphrase: str = "") -> bytes:
+    """BIP-39 seed: PBKDF2-HMAC-SHA512 of the phrase, salt "mnemonic" + passphrase, 2048 rounds."""
+    phrase = unicodedata.normalize("NFKD", phrase)
+    salt = unicodedata.normalize("NFKD", "mnemonic" + passphrase)
+    return hashlib.pbkdf2_hmac("sha512", phrase.encode("utf-8"), salt.encode("utf-8"), PBKDF2_ROUNDS)
+
+
+def public_key(key: int) -> bytes:
+    """Compressed SEC1 public key of a private key: the one EC multiplication in BIP32."""
+    try:
+        from ecdsa import SECP256k1
+    except ImportError:
+        print("Please install required packages: pip install ecdsa")
+        sys.exit(1)
+    point = SECP256k1.generator * key
+    return bytes([2 | (point.y() & 1)]) + point.x().to_bytes(32, "big")
+
+
+def _child_key(parent_key, digest):
+    tweak = int.from_bytes(digest[:32], "big")
+    key = (tweak + parent_key) % CURVE_ORDER
+    if tweak >= CURVE_ORDER or key == 0:
+        # BIP32 says to skip the index; the odds are below 1 in 2^127.
+        raise ValueError("Invalid BIP32 child key")
+    return key
+
+
+def master_node(seed: bytes) -> HDNode:
+    """BIP32 master node of a seed."""
+    digest = hmac.digest(b"Bitcoin seed", seed, "sha512")
+    return HDNode(_child_key(0, digest), digest[32:])
+
+
+def child_node(node: HDNode, index: int, parent_public: bytes = None) -> HDNode:
+    """
+    Private child of `node` (CKDpriv). A hardened index hashes the private
+    key; a normal one hashes the parent's public key, computed here unless
+    `parent_public` is given.
+    """
+    if index & HARDENED:
+        data = b"\0" + node.key.to_bytes(32, "big")
+    else:
+        data = parent_public or public_key(node.key)
+    digest = hmac.digest(node.chain, data + index.to_bytes(4, "big"), "sha512")
+    return HDNode(_child_key(node.key, digest), digest[32:])
+
+
+def address_parent(seed: bytes, account: int = 0):
+    """
+    (node, public key) of m/44'/60'/account'/0, the parent of every
+    external address of the account. The public key is what each address
+    index hashes, so the two EC multiplications here are the only ones.
+    """
     # Hardened derivation:
     #   44' -> for BIP44
     #   60' -> for Ethereum
     #   0'  -> account
     #   0   -> change (0 for external, 1 for internal)
-    #   0   -> index
-    #
-    # BIP32 child derivation requires the index plus bip32utils.BIP32_HARDEN for hardened paths.
-    # For example, 44' = 44 + bip32utils.BIP32_HARDEN
-    #
-    # So the path m/44'/60'/0'/0/0 => indexes:
-    # m -> master_key
-    # 44' -> master_key.ChildKey(44 + BIP32_HARDEN)
-    # 60' -> ...
-    # 0'  -> ...
-    # 0   -> ...
-    # 0   -> ...
-    #
-    hardened_offset = bip32utils.BIP32_HARDEN
-    purpose_key = master_key.ChildKey(44 + hardened_offset)
-    coin_type_key = purpose_key.ChildKey(60 + hardened_offset)
-    account_key = coin_type_key.ChildKey(0 + hardened_offset)
-    change_key = account_key.ChildKey(0)
-    derived_key = change_key.ChildKey(0)
-
-    # 3) Retrieve the private key in hex form
-    private_key_bytes = derived_key.PrivateKey()
-    private_key_hex = private_key_bytes.hex()
-    return f"0x{private_key_hex}"
-
-
-def get_bip39_wordlist():
-    url = "https://raw.githubusercontent.com/bitcoin/bips/refs/heads/master/bip-0039/english.txt"
-    response = requests.get(url, timeout=10)
-    response.raise_for_status()
-    return response.text.split()
-
-def generate_mnemonic():
-    # 1) Get the BIP-39 English word list
-    wordlist = get_bip39_wordlist()
-    if len(wordlist) != 2048:
-        raise ValueError("Word list must contain 2048 words.")
-
-    # 2) Generate 256 bits of random entropy
-    entropy = os.urandom(32)  # 32 bytes = 256 bits
-
-    # 3) Create the checksum (first 8 bits of SHA-256(entropy))
-    sha = hashlib.sha256(entropy).digest()
-    checksum_length = 256 // 32  # 8 bits for 256 bits of entropy
-    # Convert the SHA-256 hash to binary, and take the first 8 bits
-    sha_bits = bin(int.from_bytes(sha, byteorder="big"))[2:].zfill(256)
-    checksum = sha_bits[:checksum_length]
-
-    # 4) Combine entropy bits + checksum bits
-    entropy_bits = bin(int.from_bytes(entropy, byteorder="big"))[2:].zfill(256)
-    total_bits = entropy_bits + checksum  # now 264 bits
-
-    # 5) Split into 24 groups of 11 bits each => indices into the wordlist
-    mnemonic = []
-    for i in range(0, len(total_bits), 11):
-        idx = int(total_bits[i : i + 11], 2)
-        mnemonic.append(wordlist[idx])
-
-    return mnemonic
+    node = master_node(seed)
+    for index in (44 | HARDENED, 60 | HARDENED, account | HARDENED, 0):
+        node = child_node(node, index)
+    return node, public_key(node.key)
 
-if __name__ == "__main__":
-    mnemonic_words = generate_mnemonic()
-    # 6) Print the 24-word mnemonic (last word includes checksum bits)
-    print("Mnemonic phrase (24 words):")
+
+def derive_keys(parent: HDNode, parent_public: bytes, start: int = 0, count: int = 1) -> list:
+    """Private keys (ints) of indices start .. start+count-1 under `parent`: one HMAC-SHA512 each, no EC math."""
+    key, chain = parent.key, parent.chain
+    return [_child_key(key, hmac.digest(chain, parent_public + index.to_bytes(4, "big"), "sha512"))
+            for index in range(start, start + count)]
+
+
+def derive_private_keys(phrase: str, passphrase: str = "", start: int = 0, count: int = 1, account: int = 0,
+                        accounts: int = 1) -> list:
+    """
+    [(account, index, private key int)] for indices start .. start+count-1 of
+    accounts account .. account+accounts-1. PBKDF2 runs once per phrase and
+    the path down to m/44'/60'/account'/0 once per account.
+    """
+    seed = mnemonic_to_seed(phrase, passphrase)
+    keys = []
+    for number in range(account, account + accounts):
+        parent, parent_public = address_parent(seed, number)
+        keys.extend((number, start + n, key) for n, key in enumerate(derive_keys(parent, parent_public, start, count)))
+    return keys
+
+
+def _derive_job(job):
+    return derive_private_keys(*job)
+
+
+def derive_many(phrases, passphrase: str = "", start: int = 0, count: int = 1, account: int = 0, accounts: int = 1,
+                workers: int = None) -> list:
+    """
+    derive_private_keys() for each phrase, spread over a process pool (the
+    PBKDF2-2048 stretch dominates when there are many phrases and few keys
+    each). Results are in phrase order.
+
+    :param workers: Processes (default: CPU count); 1 runs inline
+    """
+    jobs = [(phrase, passphrase, start, count, account, accounts) for phrase in phrases]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) < 2:
+        return [_derive_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_derive_job, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+
+def format_key(key: int) -> str:
+    return f"0x{key:064x}"
+
+
+def seed_phrase_to_private_key(phrase: str, passphrase: str = "") -> str:
+    """
+    1) Convert the BIP-39 mnemonic to a seed.
+    2) Use BIP32 to derive the Ethereum private key at the path m/44'/60'/0'/0/0.
+    3) Return the private key in hex form, prefixed with 0x.
+    """
+    (_, _, key), = derive_private_keys(phrase, passphrase)
+    return format_key(key)
+
+
+def print_keys(keys, numbered=None, public=False):
+    lines = []
+    for account, index, key in keys:
+        line = f"m/44'/60'/{account}'/0/{index} {format_key(key)}"
+        if public:
+            line += f" {public_key(key).hex()}"
+        lines.append(line if numbered is None else f"{numbered} {line}")
+    if lines:
+        print("\n".join(lines))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=24, choices=sorted(ENTROPY_BITS), help="phrase length")
+    parser.add_argument("--check", metavar="PHRASE", help="validate a phrase instead of generating one")
+    parser.add_argument("--no-key", action="store_true", help="don't derive the EVM private key")
+    parser.add_argument("--derive", type=int, metavar="N", help="derive N address keys per account")
+    parser.add_argument("--start", type=int, default=0, help="first address index")
+    parser.add_argument("--account", type=int, default=0, help="first account")
+    parser.add_argument("--accounts", type=int, default=1, help="number of accounts")
+    parser.add_argument("--phrases", metavar="FILE",
+                        help="derive from these mnemonics (one per line, '-' for stdin) instead of a new one")
+    parser.add_argument("--passphrase", default="", help="BIP-39 passphrase")
+    parser.add_argument("--public", action="store_true", help="also print compressed public keys (one EC multiplication each)")
+    parser.add_argument("--workers", type=int, help="processes for many phrases (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    if args.check is not None:
+        try:
+            mnemonic_to_entropy(args.check)
+        except ValueError as e:
+            print(f"Invalid: {e}")
+            sys.exit(1)
+        print(f"Valid {len(args.check.split())}-word mnemonic")
+        return
+
+    if args.phrases:
+        f = sys.stdin if args.phrases == "-" else open(args.phrases)
+        with f:
+            phrases = [" ".join(line.split()) for line in f if line.strip()]
+        for number, phrase in enumerate(phrases):
+            if not validate_mnemonic(phrase):
+                print(f"Invalid mnemonic on line {number + 1}")
+                sys.exit(1)
+        results = derive_many(phrases, args.passphrase, args.start, args.derive or 1, args.account, args.accounts,
+                              args.workers)
+        for number, keys in enumerate(results):
+            print_keys(keys, number if len(results) > 1 else None, args.public)
+        return
+
+    mnemonic_words = generate_mnemonic(args.words)
+    # Print the mnemonic (last word includes checksum bits)
+    print(f"Mnemonic phrase ({args.words} words):")
     mnemonic_words_str = " ".join(mnemonic_words)
     print(mnemonic_words_str)
 
-    phrase = mnemonic_words_str
-    passphrase = ""
-    private_key = seed_phrase_to_private_key(phrase, passphrase)
-    print(f"EVM Private Key:")
-    print(private_key)
\ No newline at end of file
+    if args.derive:
+        print("EVM Private Keys:")
+        print_keys(derive_private_keys(mnemonic_words_str, args.passphrase, args.start, args.derive, args.account,
+                                       args.accounts), public=args.public)
+    elif not args.no_key:
+        private_key = seed_phrase_to_private_key(mnemonic_words_str, args.passphrase)
+        print(f"EVM Private Key:")
+        print(private_key)
+
+
+if __name__ == "__main__":
+    main()
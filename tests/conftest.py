@@ -0,0 +1,22 @@
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bench"))
+
+
+@pytest.fixture
+def info_api():
+    """(standin, /info URL) of a local Hyperliquid stand-in with a handful of coins."""
+    import samples
+    from info_standin import InfoStandIn, serve
+
+    standin = InfoStandIn(samples.coin_names(6), budget=0, history_days=60)
+    server = serve(standin, 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield standin, f"http://127.0.0.1:{server.server_address[1]}/info"
+    server.shutdown()
+    server.server_close()
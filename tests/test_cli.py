@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ABOUT = " ".join(["abandon"] * 11 + ["about"])
+
+
+def crypto_tools(*args, importtime=False):
+    """Run `crypto-tools ARGS` (as python -m crypto_tools) in a fresh interpreter."""
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-m", "crypto_tools", *args]
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    return subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True, timeout=60)
+
+
+def imported(stderr):
+    """Top-level module names from -X importtime output."""
+    return {line.split("|")[-1].strip().split(".")[0] for line in stderr.splitlines() if line.startswith("import time:")}
+
+
+def test_funding_help_imports_only_what_it_needs():
+    result = crypto_tools("funding", "--help", importtime=True)
+    assert result.returncode == 0
+    assert "usage: crypto-tools funding" in result.stdout
+    modules = imported(result.stderr)
+    assert {"funding_client", "funding_store"} <= modules  # the funding command did load
+    assert not modules & {"requests", "aiohttp", "websockets", "ecdsa", "kimp_monitor", "mk_seed"}
+
+
+def test_seed_check_dispatches_and_returns_status():
+    assert crypto_tools("seed", "--check", ABOUT).returncode == 0
+    result = crypto_tools("seed", "--check", ABOUT.replace("about", "abandon"))
+    assert result.returncode == 1 and "checksum" in result.stdout
+
+
+@pytest.mark.parametrize("args, status", [(("bogus",), 2), ((), 2), (("--help",), 0), (("--version",), 0)])
+def test_top_level_exit_status(args, status):
+    result = crypto_tools(*args)
+    assert result.returncode == status
+    if args == ("bogus",):
+        assert "unknown command 'bogus'" in result.stderr
@@ -0,0 +1,118 @@
+import json
+
+import pytest
+import requests
+
+from funding_client import (FUNDING_INTERVAL_MS, MAX_ROWS, WINDOW_MS, InfoClient, InfoError, fetch_funding_histories,
+                            find_gaps, plan_windows)
+
+HOUR_MS = FUNDING_INTERVAL_MS
+
+
+def test_plan_windows_tiles_the_range():
+    start, end = 1_000, 1_000 + 3 * WINDOW_MS
+    windows = plan_windows(start, end)
+    assert windows[0][0] == start and windows[-1][1] == end
+    for (_, a_end), (b_start, _) in zip(windows, windows[1:]):
+        assert b_start == a_end + 1  # back to back, no overlap, no hole
+    assert all(b - a <= WINDOW_MS for a, b in windows)
+
+
+def test_plan_windows_stays_under_the_row_cap():
+    # Hourly records inside any window: never a full page, so a short page means "done".
+    for a, b in plan_windows(0, 10 * WINDOW_MS):
+        assert b // HOUR_MS - (a - 1) // HOUR_MS < MAX_ROWS
+
+
+def test_plan_windows_edge_cases():
+    assert plan_windows(5, 5) == [(5, 5)]
+    assert plan_windows(6, 5) == []
+    assert plan_windows(0, 10, window_ms=4) == [(0, 4), (5, 9), (10, 10)]
+
+
+def test_find_gaps():
+    times = [0, HOUR_MS, 2 * HOUR_MS, 5 * HOUR_MS, 6 * HOUR_MS]
+    assert find_gaps(times) == [(2 * HOUR_MS, 5 * HOUR_MS)]
+    # Jitter up to half an interval is not a gap.
+    assert find_gaps([0, HOUR_MS * 3 // 2, 2 * HOUR_MS]) == []
+    assert find_gaps([]) == [] and find_gaps([0]) == []
+
+
+class FlakySession:
+    """Stands in for requests.Session: raises the queued errors, then answers `rows`."""
+
+    def __init__(self, errors, rows=()):
+        self.errors = list(errors)
+        self.rows = list(rows)
+        self.calls = 0
+
+    def post(self, url, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(self.rows).encode()
+        return response
+
+    def close(self):
+        pass
+
+
+def client_with(session, retries=2):
+    client = InfoClient("http://127.0.0.1:9/info", retries=retries, base_delay=0.001)
+    client.session = session
+    return client
+
+
+def test_transient_errors_are_retried():
+    session = FlakySession([requests.exceptions.ChunkedEncodingError("cut off"),
+                            requests.ConnectionError("reset"), requests.Timeout("slow")], rows=[])
+    client = client_with(session, retries=3)
+    assert client.funding_history("BTC", 0, HOUR_MS) == []
+    assert session.calls == 4 and client.retried == 3
+
+
+@pytest.mark.parametrize("error", [requests.exceptions.ContentDecodingError("gzip"),
+                                   requests.TooManyRedirects("loop"),
+                                   requests.exceptions.InvalidURL("bad")])
+def test_other_request_errors_become_info_errors(error):
+    session = FlakySession([error])
+    with pytest.raises(InfoError):
+        client_with(session).post({"type": "meta"})
+    assert session.calls == 1
+
+
+def test_retries_exhausted():
+    session = FlakySession([requests.ConnectionError("reset")] * 3)
+    with pytest.raises(InfoError, match="after 3 attempts"):
+        client_with(session).post({"type": "meta"})
+
+
+def test_one_failing_coin_does_not_stop_the_others():
+    class PerCoinSession(FlakySession):
+        def post(self, url, **kwargs):
+            if kwargs["json"]["coin"] == "BAD":
+                raise requests.TooManyRedirects("loop")
+            return super().post(url, **kwargs)
+
+    client = client_with(PerCoinSession([], rows=[{"coin": "BTC", "time": 0, "fundingRate": "0.0001"}]))
+    results = {coin: (rows, error) for coin, _, _, rows, error in
+               fetch_funding_histories(client, [("BTC", 0, HOUR_MS), ("BAD", 0, HOUR_MS), ("ETH", 0, HOUR_MS)], 2)}
+    assert isinstance(results["BAD"][1], InfoError)
+    assert results["BTC"][1] is None and results["ETH"][1] is None
+
+
+def test_asset_contexts_from_standin(info_api):
+    standin, url = info_api
+    client = InfoClient(url)
+    try:
+        contexts = client.asset_contexts()
+    finally:
+        client.close()
+    assert standin.requests == 1
+    assert [c.coin for c in contexts] == standin.coins
+    for context in contexts:
+        assert context.mark > 0 and context.volume >= 0
+        assert context.open_interest > 0  # coins times mark: USD
+        assert abs(context.funding) < 0.01 and context.premium == pytest.approx(context.funding - 1.25e-5)
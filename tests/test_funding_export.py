@@ -0,0 +1,109 @@
+import csv
+import math
+import struct
+
+import pytest
+
+import funding_export
+from funding_export import HEADER, MAGIC, VERSION, ChunkSpool, FundingFile, export
+from funding_stats import FundingSeries
+
+HOUR_MS = 3_600_000
+
+
+@pytest.fixture
+def spool(tmp_path):
+    spool = ChunkSpool(str(tmp_path))
+    yield spool
+    spool.close()
+
+
+def test_merged_dedupes_overlaps_latest_chunk_wins(spool):
+    spool.add([(h * HOUR_MS, 0.1, math.nan) for h in range(0, 10)])
+    spool.add([(h * HOUR_MS, 0.2, 1.0) for h in range(8, 15)])  # overlaps hours 8-9
+    spool.add([(9 * HOUR_MS, 0.3, 2.0)])  # newest chunk for hour 9
+    merged = list(spool.merged())
+    assert [time for time, _, _ in merged] == [h * HOUR_MS for h in range(15)]
+    rates = {time // HOUR_MS: rate for time, rate, _ in merged}
+    assert rates[7] == 0.1 and rates[8] == 0.2 and rates[9] == 0.3 and rates[14] == 0.2
+    assert spool.records == 18
+
+
+def test_merged_is_strictly_increasing_across_blocks(spool, monkeypatch):
+    monkeypatch.setattr(funding_export, "BLOCK", 7)
+    # Chunks arrive out of order, as the workers finish.
+    for start in (60, 0, 40, 20):
+        spool.add([(h * HOUR_MS, h / 1e6, math.nan) for h in range(start + 19, start - 1, -1)])
+    spool.add([(h * HOUR_MS, 1.0, math.nan) for h in range(15, 45, 3)])
+    times = [time for time, _, _ in spool.merged()]
+    assert times == [h * HOUR_MS for h in range(80)]
+    assert all(a < b for a, b in zip(times, times[1:]))
+
+
+def test_add_rows_skips_invalid(spool):
+    spool.add_rows([{"time": 0, "fundingRate": "0.0001", "premium": "0.0002"},
+                    {"time": HOUR_MS, "fundingRate": "nope"},
+                    {"time": 2 * HOUR_MS}])
+    assert spool.invalid == 2
+    assert list(spool.merged()) == [(0, 0.0001, 0.0002)]
+
+
+def test_csv_and_binary_round_trip(tmp_path):
+    records = [(h * HOUR_MS, (h - 5) / 1e5, math.nan if h % 2 else h / 1e4) for h in range(10)]
+    csv_path, bin_path = tmp_path / "BTC.csv", tmp_path / "BTC.fund"
+    assert export(iter(records), "BTC", str(csv_path), str(bin_path)) == 10
+
+    with open(csv_path, newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["coin", "fundingRate", "premium", "time"]
+    for row, (time, rate, premium) in zip(rows[1:], records):
+        assert row[0] == "BTC" and int(row[3]) == time and float(row[1]) == rate
+        assert (row[2] == "") if math.isnan(premium) else (float(row[2]) == premium)
+
+    with open(bin_path, "rb") as f:
+        magic, version, record_size, coin = HEADER.unpack(f.read(HEADER.size))
+    assert (magic, version, record_size, coin) == (MAGIC, VERSION, 24, b"BTC".ljust(12, b"\0"))
+    fund = FundingFile(str(bin_path))
+    try:
+        assert fund.coin == "BTC" and len(fund) == 10
+        assert list(fund.times) == [r[0] for r in records]
+        assert list(fund.rates) == [r[1] for r in records]
+        assert [math.isnan(p) for p in fund.premiums] == [math.isnan(r[2]) for r in records]
+    finally:
+        fund.close()
+
+
+@pytest.mark.parametrize("header", [
+    b"",
+    b"NOTFUNDS" + bytes(16),
+    HEADER.pack(MAGIC, VERSION + 1, 24, b"BTC"),
+    HEADER.pack(MAGIC, VERSION, 16, b"BTC"),
+])
+def test_bad_header_rejected(tmp_path, header):
+    path = tmp_path / "bad.fund"
+    path.write_bytes(header + struct.pack("<qdd", 0, 0.0, 0.0))
+    with pytest.raises(ValueError):
+        FundingFile(str(path))
+
+
+def test_coin_name_too_long(tmp_path):
+    with pytest.raises(ValueError):
+        export(iter(()), "A" * 13, bin_path=str(tmp_path / "x.fund"))
+
+
+def test_series_over_memoryviews_matches_arrays(tmp_path):
+    records = [(h * HOUR_MS, math.sin(h) / 1e4, math.nan) for h in range(24 * 40)]
+    path = tmp_path / "ETH.fund"
+    export(iter(records), "ETH", bin_path=str(path))
+    fund = FundingFile(str(path))
+    try:
+        assert isinstance(fund.times, memoryview)
+        mapped = FundingSeries(fund.times, fund.rates)
+        copied = FundingSeries([r[0] for r in records], [r[1] for r in records])
+        end = records[-1][0]
+        for seconds in (8 * 3600, 86400, 7 * 86400, 30 * 86400, 90 * 86400):
+            assert mapped.last(seconds, end) == pytest.approx(copied.last(seconds, end), nan_ok=True)
+        assert mapped.window(5 * HOUR_MS, 17 * HOUR_MS) == pytest.approx(copied.window(5 * HOUR_MS, 17 * HOUR_MS))
+        del mapped
+    finally:
+        fund.close()
@@ -0,0 +1,35 @@
+from funding_client import AssetContext
+from funding_stats import rank_contexts
+
+NAN = float("nan")
+
+CONTEXTS = [
+    AssetContext("BTC", 0.00002, 100_000.0, 2e9, 3e9, 0.0),
+    AssetContext("HYPE", 0.00010, 40.0, 5e8, 4e8, 0.0),
+    AssetContext("PENGU", -0.00030, 0.02, 3e7, 8e7, 0.0),
+    AssetContext("TINY", 0.00050, 1.0, 1e5, 2e5, 0.0),
+    AssetContext("NEW", NAN, 1.0, 1e9, 1e9, 0.0),
+]
+
+
+def coins(ranked):
+    return [c.coin for c in ranked]
+
+
+def test_highest_funding_first_without_nan():
+    assert coins(rank_contexts(CONTEXTS)) == ["TINY", "HYPE", "BTC", "PENGU"]
+
+
+def test_ascending():
+    assert coins(rank_contexts(CONTEXTS, ascending=True)) == ["PENGU", "BTC", "HYPE", "TINY"]
+
+
+def test_min_open_interest_and_volume():
+    assert coins(rank_contexts(CONTEXTS, min_open_interest=1e6)) == ["HYPE", "BTC", "PENGU"]
+    assert coins(rank_contexts(CONTEXTS, min_volume=1e8)) == ["HYPE", "BTC"]
+    assert coins(rank_contexts(CONTEXTS, min_open_interest=1e9, min_volume=1e9)) == ["BTC"]
+
+
+def test_top():
+    assert coins(rank_contexts(CONTEXTS, top=2)) == ["TINY", "HYPE"]
+    assert coins(rank_contexts(CONTEXTS, top=2, ascending=True)) == ["PENGU", "BTC"]
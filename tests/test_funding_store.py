@@ -0,0 +1,77 @@
+import math
+
+import pytest
+
+from funding_store import FundingStore
+
+HOUR_MS = 3_600_000
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = FundingStore(str(tmp_path / "funding.db"))
+    yield store
+    store.close()
+
+
+def rows(coin, hours):
+    return [{"coin": coin, "time": h * HOUR_MS, "fundingRate": str(h / 1e6), "premium": None} for h in hours]
+
+
+def test_missing_without_coverage_is_the_whole_range(store):
+    assert store.coverage("BTC") is None
+    assert store.missing("BTC", 0, 10) == [(0, 10)]
+
+
+def test_missing_reaches_up_to_the_stored_span(store):
+    store.covered("BTC", 100, 200)
+    assert store.missing("BTC", 120, 180) == []
+    assert store.missing("BTC", 50, 180) == [(50, 99)]
+    assert store.missing("BTC", 120, 250) == [(201, 250)]
+    # A later range far past the span still asks for everything in between.
+    assert store.missing("BTC", 500, 600) == [(201, 600)]
+    assert store.missing("BTC", 0, 300) == [(0, 99), (201, 300)]
+
+
+def test_covered_merges_adjacent_pieces(store):
+    store.covered("BTC", 100, 200)
+    store.covered("BTC", 201, 300)
+    store.covered("BTC", 50, 99)
+    assert store.coverage("BTC") == (50, 300)
+    store.covered("BTC", 120, 150)  # already inside
+    assert store.coverage("BTC") == (50, 300)
+
+
+def test_covered_ignores_detached_pieces(store):
+    # The piece before it failed: keep the span as is, so missing() asks for the hole again.
+    store.covered("BTC", 100, 200)
+    store.covered("BTC", 400, 500)
+    assert store.coverage("BTC") == (100, 200)
+    assert store.missing("BTC", 100, 500) == [(201, 500)]
+
+
+def test_records_round_trip(store):
+    store.add(rows("BTC", range(5)))
+    store.add(rows("BTC", [2, 3]))  # stored twice: harmless
+    store.add(rows("ETH", [1]))
+    store.covered("BTC", 0, 5 * HOUR_MS)
+    store.commit()
+    times, rates = store.columns("BTC", HOUR_MS, 3 * HOUR_MS)
+    assert list(times) == [HOUR_MS, 2 * HOUR_MS, 3 * HOUR_MS]
+    assert list(rates) == [1e-6, 2e-6, 3e-6]
+    (time, rate, premium), = store.records("BTC", 0, 0)
+    assert (time, rate) == (0, 0.0) and math.isnan(premium)
+    assert store.coins() == ["BTC"]
+
+
+def test_add_skips_and_counts_invalid_rows(store):
+    good = rows("BTC", [0, 2])
+    bad = [{"coin": "BTC", "time": HOUR_MS, "fundingRate": "n/a"},
+           {"coin": "BTC", "time": 3 * HOUR_MS, "fundingRate": None},
+           {"coin": "ETH", "time": 0},
+           {"coin": "ETH", "time": HOUR_MS, "fundingRate": "0.1", "premium": "?"}]
+    store.add(good[:1] + bad + good[1:])
+    assert store.invalid == {"BTC": 2, "ETH": 2}
+    times, _ = store.columns("BTC", 0, 10 * HOUR_MS)
+    assert list(times) == [0, 2 * HOUR_MS]
+    assert list(store.columns("ETH", 0, 10 * HOUR_MS)[0]) == []
@@ -0,0 +1,58 @@
+from funding_client import FUNDING_INTERVAL_MS
+from funding_stats import FundingSeries
+from get_funding import main, print_funding_rates
+from time_windows import parse_windows
+
+HOUR_MS = FUNDING_INTERVAL_MS
+END_MS = 1_000 * HOUR_MS
+
+
+def _series(hours):
+    times = [END_MS - k * HOUR_MS for k in range(hours - 1, -1, -1)]
+    return FundingSeries(times, [0.0001] * hours)
+
+
+def _summary(capsys, **kwargs):
+    print_funding_rates("BTC", **kwargs)
+    return [line for line in capsys.readouterr().out.splitlines() if line.startswith("Last")]
+
+
+def test_windows_within_covered_history_are_plain(capsys):
+    lines = _summary(capsys, series=_series(30 * 24), windows=parse_windows("8h,30d"), end_ms=END_MS,
+                     start_ms=END_MS - 10 * HOUR_MS, covered_from=END_MS - 30 * 24 * HOUR_MS + 1)
+    assert "( 720 records)" in lines[1] and "covers" not in lines[1]
+
+
+def test_windows_past_covered_history_are_labelled(capsys):
+    lines = _summary(capsys, series=_series(10), windows=parse_windows("8h,30d"), end_ms=END_MS,
+                     start_ms=END_MS - 10 * HOUR_MS, covered_from=END_MS - 10 * HOUR_MS)
+    assert "covers" not in lines[0]
+    assert "(covers 10h,   10 records)" in lines[1]
+
+
+def test_table_lists_only_the_requested_period(capsys):
+    print_funding_rates("BTC", _series(48), parse_windows("8h"), END_MS, start_ms=END_MS - 10 * HOUR_MS + 1)
+    rows = [line for line in capsys.readouterr().out.splitlines() if "UTC+9" in line]
+    assert len(rows) == 10
+
+
+def test_default_period_is_52_hours(info_api, capsys):
+    _, url = info_api
+    main(["BTC", "--no-db", "--api-url", url])
+    out = capsys.readouterr().out
+    rows = [line for line in out.splitlines() if "UTC+9" in line]
+    assert 51 <= len(rows) <= 52
+    # The longer windows say how much of them the 52 hours cover.
+    assert "Last 30d  (covers 2d 4h," in out
+
+
+def test_screen_drills_into_the_top_coins(info_api, capsys):
+    standin, url = info_api
+    main(["--screen", "--drill", "2", "--no-db", "--api-url", url])
+    out = capsys.readouterr().out
+    assert "2 coin(s) from" in out and "Fetched 2 coin(s)" in out
+    assert standin.requests == 3  # metaAndAssetCtxs, then one fundingHistory per drilled coin
+
+    main(["--screen", "--drill", "0", "--no-db", "--api-url", url])
+    assert "coin(s) from" not in capsys.readouterr().out
+    assert standin.requests == 4
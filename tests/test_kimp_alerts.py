@@ -0,0 +1,157 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bench"))
+
+from kimp_alerts import AlertPipeline, FileSink, MemorySink, QueueSink, TelegramSink
+from telegram_standin import TelegramStandIn
+
+
+async def deliver(sink, msgs, standin=None, settle=5.0):
+    """Run the sink, offer msgs, and wait until each has been sent or has failed."""
+    task = asyncio.create_task(sink.run())
+    for msg in msgs:
+        sink.offer(msg)
+    deadline = asyncio.get_running_loop().time() + settle
+    while sink.sent + sink.failed < len(msgs) and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.01)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+def run_with_standin(standin, sink_kwargs, msgs, token="TEST"):
+    async def main():
+        api_base = await standin.start()
+        sink = TelegramSink(token, "@chat", api_base=api_base, **sink_kwargs)
+        try:
+            await deliver(sink, msgs)
+        finally:
+            await standin.stop()
+        return sink
+
+    return asyncio.run(main())
+
+
+def test_queue_sink_is_abstract():
+    with pytest.raises(TypeError):
+        QueueSink()
+
+
+def test_telegram_delivers_messages():
+    standin = TelegramStandIn()
+    sink = run_with_standin(standin, {}, ["a", "b", "c"])
+    assert sink.sent == 3 and sink.failed == 0
+    assert sorted(standin.messages) == [("@chat", "a"), ("@chat", "b"), ("@chat", "c")]
+
+
+def test_telegram_429_waits_retry_after_and_resends():
+    standin = TelegramStandIn(retry_after=0.2, script=[429])
+    sink = run_with_standin(standin, {"concurrency": 1}, ["over"])
+    assert sink.sent == 1 and sink.failed == 0 and sink.rate_limited == 1
+    assert standin.statuses == [429, 200]
+    assert standin.messages == [("@chat", "over")]
+    assert standin.times[1] - standin.times[0] >= 0.2
+
+
+def test_telegram_gives_up_when_still_rate_limited(capsys):
+    standin = TelegramStandIn(retry_after=0.05, script=[429, 429, 429])
+    sink = run_with_standin(standin, {"concurrency": 1, "retries": 2}, ["over"])
+    assert sink.sent == 0 and sink.failed == 1
+    assert standin.statuses == [429, 429, 429]
+    assert "still rate limited after 3 attempts" in capsys.readouterr().out
+
+
+def test_telegram_error_status_is_not_retried(capsys):
+    standin = TelegramStandIn(script=[500])
+    sink = run_with_standin(standin, {"concurrency": 1}, ["boom", "fine"])
+    assert sink.failed == 1 and sink.sent == 1
+    assert standin.statuses == [500, 200]
+    assert "Failed to send message: 500" in capsys.readouterr().out
+
+
+def test_telegram_wrong_token(capsys):
+    standin = TelegramStandIn(token="RIGHT")
+    sink = run_with_standin(standin, {}, ["x"], token="WRONG")
+    assert sink.failed == 1 and standin.messages == []
+    assert "Failed to send message: 401" in capsys.readouterr().out
+
+
+def test_telegram_unreachable(capsys):
+    async def main():
+        sink = TelegramSink("TEST", "@chat", api_base="http://127.0.0.1:1", timeout=2.0)
+        await deliver(sink, ["x"])
+        return sink
+
+    sink = asyncio.run(main())
+    assert sink.failed == 1
+    assert "Telegram error" in capsys.readouterr().out
+
+
+def test_pipeline_cooldown_and_escalation():
+    sink = MemorySink()
+    pipeline = AlertPipeline([sink], cooldown=60.0, escalate=0.5)
+    assert pipeline.admit("btc", 4.0, now=0.0)
+    pipeline.publish("first")
+    assert not pipeline.admit("btc", 4.2, now=10.0)  # within cooldown, not far enough
+    assert pipeline.admit("btc", 4.6, now=20.0)  # escalated by 0.5
+    assert pipeline.admit("btc", 4.0, now=100.0)  # cooldown over
+
+
+def test_file_sink_writes_in_batches(tmp_path):
+    path = tmp_path / "alerts.txt"
+    sink = FileSink(str(path), flush_interval=0.1)
+    writes = []
+    write = sink._write
+    sink._write = lambda text: (writes.append(text), write(text))
+
+    async def main():
+        task = asyncio.create_task(sink.run())
+        for n in range(5):
+            sink.offer(f"alert {n}")
+        await asyncio.sleep(0.25)
+        assert writes == ["alert 0\nalert 1\nalert 2\nalert 3\nalert 4\n"]  # one write for the batch
+        sink.offer("late")
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(main())
+    assert len(writes) == 2 and writes[1] == "late\n"  # flushed on shutdown
+    assert path.read_text().splitlines() == [f"alert {n}" for n in range(5)] + ["late"]
+    assert sink.sent == 6 and sink._file is None
+
+
+def test_full_queue_drops_the_oldest():
+    async def main():
+        sink = FileSink("unused.txt", maxsize=3)
+        for n in range(5):
+            sink.offer(n)
+        return sink
+
+    sink = asyncio.run(main())
+    assert sink.dropped == 2
+    assert sink.drain() == [2, 3, 4]
+    pipeline = AlertPipeline([sink])
+    assert pipeline.stats()["file_dropped"] == 2
+
+
+def test_publish_reaches_every_sink_without_blocking():
+    async def main():
+        slow = FileSink("unused.txt", maxsize=1)
+        memory = MemorySink()
+        pipeline = AlertPipeline([slow, memory])
+        for n in range(3):
+            pipeline.publish(f"m{n}")
+        return slow, memory
+
+    slow, memory = asyncio.run(main())
+    assert memory.alerts == ["m0", "m1", "m2"]
+    assert slow.drain() == ["m2"] and slow.dropped == 2
@@ -0,0 +1,119 @@
+import math
+
+import pytest
+
+from kimp_book import BookSide, DiffDepthSync, OrderBook, executable_rates
+from kimp_monitor import scaled
+
+
+def synced(snapshot_id=100, bids=((10.0, 1.0),), asks=((11.0, 1.0),)):
+    sync = DiffDepthSync(OrderBook())
+    sync.on_snapshot(snapshot_id, list(bids), list(asks), 0.0)
+    return sync
+
+
+def test_events_buffered_until_snapshot_then_replayed():
+    sync = DiffDepthSync(OrderBook())
+    assert sync.needs_snapshot()
+    assert not sync.on_event(95, 99, 94, [(10.0, 5.0)], [], 1.0)  # older than the snapshot
+    assert not sync.on_event(100, 103, 99, [(9.0, 2.0)], [], 1.0)  # spans lastUpdateId 101
+    assert not sync.on_event(104, 106, 103, [], [(11.5, 3.0)], 1.0)
+    assert len(sync.book.bids) == 0  # nothing applied before the snapshot
+    sync.snapshot_pending = True
+    assert not sync.needs_snapshot()
+    sync.on_snapshot(101, [(10.0, 1.0)], [(11.0, 1.0)], 2.0)
+    assert not sync.needs_snapshot() and sync.last_u == 106
+    assert list(zip(sync.book.bids.keys, sync.book.bids.sizes)) == [(-10.0, 1.0), (-9.0, 2.0)]
+    assert sync.book.asks.sizes == [1.0, 3.0]
+    # Live events continue from the replayed ones.
+    assert sync.on_event(107, 108, 106, [(10.0, 4.0)], [], 3.0)
+    assert sync.book.bids.sizes[0] == 4.0 and sync.book.time == 3.0
+
+
+def test_stale_events_dropped():
+    sync = synced(100)
+    assert not sync.on_event(90, 99, 89, [(10.0, 9.0)], [], 1.0)
+    assert sync.book.bids.sizes == [1.0] and sync.last_u is None
+    assert sync.resyncs == 0
+
+
+def test_first_event_after_snapshot_resets():
+    sync = synced(100)
+    assert not sync.on_event(105, 110, 104, [(10.0, 9.0)], [], 1.0)
+    assert sync.resyncs == 1 and sync.needs_snapshot()
+    assert len(sync.book.bids) == len(sync.book.asks) == 0
+    assert sync.book.time == -math.inf
+
+
+def test_pu_gap_resets():
+    sync = synced(100)
+    assert sync.on_event(99, 102, 98, [], [], 1.0)
+    assert not sync.on_event(105, 106, 104, [(10.0, 9.0)], [], 1.0)  # pu should be 102
+    assert sync.resyncs == 1 and sync.needs_snapshot()
+    assert len(sync.book.bids) == 0
+
+
+def test_gap_inside_replayed_buffer():
+    sync = DiffDepthSync(OrderBook())
+    sync.on_event(99, 102, 98, [(9.0, 1.0)], [], 1.0)
+    sync.on_event(110, 112, 108, [(8.0, 1.0)], [], 1.0)  # pu 108 != 102
+    sync.on_event(113, 115, 112, [(7.0, 1.0)], [], 1.0)
+    sync.snapshot_pending = True
+    sync.on_snapshot(100, [(10.0, 1.0)], [(11.0, 1.0)], 2.0)
+    assert sync.needs_snapshot() and sync.resyncs == 1
+    assert len(sync.book.bids) == 0 and sync.buffer == []
+    # The next snapshot starts over cleanly.
+    sync.on_snapshot(200, [(10.0, 1.0)], [(11.0, 1.0)], 3.0)
+    assert sync.on_event(199, 201, 198, [], [], 4.0)
+
+
+def test_set_inserts_updates_and_deletes():
+    side = BookSide(bids=True)
+    side.replace([(10.0, 1.0), (9.0, 2.0)])
+    side.set(9.5, 3.0)
+    side.set(10.0, 4.0)
+    assert [(-k, s) for k, s in zip(side.keys, side.sizes)] == [(10.0, 4.0), (9.5, 3.0), (9.0, 2.0)]
+    side.set(9.5, 0.0)
+    side.set(8.0, 0.0)  # deleting a missing level is a no-op
+    assert side.keys == [-10.0, -9.0] and side.best() == 10.0
+    asks = BookSide(bids=False)
+    asks.set(12.0, 1.0)
+    asks.set(11.0, 1.0)
+    assert asks.best() == 11.0
+
+
+def test_walks_across_levels():
+    asks = BookSide(bids=False)
+    asks.replace([(100.0, 1.0), (101.0, 2.0), (102.0, 5.0)])
+    # 100 + 202 = 302 for the first three units, then 0.5 at 102.
+    assert asks.cost_of(3.5) == pytest.approx(100.0 + 202.0 + 51.0)
+    assert asks.qty_for(100.0 + 202.0 + 51.0) == pytest.approx(3.5)
+    assert asks.qty_for(50.0) == pytest.approx(0.5)
+    assert asks.cost_of(8.5) is None
+    assert asks.qty_for(1e6) is None
+    assert BookSide(bids=True).qty_for(1.0) is None
+
+
+def test_executable_rates():
+    krw, usdt = OrderBook(), OrderBook()
+    krw.replace([(1400.0, 1.0), (1390.0, 10.0)], [(1410.0, 1.0), (1420.0, 10.0)], 0.0)
+    usdt.replace([(0.99, 100.0)], [(1.01, 100.0)], 0.0)
+    # Over: sell 2790 KRW into the bids (1 at 1400, 1 at 1390), buy 2 at 1.01.
+    over, _ = executable_rates(krw, usdt, 2790.0)
+    assert over == pytest.approx(2790.0 / (2 * 1.01))
+    # Reverse: buy 2830 KRW from the asks (1 at 1410, 1 at 1420), sell 2 at 0.99.
+    _, reverse = executable_rates(krw, usdt, 2830.0)
+    assert reverse == pytest.approx(2830.0 / (2 * 0.99))
+    over, reverse = executable_rates(krw, usdt, 1e9)
+    assert math.isnan(over) and math.isnan(reverse)
+
+
+def test_scaled_depth_prices_per_coin():
+    # kPEPE / 1000PEPE quote 1000 coins per contract.
+    assert scaled([(0.012, 50.0)], 1000) == [(0.012 / 1000, 50_000.0)]
+    krw, usdt = OrderBook(), OrderBook()
+    krw.replace([(0.0168, 1e9)], [(0.0170, 1e9)], 0.0)  # KRW per PEPE
+    usdt.replace(scaled([(0.0119, 1e6)], 1000), scaled([(0.0121, 1e6)], 1000), 0.0)  # USDT per kPEPE
+    over, reverse = executable_rates(krw, usdt, 1_000_000.0)
+    assert over == pytest.approx(0.0168 / 0.0121 * 1000)
+    assert reverse == pytest.approx(0.0170 / 0.0119 * 1000)
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from kimp_decode import FIND_LIMIT, AllMidsDecoder, decode_binance, decode_upbit
+
+
+def compact(obj):
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def allmids(mids):
+    return compact({"channel": "allMids", "data": {"mids": mids}})
+
+
+def test_allmids_same_result_below_and_above_find_limit():
+    mids = {f"C{n:03d}": f"{n + 0.5}" for n in range(FIND_LIMIT * 2)}
+    mids.update({"@1": "1.0", "kPEPE": "0.0123"})
+    message = allmids(mids)
+    for count in (3, FIND_LIMIT, FIND_LIMIT + 1, FIND_LIMIT * 2):
+        coins = {f"C{n:03d}": n for n in range(0, count * 2, 2) if f"C{n:03d}" in mids}
+        coins["kPEPE"] = "pepe"
+        decoded = AllMidsDecoder(coins).decode(message)
+        assert sorted(decoded, key=str) == sorted(((key, float(mids[coin])) for coin, key in coins.items()), key=str)
+
+
+@pytest.mark.parametrize("extra", [0, FIND_LIMIT])
+def test_allmids_coin_prefix_of_another_is_not_matched(extra):
+    coins = {"ETH": 0, "OP": 1, **{f"X{n}": 2 + n for n in range(extra)}}
+    # ETHFI and OPN come first; only whole names may match.
+    message = allmids({"ETHFI": "1.5", "OPN": "7", "XETH": "9", "ETH": "3000", "@ETH": "2"})
+    assert AllMidsDecoder(coins).decode(message) == [(0, 3000.0)]
+
+
+def test_allmids_other_messages_return_none():
+    decoder = AllMidsDecoder({"BTC": 0})
+    assert decoder.decode(compact({"channel": "subscriptionResponse", "data": {}})) is None
+    assert decoder.decode(allmids({"BTC": "1"}).encode()) == [(0, 1.0)]
+
+
+def test_upbit_timestamp_is_not_trade_timestamp():
+    frame = compact({"type": "ticker", "code": "KRW-BTC", "trade_price": 1.5e8,
+                     "trade_timestamp": 111, "timestamp": 222}).encode()
+    assert decode_upbit(frame) == ("KRW-BTC", 1.5e8, 222)
+    only_trade = compact({"type": "ticker", "code": "KRW-BTC", "trade_price": 10, "trade_timestamp": 111})
+    assert decode_upbit(only_trade) == ("KRW-BTC", 10.0, 0)
+
+
+def test_upbit_prices_other_than_trade_price_ignored():
+    frame = compact({"code": "KRW-PEPE", "prev_closing_price": 1.0, "opening_price": 2.0,
+                     "trade_price": 1.23e-5, "timestamp": 5})
+    assert decode_upbit(frame) == ("KRW-PEPE", 1.23e-5, 5)
+
+
+def test_binance_c_is_not_capital_c():
+    message = compact({"stream": "btcusdt@ticker", "data": {
+        "e": "24hrTicker", "C": 1700000000999, "E": 1700000000123, "c": "65000.10", "O": 1}})
+    assert decode_binance(message) == ("btcusdt@ticker", 65000.10, 1700000000123)
+
+
+@pytest.mark.parametrize("decoder, frame", [
+    (decode_upbit, compact({"type": "orderbook", "code": "KRW-BTC", "orderbook_units": []})),
+    (decode_upbit, compact({"status": "UP"})),
+    (decode_binance, compact({"result": None, "id": 1})),
+    (decode_binance, compact({"stream": "btcusdt@depth", "data": {"e": "depthUpdate", "b": [], "a": []}})),
+])
+def test_non_ticker_frames_fall_back_to_full_parse(decoder, frame):
+    assert decoder(frame) is None
+
+
+def test_fallback_still_reads_reformatted_tickers():
+    spaced = json.dumps({"code": "KRW-ETH", "trade_price": 5e6, "timestamp": 9})
+    assert decode_upbit(spaced) == ("KRW-ETH", 5e6, 9)
+    spaced = json.dumps({"stream": "ethusdt@ticker", "data": {"c": "3500.5", "E": 7}})
+    assert decode_binance(spaced) == ("ethusdt@ticker", 3500.5, 7)
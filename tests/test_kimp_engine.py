@@ -0,0 +1,50 @@
+import math
+
+from kimp_engine import PremiumEngine
+
+
+def engine(max_age=10.0):
+    return PremiumEngine(["btc", "eth", "xrp"], max_age=max_age)
+
+
+def test_pair_tick_recomputes_only_its_slot():
+    e = engine()
+    e.update_usdt_krw(1400.0, 0.0)
+    e.update_usdt(0, 100.0, 0.0)
+    assert math.isnan(e.diff[0])  # KRW leg missing
+    assert e.update_krw(0, 145_000.0, 0.0) == 50.0
+    assert e.kimp[0] == 1450.0 and e.diff[0] == 50.0
+    assert all(math.isnan(e.diff[i]) for i in (1, 2))
+    e.update_krw(1, 2_800.0, 1.0)
+    e.update_usdt(1, 2.0, 1.0)
+    assert e.diff[1] == 0.0 and e.diff[0] == 50.0
+
+
+def test_usdt_krw_tick_revalues_every_pair_in_place():
+    e = engine()
+    for i, (krw, usdt) in enumerate([(145_000.0, 100.0), (2_840.0, 2.0)]):
+        e.update_krw(i, krw, 0.0)
+        e.update_usdt(i, usdt, 0.0)
+    diff = e.diff
+    e.update_usdt_krw(1380.0, 1.0)
+    assert e.diff is diff  # no new array per tick
+    assert list(e.diff[:2]) == [70.0, 40.0] and math.isnan(e.diff[2])
+    e.update_usdt_krw(1460.0, 2.0)
+    assert list(e.diff[:2]) == [-10.0, -40.0]
+    assert list(e.kimp[:2]) == [1450.0, 1420.0]
+
+
+def test_stale_legs_are_not_fresh():
+    e = engine(max_age=10.0)
+    e.update_usdt_krw(1400.0, 0.0)
+    e.update_krw(0, 145_000.0, 0.0)
+    e.update_usdt(0, 100.0, 5.0)
+    e.update_krw(1, 2_840.0, 5.0)  # no USDT leg
+    assert e.ready(9.0) == [0]
+    assert e.age(0, 9.0) == 9.0
+    assert not e.fresh(0, 10.5)  # the KRW and USDT/KRW legs are 10.5s old
+    e.update_krw(0, 145_000.0, 10.0)
+    assert not e.fresh(0, 10.5)  # USDT/KRW still old
+    e.update_usdt_krw(1400.0, 10.0)
+    assert e.ready(10.5) == [0]
+    assert not e.fresh(1, 10.5)
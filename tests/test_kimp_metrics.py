@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+import kimp_monitor
+from kimp_metrics import DECODE, PREMIUM, Histogram, LatencyMetrics
+from kimp_symbols import load_config
+
+
+def test_negative_values_are_clamped_to_zero():
+    hist = Histogram()
+    for ns in (-1, -5, -5_000_000, -(1 << 40)):  # exchange clock ahead of ours
+        hist.record(ns)
+    assert hist.counts[0] == 4
+    assert hist.count == 4
+    assert hist.max == 0
+
+
+def test_small_values_have_their_own_buckets():
+    hist = Histogram()
+    for ns in range(8):
+        hist.record(ns)
+    assert hist.counts[:8] == [1] * 8
+
+
+def test_bucket_midpoint_within_12_percent():
+    for ns in (9, 100, 12_345, 5_000_000, 987_654_321):
+        hist = Histogram()
+        hist.record(ns)
+        assert abs(hist.max - ns) / ns <= 0.125
+
+
+def test_quantile():
+    hist = Histogram()
+    for ns in [1_000] * 90 + [1_000_000] * 10:
+        hist.record(ns)
+    assert abs(hist.quantile(0.5) - 1_000) / 1_000 <= 0.125
+    assert abs(hist.quantile(0.99) - 1_000_000) / 1_000_000 <= 0.125
+
+
+@pytest.fixture
+def monitor(monkeypatch):
+    """kimp_monitor set up for the default symbols, with metrics on and nothing printed."""
+    monkeypatch.setattr(kimp_monitor, "QUIET", True)
+    monkeypatch.setattr(kimp_monitor, "metrics", LatencyMetrics(["Upbit", "Binance", "Hyperliquid"]))
+    for name in ("registry", "engine", "binance_streams", "upbit_codes", "hyperliquid_mids"):
+        monkeypatch.setattr(kimp_monitor, name, None)
+    kimp_monitor.setup(load_config())
+    return kimp_monitor
+
+
+@pytest.mark.parametrize("separators", [(",", ":"), (", ", ": ")])  # fast path, full-parse fallback
+def test_allmids_records_one_premium_stage_per_message(monitor, separators):
+    mids = {"BTC": "100000.5", "ETH": "3000.1", "SOL": "150", "@1": "1.2"}
+    message = json.dumps({"channel": "allMids", "data": {"mids": mids}}, separators=separators)
+    monitor.handle_hyperliquid(message, 1.0)
+    monitor.handle_hyperliquid(message, 2.0)
+    hist = monitor.metrics.histograms["Hyperliquid"]
+    assert hist[DECODE].count == 2
+    assert hist[PREMIUM].count == 2  # not one per coin
+    engine = monitor.engine
+    assert engine.usdt[engine.tickers.index("eth")] == 3000.1
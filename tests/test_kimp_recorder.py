@@ -0,0 +1,92 @@
+import os
+from datetime import datetime, timezone
+
+import kimp_recorder
+from kimp_recorder import (DAY_NS, HEADER, LEG_KRW, LEG_USDT, LEG_USDT_KRW, RECORD, SOURCE_BINANCE, SOURCE_UPBIT,
+                           TickRecorder, iter_ticks)
+
+DAY0_NS = int(datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp()) * 10**9
+
+
+def recorder(directory, tickers):
+    rec = TickRecorder(str(directory), tickers)
+    rec._offset_ns = DAY0_NS  # monotonic "now" 0 is midnight UTC, 2025-01-01
+    return rec
+
+
+def read(directory, day="20250101"):
+    tickers, records = iter_ticks(os.path.join(str(directory), f"{day}.ticks"))
+    return tickers, [(tickers[symbol_id] if leg != LEG_USDT_KRW else None, leg, source, price, exchange_ms, recv_ns)
+                     for exchange_ms, recv_ns, symbol_id, leg, source, price in records]
+
+
+def test_round_trip(tmp_path):
+    rec = recorder(tmp_path, ["btc", "eth"])
+    rec.record(LEG_USDT_KRW, SOURCE_UPBIT, 0, 1400.0, 111, 1.0)
+    rec.record(LEG_KRW, SOURCE_UPBIT, 1, 5e6, 222, 2.0)
+    rec.record(LEG_USDT, SOURCE_BINANCE, 0, 1e5, 0, 3.5)
+    rec.close()
+    tickers, ticks = read(tmp_path)
+    assert tickers == ["btc", "eth"]
+    assert ticks == [(None, LEG_USDT_KRW, SOURCE_UPBIT, 1400.0, 111, DAY0_NS + 10**9),
+                     ("eth", LEG_KRW, SOURCE_UPBIT, 5e6, 222, DAY0_NS + 2 * 10**9),
+                     ("btc", LEG_USDT, SOURCE_BINANCE, 1e5, 0, DAY0_NS + 35 * 10**8)]
+    # close() trims the preallocated space.
+    assert os.path.getsize(tmp_path / "20250101.ticks") == HEADER.size + 3 * RECORD.size
+
+
+def test_reopen_appends_and_extends_the_symbol_table(tmp_path):
+    rec = recorder(tmp_path, ["btc", "eth"])
+    rec.record(LEG_KRW, SOURCE_UPBIT, 0, 1.0, 0, 1.0)
+    rec.close()
+    rec = recorder(tmp_path, ["xrp", "btc"])  # restarted with another universe
+    rec.record(LEG_KRW, SOURCE_UPBIT, 0, 2.0, 0, 2.0)
+    rec.record(LEG_KRW, SOURCE_UPBIT, 1, 3.0, 0, 3.0)
+    rec.close()
+    tickers, ticks = read(tmp_path)
+    assert tickers == ["btc", "eth", "xrp"]
+    assert [(ticker, price) for ticker, _, _, price, _, _ in ticks] == [("btc", 1.0), ("xrp", 2.0), ("btc", 3.0)]
+
+
+def test_new_day_gets_its_own_file_and_table(tmp_path):
+    rec = recorder(tmp_path, ["btc", "eth"])
+    rec.record(LEG_KRW, SOURCE_UPBIT, 1, 1.0, 0, 10.0)
+    rec.record(LEG_KRW, SOURCE_UPBIT, 1, 2.0, 0, DAY_NS / 1e9 + 10.0)
+    rec.close()
+    rec = recorder(tmp_path, ["eth"])
+    rec.record(LEG_KRW, SOURCE_UPBIT, 0, 3.0, 0, DAY_NS / 1e9 + 20.0)
+    rec.close()
+    assert read(tmp_path)[1][0][:4] == ("eth", LEG_KRW, SOURCE_UPBIT, 1.0)
+    tickers, ticks = read(tmp_path, "20250102")
+    assert tickers == ["btc", "eth"]
+    assert [(ticker, price) for ticker, _, _, price, _, _ in ticks] == [("eth", 2.0), ("eth", 3.0)]
+
+
+def test_grows_past_the_preallocated_records(tmp_path, monkeypatch):
+    monkeypatch.setattr(kimp_recorder, "GROW_RECORDS", 4)
+    rec = recorder(tmp_path, ["btc"])
+    for n in range(11):
+        rec.record(LEG_KRW, SOURCE_UPBIT, 0, float(n), n, 1.0 + n)
+    assert rec._capacity == 12
+    rec.close()
+    _, ticks = read(tmp_path)
+    assert [price for _, _, _, price, _, _ in ticks] == [float(n) for n in range(11)]
+
+
+def test_unclosed_file_is_bounded_by_the_header_count(tmp_path, monkeypatch):
+    monkeypatch.setattr(kimp_recorder, "GROW_RECORDS", 64)
+    rec = recorder(tmp_path, ["btc"])
+    for n in range(5):
+        rec.record(LEG_KRW, SOURCE_UPBIT, 0, float(n + 1), 0, 1.0)
+    rec.flush()  # a crash here leaves the file at its preallocated size
+    assert os.path.getsize(tmp_path / "20250101.ticks") == HEADER.size + 64 * RECORD.size
+    _, ticks = read(tmp_path)
+    assert [price for _, _, _, price, _, _ in ticks] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    # A new recorder picks up after the last complete record.
+    rec2 = recorder(tmp_path, ["btc"])
+    rec2.record(LEG_KRW, SOURCE_UPBIT, 0, 6.0, 0, 2.0)
+    rec2.close()
+    rec._mm.close()
+    rec._file.close()
+    _, ticks = read(tmp_path)
+    assert [price for _, _, _, price, _, _ in ticks] == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
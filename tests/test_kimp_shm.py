@@ -0,0 +1,77 @@
+import pytest
+
+from kimp_shm import USDT_KRW_SLOT, PriceBook, krw_slot, usdt_slot
+
+
+@pytest.fixture
+def books():
+    """(owner, reader attached by name) over one segment of 3 pairs, 2 writers."""
+    owner = PriceBook(3, 2)
+    reader = PriceBook(3, 2, owner.name)
+    yield owner, reader
+    reader.close()
+    owner.close()
+
+
+def test_writes_show_up_once_in_another_attachment(books):
+    owner, reader = books
+    assert reader.updates() == []
+    owner.write(USDT_KRW_SLOT, 1400.0, 10.0, 123)
+    owner.write(krw_slot(1), 140_000_000.0, 10.5, 456)
+    owner.write(usdt_slot(1, 3), 99_000.0, 11.0)
+    assert reader.updates() == [(0, 1400.0, 10.0, 123), (2, 140_000_000.0, 10.5, 456), (5, 99_000.0, 11.0, 0)]
+    assert reader.updates() == []
+    # Conflated: only the latest value of a slot that changed twice.
+    owner.write(krw_slot(1), 1.0, 12.0)
+    owner.write(krw_slot(1), 2.0, 13.0)
+    assert reader.updates() == [(2, 2.0, 13.0, 0)]
+    assert reader.read(krw_slot(1)) == (2.0, 13.0, 0)
+
+
+def test_message_counters_are_shared(books):
+    owner, reader = books
+    reader.count_message(1)
+    reader.count_message(1)
+    assert owner.messages() == [0, 2]
+
+
+def test_slot_being_written_is_picked_up_on_the_next_poll(books):
+    owner, reader = books
+    owner.write(krw_slot(0), 1.0, 1.0)
+    reader.updates()
+    seqs = owner._seqs
+    seqs[krw_slot(0)] += 1  # odd: a writer is in the middle of it
+    owner.write(krw_slot(2), 3.0, 1.0)
+    assert reader.updates() == [(krw_slot(2), 3.0, 1.0, 0)]
+    assert reader.read(krw_slot(0)) is None
+    seqs[krw_slot(0)] += 1  # the writer finishes
+    assert reader.updates() == [(krw_slot(0), 1.0, 1.0, 0)]
+
+
+def test_slot_left_odd_by_a_killed_writer_recovers(books):
+    owner, reader = books
+    owner.write(usdt_slot(0, 3), 1.0, 1.0)
+    owner._seqs[usdt_slot(0, 3)] += 1  # killed between the two version stores
+    assert reader.updates() == []
+    # The restarted process writes the slot again.
+    owner.write(usdt_slot(0, 3), 2.0, 2.0)
+    assert owner._seqs[usdt_slot(0, 3)] % 2 == 0
+    assert reader.updates() == [(usdt_slot(0, 3), 2.0, 2.0, 0)]
+
+
+@pytest.mark.parametrize("pairs, writers", [(4, 2), (3, 1)])
+def test_attach_with_other_shape_raises(books, pairs, writers):
+    owner, _ = books
+    with pytest.raises(ValueError):
+        PriceBook(pairs, writers, owner.name)
+
+
+def test_close_unlinks_only_when_created():
+    owner = PriceBook(1, 1)
+    reader = PriceBook(1, 1, owner.name)
+    reader.close()
+    again = PriceBook(1, 1, owner.name)  # still there after the attachment closed
+    again.close()
+    owner.close()
+    with pytest.raises(FileNotFoundError):
+        PriceBook(1, 1, owner.name)
@@ -0,0 +1,62 @@
+import math
+
+from kimp_stats import RollingStats, RollingWindow
+from time_windows import parse_windows
+
+
+def test_mean_min_max_over_closed_slots():
+    window = RollingWindow(1, 60, slots=6)  # 10s slots
+    for t, diff in [(0, 1.0), (5, 3.0), (10, 2.0), (20, 4.0), (30, 0.5)]:
+        window.update(0, diff, t)
+    # Closed slots: 3.0 (last of 0-10s), 2.0, 4.0; open slot 0.5.
+    assert window.count(0) == 3
+    assert window.mean(0) == 3.0
+    assert window.min(0) == 0.5
+    assert window.max(0) == 4.0
+
+
+def test_old_slots_expire():
+    window = RollingWindow(1, 60, slots=6)
+    window.update(0, 10.0, 0)
+    for t in range(10, 80, 10):
+        window.update(0, 1.0, t)
+    assert window.max(0) == 1.0
+    assert window.mean(0) == 1.0
+
+
+def test_gap_longer_than_window_resets_pair():
+    window = RollingWindow(2, 60, slots=6)
+    for t in range(0, 50, 10):
+        window.update(0, 5.0, t)
+        window.update(1, 5.0, t)
+    # Pair 0 goes quiet for several windows; this used to raise IndexError
+    # and keep raising on every later tick.
+    window.update(0, 1.0, 500)
+    assert window.count(0) == 0
+    assert window.sum[0] == 0.0 and window.sumsq[0] == 0.0
+    assert math.isnan(window.mean(0))
+    assert window.min(0) == window.max(0) == 1.0
+    window.update(0, 2.0, 510)
+    window.update(0, 3.0, 520)
+    assert window.count(0) == 2
+    assert window.mean(0) == 1.5
+    assert window.min(0) == 1.0 and window.max(0) == 3.0
+    # The other pair is untouched.
+    assert window.count(1) == 4
+
+
+def test_gap_just_inside_window_keeps_closing_slot():
+    window = RollingWindow(1, 60, slots=6)
+    window.update(0, 2.0, 0)
+    window.update(0, 4.0, 55)  # closing slot 0 is still within the window ending at slot 5
+    assert window.count(0) == 1
+    assert window.mean(0) == 2.0
+
+
+def test_rolling_stats_survives_quiet_pair():
+    stats = RollingStats(1, parse_windows("1m,15m"))
+    stats.update(0, 1.0, 0)
+    stats.update(0, 2.0, 30)
+    stats.update(0, 3.0, 7200)
+    described = stats.describe(0, 3.0)
+    assert described["1m"][2] == 3.0
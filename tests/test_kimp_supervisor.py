@@ -0,0 +1,100 @@
+import asyncio
+
+import websockets
+
+from kimp_supervisor import FeedSupervisor, IdleTimer
+
+
+async def run_for(supervisor, seconds):
+    task = asyncio.create_task(supervisor.run())
+    await asyncio.sleep(seconds)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+async def serve(handler):
+    server = await websockets.serve(handler, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"ws://127.0.0.1:{port}"
+
+
+def test_quiet_feed_reconnects_with_idle_message(capsys):
+    async def quiet(ws):
+        await ws.send("hello")
+        await ws.wait_closed()  # then silence until the client gives up
+
+    async def main():
+        server, uri = await serve(quiet)
+        received = []
+        supervisor = FeedSupervisor("Test", uri, None, lambda m, t: received.append(m),
+                                    base_delay=0.01, max_delay=0.01, idle_timeout=0.2, open_timeout=1.0)
+        await run_for(supervisor, 0.7)
+        server.close()
+        await server.wait_closed()
+        return supervisor, received
+
+    supervisor, received = asyncio.run(main())
+    out = capsys.readouterr().out
+    assert "Test disconnected: no message for 0.2s" in out
+    assert "connect timed out" not in out
+    assert supervisor.connects >= 2
+    assert received[0] == "hello"
+
+
+def test_connect_timeout_is_not_reported_as_idle(capsys):
+    async def silent(reader, writer):
+        await asyncio.sleep(60)  # accept TCP, never answer the websocket handshake
+
+    async def main():
+        server = await asyncio.start_server(silent, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        supervisor = FeedSupervisor("Test", f"ws://127.0.0.1:{port}", None, lambda m, t: None,
+                                    base_delay=0.01, max_delay=0.01, idle_timeout=5.0, open_timeout=0.2)
+        await run_for(supervisor, 0.5)
+        server.close()
+        return supervisor
+
+    supervisor = asyncio.run(main())
+    out = capsys.readouterr().out
+    assert "Test disconnected: connect timed out after 0.2s" in out
+    assert "no message" not in out
+    assert supervisor.connects == 0
+
+
+def test_busy_feed_does_not_time_out(capsys):
+    async def busy(ws):
+        while True:
+            await ws.send("tick")
+            await asyncio.sleep(0.05)
+
+    async def main():
+        server, uri = await serve(busy)
+        supervisor = FeedSupervisor("Test", uri, ["sub"], lambda m, t: None, idle_timeout=0.2)
+        await run_for(supervisor, 0.8)
+        server.close()
+        await server.wait_closed()
+        return supervisor
+
+    supervisor = asyncio.run(main())
+    assert "disconnected" not in capsys.readouterr().out
+    assert supervisor.connects == 1 and supervisor.drops == 0
+    assert supervisor.messages >= 10
+
+
+def test_idle_timer_rearms_until_quiet():
+    async def main():
+        fired = []
+        timer = IdleTimer(0.1, lambda: fired.append(asyncio.get_running_loop().time()))
+        start = asyncio.get_running_loop().time()
+        for _ in range(4):
+            await asyncio.sleep(0.05)
+            timer.reset()
+        await asyncio.sleep(0.2)
+        return fired, start, timer.expired()
+
+    fired, start, expired = asyncio.run(main())
+    assert expired and len(fired) == 1
+    assert fired[0] - start >= 0.3
@@ -0,0 +1,43 @@
+from kimp_symbols import SymbolRegistry, binance_scale, chunks, hyperliquid_scale, load_config, usdt_market
+
+
+def test_hyperliquid_scale():
+    assert hyperliquid_scale("kPEPE") == ("PEPE", 1000)
+    assert hyperliquid_scale("kBONK") == ("BONK", 1000)
+    assert hyperliquid_scale("BTC") == ("BTC", 1)
+    assert hyperliquid_scale("k") == ("k", 1)
+
+
+def test_binance_scale():
+    assert binance_scale("1000PEPE") == ("PEPE", 1000)
+    assert binance_scale("1000000MOG") == ("MOG", 1000000)
+    assert binance_scale("BTC") == ("BTC", 1)
+    assert binance_scale("1INCH") == ("1INCH", 1)
+
+
+def test_usdt_market():
+    assert usdt_market("BTC", "binance") == ("btcusdt", 1)
+    assert usdt_market("1000PEPEUSDT", "binance") == ("1000pepeusdt", 1000)
+    assert usdt_market("kPEPE", "hyperliquid") == ("kPEPE", 1000)
+    assert usdt_market("ETH", "hyperliquid") == ("ETH", 1)
+
+
+def test_registry_applies_usdt_names():
+    config = load_config()
+    config["symbols"] = ["btc", "pepe", "doge"]
+    config["exclude"] = ["doge"]
+    config["usdt_names"] = {"pepe": "kPEPE"}
+    registry = SymbolRegistry.from_config(config)
+    assert registry.tickers == ["btc", "pepe"]
+    assert registry.upbit_codes() == {"KRW-BTC": 0, "KRW-PEPE": 1}
+    assert registry.hyperliquid_coins() == {"BTC": (0, 1), "kPEPE": (1, 1000)}
+
+    config["usdt_source"] = "binance"
+    config["usdt_names"] = {"pepe": "1000pepe"}
+    registry = SymbolRegistry.from_config(config)
+    assert registry.binance_streams() == {"btcusdt@ticker": (0, 1), "1000pepeusdt@ticker": (1, 1000)}
+
+
+def test_chunks():
+    assert chunks(list(range(5)), 2) == [[0, 1], [2, 3], [4]]
+    assert chunks([], 3) == []
@@ -0,0 +1,79 @@
+import pytest
+
+from mk_seed import (HARDENED, child_node, derive_keys, derive_many, derive_private_keys, entropy_to_mnemonic,
+                     generate_mnemonic, master_node, mnemonic_to_entropy, mnemonic_to_seed, public_key,
+                     seed_phrase_to_private_key, validate_mnemonic)
+
+ABANDON = " ".join(["abandon"] * 11 + ["about"])
+HARDHAT = "test test test test test test test test test test test junk"
+
+
+def test_bip39_vector():
+    # First vector of the reference test set (trezor/python-mnemonic vectors.json).
+    assert " ".join(entropy_to_mnemonic(bytes(16))) == ABANDON
+    assert mnemonic_to_seed(ABANDON, "TREZOR").hex() == (
+        "c55257c360c07c72029aebc1b53c05ed0362ada38ead3e3e9efa3708e5349553"
+        "1f09a6987599d18264c1e1c92f2cf141630c7a3c4ab7c81b2f001698e7463b04")
+    assert " ".join(entropy_to_mnemonic(b"\xff" * 32)) == " ".join(["zoo"] * 23 + ["vote"])
+
+
+@pytest.mark.parametrize("size", [16, 20, 24, 28, 32])
+def test_entropy_round_trip(size):
+    entropy = bytes((7 * n + size) & 0xFF for n in range(size))
+    words = entropy_to_mnemonic(entropy)
+    assert len(words) == size * 3 // 4
+    assert mnemonic_to_entropy(words) == entropy
+    assert validate_mnemonic(" ".join(words).upper())
+
+
+def test_generated_mnemonics_validate():
+    for words in (12, 24):
+        assert validate_mnemonic(generate_mnemonic(words))
+    with pytest.raises(ValueError):
+        generate_mnemonic(13)
+
+
+def test_bad_checksum():
+    with pytest.raises(ValueError, match="checksum"):
+        mnemonic_to_entropy(["abandon"] * 12)
+    assert not validate_mnemonic(["abandon"] * 12)
+
+
+def test_unknown_word_and_wrong_length():
+    with pytest.raises(ValueError, match="Not a BIP-39 word"):
+        mnemonic_to_entropy(ABANDON.replace("about", "aboot"))
+    with pytest.raises(ValueError, match="12, 15, 18, 21 or 24"):
+        mnemonic_to_entropy(ABANDON + " about")
+    with pytest.raises(ValueError):
+        entropy_to_mnemonic(bytes(15))
+
+
+def test_bip32_vector_1():
+    # BIP-32 test vector 1: m, m/0H, m/0H/1.
+    node = master_node(bytes(range(16)))
+    assert f"{node.key:064x}" == "e8f32e723decf4051aefac8e2c93c9c5b214313817cdb01a1494b917c8436b35"
+    assert node.chain.hex() == "873dff81c02f525623fd1fe5167eac3a55a049de3d314bb42ee227ffed37d508"
+    assert public_key(node.key).hex() == "0339a36013301597daef41fbe593a02cc513d0b55527ec2df1050e2e8ff49c85c2"
+    node = child_node(node, 0 | HARDENED)
+    assert f"{node.key:064x}" == "edb2e14f9ee77d26dd93b4ecede8d16ed408ce149b6cd80b0715a2d911a0afea"
+    assert node.chain.hex() == "47fdacbd0f1097043b78c63c20c34ef4ed9a111d980047ad16282c7ae6236141"
+    node = child_node(node, 1)
+    assert f"{node.key:064x}" == "3c6cb8d0f6a264c91ea8b5030fadaa8e538b020f0a387421a12de9319dc93368"
+    assert node.chain.hex() == "2a7857631386ba23dacac34180dd1983734e444fdbf774041578e9b6adb37c19"
+
+
+def test_ethereum_key():
+    # Account #0 of the well-known Hardhat / Anvil development mnemonic.
+    assert seed_phrase_to_private_key(HARDHAT) == "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+
+
+def test_fast_derivation_matches_child_node():
+    node = master_node(bytes(range(16)))
+    public = public_key(node.key)
+    assert derive_keys(node, public, 3, 2) == [child_node(node, 3).key, child_node(node, 4).key]
+
+
+def test_derive_many_in_phrase_order():
+    keys = derive_many([HARDHAT, ABANDON], count=2, accounts=2, workers=1)
+    assert keys[0] == derive_private_keys(HARDHAT, count=2, accounts=2)
+    assert [(account, index) for account, index, _ in keys[1]] == [(0, 0), (0, 1), (1, 0), (1, 1)]
@@ -0,0 +1,23 @@
+import pytest
+
+from time_windows import format_span, parse_windows
+
+
+def test_parse_windows():
+    assert parse_windows("30s,15m,1h,1d") == {"30s": 30, "15m": 900, "1h": 3600, "1d": 86400}
+    assert list(parse_windows(" 8h, 24h ")) == ["8h", "24h"]
+
+
+def test_parse_windows_rejects_bad_spec():
+    with pytest.raises(ValueError):
+        parse_windows("1w")
+    with pytest.raises(ValueError):
+        parse_windows("8h,,24h")
+
+
+def test_format_span():
+    assert format_span(0) == "0s"
+    assert format_span(90) == "1m 30s"
+    assert format_span(3600) == "1h"
+    assert format_span(93600) == "1d 2h"
+    assert format_span(93661) == "1d 2h"
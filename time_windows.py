@@ -0,0 +1,29 @@
+"""
+Window specs shared by the kimp and funding tools: "1m,15m,1h" -> seconds.
+"""
+import re
+
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_windows(spec):
+    """'1m,15m,1h' -> {"1m": 60, "15m": 900, "1h": 3600}"""
+    windows = {}
+    for name in spec.split(","):
+        name = name.strip()
+        match = re.fullmatch(r"(\d+)([smhd])", name)
+        if not match:
+            raise ValueError(f"Invalid window: {name!r} (use e.g. 30s, 15m, 1h, 1d)")
+        windows[name] = int(match.group(1)) * _UNITS[match.group(2)]
+    return windows
+
+
+def format_span(seconds):
+    """3600 -> '1h', 93600 -> '1d 2h', 90 -> '1m 30s': the two largest units."""
+    parts = []
+    remaining = int(seconds)
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60), ("s", 1)):
+        if remaining >= size:
+            parts.append(f"{remaining // size}{unit}")
+            remaining %= size
+    return " ".join(parts[:2]) or "0s"